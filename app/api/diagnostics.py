@@ -0,0 +1,116 @@
+"""
+API routes for runtime diagnostics of the service.
+"""
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Query
+from pydantic import BaseModel, Field
+
+from app.db.change_feed import change_feed
+from app.db.query_log import slow_query_log
+from app.utils.admission import admission_controller
+from app.utils.profiler import profiler_control, sampling_profiler
+from app.utils.singleflight import singleflight_stats
+
+
+# API Models
+class ProfilerUpdate(BaseModel):
+    """Model for changing the profiler switches; omitted fields are left unchanged."""
+    enabled: Optional[bool] = None
+    sample_rate: Optional[float] = Field(default=None, ge=0, le=1, description="Fraction of requests profiled")
+    allow_header: Optional[bool] = Field(default=None, description="Profile requests sent with an X-Profile header")
+
+
+# Create the router
+router = APIRouter(prefix="/api/v1/diagnostics", tags=["Diagnostics"])
+
+
+@router.get("/singleflight")
+async def get_singleflight_stats():
+    """
+    Get request coalescing counters for this worker process.
+
+    ``coalesced`` counts duplicate executions that were saved because an
+    identical request was already in flight.
+    """
+    return {"status": "ok", "groups": singleflight_stats()}
+
+
+@router.get("/profiler")
+async def get_profiler():
+    """
+    Get the profiler switches and this worker's per-route profile counters.
+
+    Folded stacks are written to ``PROFILER_DIR``, one file per route.
+    """
+    return {
+        "status": "ok",
+        "settings": profiler_control.current(),
+        "routes": sampling_profiler.stats()
+    }
+
+
+@router.put("/profiler")
+async def update_profiler(update: ProfilerUpdate):
+    """
+    Change the profiler switches for every worker without a restart.
+
+    Args:
+        update: Switches to change
+
+    Returns:
+        dict: The switches now in effect
+    """
+    return {"status": "ok", "settings": profiler_control.update(**update.model_dump())}
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(10, ge=1, le=100, description="Number of queries to return"),
+    order_by: Literal["total_ms", "max_ms", "count"] = Query("total_ms", description="Ranking of the top offenders")
+):
+    """
+    Get the slowest MongoDB queries seen by this worker.
+
+    Each offender carries its latest parameters and, once captured, a summary
+    of its ``executionStats`` explain plan (documents examined vs returned,
+    indexes used, collection scans).
+
+    Args:
+        limit: Number of queries to return
+        order_by: Ranking of the top offenders
+
+    Returns:
+        dict: Top offenders and the most recent slow queries
+    """
+    return {
+        "status": "ok",
+        "threshold_ms": slow_query_log.threshold_ms,
+        "top": slow_query_log.top(limit, order_by),
+        "recent": slow_query_log.recent(limit)
+    }
+
+
+@router.get("/admission")
+async def get_admission_stats():
+    """
+    Get admission control load and shed counters for this worker process.
+
+    Per pool: the concurrency limit, requests executing and waiting now, and
+    cumulative admitted, queued and shed counts (``shed_queue_full`` when the
+    wait queue was full, ``shed_timeout`` when the wait exceeded the queue
+    timeout) with queue wait times.
+    """
+    return {"status": "ok", "pools": admission_controller.stats()}
+
+
+@router.get("/events")
+async def get_event_stats():
+    """
+    Get change feed counters for this worker process.
+
+    Connected subscribers, the last data version seen by the poller, polls
+    and failed polls, events queued, and subscribers told to resync after
+    falling behind.
+    """
+    return {"status": "ok", **change_feed.stats()}
@@ -2,12 +2,29 @@
 API routes for interpolated weather data.
 """
 from datetime import datetime
-from typing import List, Optional
+import hashlib
+import json
+import math
+from typing import Callable, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field
+import numpy as np
+from bson import ObjectId
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, conlist
+from starlette.concurrency import run_in_threadpool
 
+from app.config import settings
 from app.db.mongodb import mongodb_manager
+from app.db.timestamp_catalog import timestamp_catalog
+from app.utils import idw
+from app.utils.contours import contour_collection
+from app.utils.grid_cache import GRID_COLUMNS, grid_cache
+from app.utils.pagination import CursorKey, NEXT_CURSOR_HEADER, encode_cursor, parse_cursor
+from app.utils.payload_cache import grid_payload_cache, negotiate_encoding
+from app.utils.regions import bbox_mask, polygon_mask
+from app.utils.singleflight import SingleFlight
+from app.utils.timestamps import naive_utc
 
 
 # API Models
@@ -21,12 +38,18 @@ class LocationQuery(BaseModel):
 class TimestampQuery(BaseModel):
     """Model for querying by timestamp."""
     timestamp: datetime
+    snap: Literal["exact", "nearest"] = Field(default="exact", description="Snap to the nearest available grid")
+    tolerance: Optional[int] = Field(default=None, ge=0, description="Snap window in seconds (implies snap=nearest)")
+    cursor: Optional[str] = Field(default=None, description="Continuation token returned by the previous page")
+    limit: int = Field(default=1000, ge=1, le=50000, description="Maximum number of points per page")
 
 
 class TimeRangeQuery(BaseModel):
     """Model for querying by time range."""
     start_time: datetime
     end_time: datetime
+    cursor: Optional[str] = Field(default=None, description="Continuation token returned by the previous page")
+    limit: int = Field(default=10000, ge=1, le=100000, description="Maximum number of points per page")
 
 
 class LocationTimestampQuery(BaseModel):
@@ -53,6 +76,7 @@ class InterpolationResponse(BaseModel):
     timestamp: datetime
     point_count: int
     points: List[InterpolationPoint]
+    next_cursor: Optional[str] = None
 
 
 class InterpolationTimeRangeResponse(BaseModel):
@@ -62,122 +86,611 @@ class InterpolationTimeRangeResponse(BaseModel):
     timestamp_count: int
     total_points: int
     data: List[InterpolationResponse]
+    next_cursor: Optional[str] = None
+
+
+class RegionAggregateQuery(BaseModel):
+    """Model for aggregating grids over a region and time range."""
+    start_time: datetime
+    end_time: datetime
+    bbox: Optional[List[float]] = Field(
+        default=None, min_length=4, max_length=4, description="[min_lon, min_lat, max_lon, max_lat]"
+    )
+    polygon: Optional[List[conlist(float, min_length=2, max_length=2)]] = Field(
+        default=None, min_length=3, description="Ring of [longitude, latitude] vertices"
+    )
+
+
+class VariableStats(BaseModel):
+    """Mean, minimum and maximum of one variable over a region."""
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+
+class RegionAggregate(BaseModel):
+    """Aggregates of every variable over a region at one timestamp."""
+    timestamp: datetime
+    cell_count: int
+    temperature: VariableStats
+    wind_speed: VariableStats
+    dew_point: VariableStats
+    humidity: VariableStats
+
+
+class RegionAggregateResponse(BaseModel):
+    """Response model for regional aggregates."""
+    start_time: datetime
+    end_time: datetime
+    timestamp_count: int
+    aggregates: List[RegionAggregate]
+
+
+class PointSeriesQuery(BaseModel):
+    """Model for querying one location's values over a time range."""
+    longitude: float
+    latitude: float
+    start_time: datetime
+    end_time: datetime
+    max_distance: int = Field(default=10000, gt=0, description="Maximum distance to the grid cell in meters")
+
+
+class PointSeriesResponse(BaseModel):
+    """Response model for a point time series, one array per variable."""
+    longitude: float
+    latitude: float
+    cell_id: int
+    distance: float
+    count: int
+    timestamps: List[datetime]
+    temperature: List[float]
+    wind_speed: List[float]
+    dew_point: List[float]
+    humidity: List[float]
 
 
 # Create the router
 router = APIRouter(prefix="/api/v1/interpolation", tags=["Interpolation Data"])
 
+# Identical concurrent requests share one execution
+grid_flight = SingleFlight("interpolation_grid")
+status_flight = SingleFlight("interpolation_status")
 
-@router.get("/status")
-async def get_interpolation_status():
-    """Get the status of interpolation data in the database."""
+
+def _interpolation_status() -> dict:
+    """Count the stored interpolation points and list the available timestamps."""
     count = mongodb_manager.count_interpolation_points()
-    timestamps = mongodb_manager.get_available_interpolation_timestamps()
+    timestamps = timestamp_catalog.all()
     
     return {
         "status": "ok",
         "total_points": count,
         "timestamp_count": len(timestamps),
-        "timestamps": sorted(timestamps) if timestamps else []
+        "timestamps": timestamps
     }
 
 
-@router.post("/by-timestamp", response_model=InterpolationResponse)
-async def get_interpolation_by_timestamp(query: TimestampQuery):
+@router.get("/status")
+async def get_interpolation_status():
+    """Get the status of interpolation data in the database."""
+    return await status_flight.do("status", _interpolation_status)
+
+
+def _open_grid(timestamp: datetime) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Get interpolated weather data for a specific timestamp.
-    
+    Open the full grid for a timestamp from the shared grid cache.
+
+    On a miss the grid is read from MongoDB once and written to the cache, so
+    later requests from any worker are served from the memory-mapped file.
+
     Args:
-        query: Timestamp to search for
-        
+        timestamp: Grid timestamp
+
     Returns:
-        InterpolationResponse: Interpolation data for the timestamp
+        Tuple[np.ndarray, np.ndarray]: (cell values in ``GRID_COLUMNS`` order, sorted hex document IDs)
     """
-    data = mongodb_manager.find_interpolation_by_timestamp(query.timestamp)
-    
+    grid = grid_cache.get(timestamp)
+    if grid is not None:
+        return grid
+
+    data = mongodb_manager.find_interpolation_by_timestamp(timestamp, max_results=0)
     if not data:
-        raise HTTPException(status_code=404, detail=f"No interpolation data found for timestamp {query.timestamp}")
-    
+        raise HTTPException(status_code=404, detail=f"No interpolation data found for timestamp {timestamp}")
+
+    values = np.array([
+        [
+            point["location"]["coordinates"][0],
+            point["location"]["coordinates"][1],
+            point["temperature"],
+            point["wind_speed"],
+            point["dew_point"],
+            point["humidity"]
+        ]
+        for point in data
+    ], dtype=np.float64)
+    ids = [str(point["_id"]) for point in data]
+    return grid_cache.put(timestamp, values, ids)
+
+
+def preload_grid(timestamp: datetime) -> int:
+    """
+    Load a grid into the grid cache ahead of the first request for it.
+
+    Args:
+        timestamp: Grid timestamp
+
+    Returns:
+        int: Bytes of the cached grid
+    """
+    values, ids = _open_grid(timestamp)
+    return int(values.nbytes + ids.nbytes)
+
+
+def _load_grid(timestamp: datetime, limit: int, after: Optional[CursorKey] = None) -> InterpolationResponse:
+    """
+    Fetch one page of the interpolation grid for a timestamp.
+
+    Args:
+        timestamp: Grid timestamp
+        limit: Maximum number of points to return
+        after: Keyset position of the last point of the previous page
+
+    Returns:
+        InterpolationResponse: Interpolation data for the timestamp
+    """
+    values, ids = _open_grid(timestamp)
+
+    start = 0
+    if after is not None:
+        start = int(np.searchsorted(ids, str(after[1]).encode("ascii"), side="right"))
+    stop = min(start + limit, len(ids))
+    if start >= stop:
+        raise HTTPException(status_code=404, detail=f"No interpolation data found for timestamp {timestamp}")
+
+    next_cursor = None
+    if stop < len(ids):
+        next_cursor = encode_cursor(None, ObjectId(ids[stop - 1].decode("ascii")))
+
     # Transform the data to match the response model
-    points = []
-    for point in data:
-        points.append(InterpolationPoint(
-            longitude=point["location"]["coordinates"][0],
-            latitude=point["location"]["coordinates"][1],
-            temperature=point["temperature"],
-            wind_speed=point["wind_speed"],
-            dew_point=point["dew_point"],
-            humidity=point["humidity"],
-            timestamp=point["timestamp"]
-        ))
+    points = [
+        InterpolationPoint(
+            longitude=lon,
+            latitude=lat,
+            temperature=temperature,
+            wind_speed=wind_speed,
+            dew_point=dew_point,
+            humidity=humidity,
+            timestamp=timestamp
+        )
+        for lon, lat, temperature, wind_speed, dew_point, humidity in values[start:stop].tolist()
+    ]
     
     return InterpolationResponse(
-        timestamp=query.timestamp,
+        timestamp=timestamp,
         point_count=len(points),
-        points=points
+        points=points,
+        next_cursor=next_cursor
     )
 
 
-@router.post("/by-time-range", response_model=InterpolationTimeRangeResponse)
-async def get_interpolation_by_time_range(query: TimeRangeQuery):
+def _grid_payload(timestamp: datetime, limit: int) -> Tuple[bytes, dict]:
+    """Load and serialize the first page of a grid, returning the body and its cache metadata."""
+    grid = _load_grid(timestamp, limit)
+    return grid.model_dump_json(by_alias=True).encode("utf-8"), {"next_cursor": grid.next_cursor}
+
+
+def _store_payload(key: str, build: Callable[[], Tuple[bytes, dict]]) -> dict:
+    """Build a payload and store it in the payload cache, returning its metadata."""
+    body, extra = build()
+    return grid_payload_cache.store(key, body, extra)
+
+
+async def _load_grid_coalesced(timestamp: datetime, limit: int,
+                               after: Optional[CursorKey] = None) -> InterpolationResponse:
+    """Fetch a grid page, sharing one execution among identical concurrent requests."""
+    return await grid_flight.do(("page", timestamp, limit, after), _load_grid, timestamp, limit, after)
+
+
+async def _cached_payload_response(key: str, build: Callable[[], Tuple[bytes, dict]],
+                                   request: Request) -> Response:
+    """
+    Serve a payload derived from a historical grid from the precompressed payload cache.
+
+    On a miss the payload is built, compressed once and stored. A matching
+    ``If-None-Match`` is answered with 304 from the cached ETag alone,
+    without touching MongoDB.
+
+    Args:
+        key: Cache key identifying the payload
+        build: Builds the identity JSON body and its extra cache metadata
+        request: Incoming request, for conditional and encoding headers
+
+    Returns:
+        Response: Cached JSON payload, or a 304
+    """
+    metadata = grid_payload_cache.get_metadata(key)
+    if metadata is None:
+        metadata = await grid_flight.do(("payload", key), _store_payload, key, build)
+
+    headers = {
+        "ETag": metadata["etag"],
+        "Cache-Control": f"public, max-age={settings.PAYLOAD_CACHE_CONTROL_MAX_AGE}",
+        "Vary": "Accept-Encoding"
+    }
+    if metadata.get("next_cursor"):
+        headers[NEXT_CURSOR_HEADER] = metadata["next_cursor"]
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in candidates or metadata["etag"] in candidates:
+            return Response(status_code=304, headers=headers)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), metadata["encodings"])
+    content = grid_payload_cache.read(key, encoding)
+    if content is None:
+        # The cache was cleared underneath us; fall back to the identity payload
+        encoding = None
+        content, _ = await grid_flight.do(("build", key), build)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+async def _cached_grid_response(timestamp: datetime, limit: int, request: Request) -> Response:
+    """
+    Serve the first page of a historical grid from the precompressed payload cache.
+
+    Args:
+        timestamp: Grid timestamp; converted to naive UTC so that every
+            spelling of the same instant shares one cache entry
+        limit: Maximum number of points in the page
+        request: Incoming request, for conditional and encoding headers
+
+    Returns:
+        Response: Cached JSON payload, or a 304
+    """
+    timestamp = naive_utc(timestamp)
+    key = f"{timestamp:%Y%m%dT%H%M%S}-{limit}"
+    return await _cached_payload_response(key, lambda: _grid_payload(timestamp, limit), request)
+
+
+@router.post("/by-timestamp", response_model=InterpolationResponse)
+async def get_interpolation_by_timestamp(query: TimestampQuery, request: Request, response: Response):
+    """
+    Get interpolated weather data for a specific timestamp.
+
+    Grids larger than ``limit`` points are paged; the token for the next page
+    is returned as ``next_cursor`` and in the ``X-Next-Cursor`` header.
+    The first page of a historical grid is served from the precompressed
+    payload cache with a strong ``ETag``. Identical concurrent requests share
+    a single grid load.
+    
+    Args:
+        query: Timestamp to search for
+        request: Incoming request, for conditional and encoding headers
+        response: Outgoing response, used to set the continuation header
+        
+    Returns:
+        InterpolationResponse: Interpolation data for the timestamp
+    """
+    after = parse_cursor(query.cursor)
+    timestamp = naive_utc(query.timestamp)
+    if query.snap == "nearest" or query.tolerance is not None:
+        tolerance = query.tolerance if query.tolerance is not None else settings.SNAP_TOLERANCE_DEFAULT
+        requested = timestamp
+        timestamp = mongodb_manager.find_nearest_interpolation_timestamp(requested, tolerance)
+        if timestamp is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No interpolation data found within {tolerance}s of {requested}"
+            )
+
+    if after is None and grid_payload_cache.is_cacheable(timestamp):
+        return await _cached_grid_response(timestamp, query.limit, request)
+
+    grid = await _load_grid_coalesced(timestamp, query.limit, after)
+    if grid.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = grid.next_cursor
+    return grid
+
+
+@router.get("/grids/{timestamp}", response_model=InterpolationResponse)
+async def get_interpolation_grid(
+    timestamp: datetime,
+    request: Request,
+    response: Response,
+    limit: int = Query(1000, ge=1, le=50000),
+    cursor: Optional[str] = Query(None, description="Continuation token returned by the previous page")
+):
+    """
+    Get the interpolation grid for an exact timestamp as a cacheable GET.
+
+    Behaves like ``POST /by-timestamp`` but can be cached by browsers and
+    shared proxies, which revalidate with ``If-None-Match``.
+
+    Args:
+        timestamp: Grid timestamp
+        request: Incoming request, for conditional and encoding headers
+        response: Outgoing response, used to set the continuation header
+        limit: Maximum number of points per page
+        cursor: Continuation token from a previous page
+
+    Returns:
+        InterpolationResponse: Interpolation data for the timestamp
+    """
+    after = parse_cursor(cursor)
+    timestamp = naive_utc(timestamp)
+    if after is None and grid_payload_cache.is_cacheable(timestamp):
+        return await _cached_grid_response(timestamp, limit, request)
+
+    grid = await _load_grid_coalesced(timestamp, limit, after)
+    if grid.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = grid.next_cursor
+    return grid
+
+
+@router.post("/by-time-range", responses={200: {"model": InterpolationTimeRangeResponse}})
+async def get_interpolation_by_time_range(query: TimeRangeQuery) -> StreamingResponse:
     """
     Get interpolated weather data within a time range.
+
+    Points are paged in ``(timestamp, _id)`` order, so a timestamp's grid may
+    continue on the next page. The token for the next page is returned as
+    ``next_cursor`` and in the ``X-Next-Cursor`` header. Points are decoded
+    into compact columns and streamed as JSON.
     
     Args:
         query: Time range to search for
         
     Returns:
-        InterpolationTimeRangeResponse: Interpolation data within the time range
+        StreamingResponse: ``InterpolationTimeRangeResponse`` JSON with the data within the time range
     """
-    data = mongodb_manager.find_interpolation_by_time_range(query.start_time, query.end_time)
+    after = parse_cursor(query.cursor)
+    columns = mongodb_manager.find_interpolation_columns_by_time_range(
+        query.start_time, query.end_time, max_results=query.limit, after=after
+    )
     
-    if not data:
+    if not len(columns):
         raise HTTPException(
             status_code=404, 
             detail=f"No interpolation data found between {query.start_time} and {query.end_time}"
         )
     
-    # Group data by timestamp
-    grouped_data = {}
-    for point in data:
-        ts = point["timestamp"]
-        if ts not in grouped_data:
-            grouped_data[ts] = []
-        
-        grouped_data[ts].append(InterpolationPoint(
-            longitude=point["location"]["coordinates"][0],
-            latitude=point["location"]["coordinates"][1],
-            temperature=point["temperature"],
-            wind_speed=point["wind_speed"],
-            dew_point=point["dew_point"],
-            humidity=point["humidity"],
-            timestamp=point["timestamp"]
-        ))
-    
-    # Create response objects for each timestamp
-    timestamp_responses = []
-    for ts, points in grouped_data.items():
-        timestamp_responses.append(InterpolationResponse(
-            timestamp=ts,
-            point_count=len(points),
-            points=points
+    headers = {}
+    next_cursor = None
+    if len(columns) == query.limit:
+        next_cursor = encode_cursor(*columns.last_key)
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    # Serialize straight from the columns, without per-point dicts or models
+    return StreamingResponse(
+        columns.iter_json(query.start_time, query.end_time, next_cursor),
+        media_type="application/json",
+        headers=headers
+    )
+
+
+def _region_aggregates(timestamps: List[datetime], bbox: Optional[List[float]],
+                       polygon: Optional[List[List[float]]]) -> List[RegionAggregate]:
+    """
+    Reduce every variable over a region for each timestamp.
+
+    The cell mask is computed once and reused for as long as consecutive grids
+    share the same cell geometry; each grid is then reduced with a handful of
+    vectorized NumPy calls on its memory-mapped cache file.
+
+    Args:
+        timestamps: Grid timestamps, in order
+        bbox: Bounding box of the region, if given
+        polygon: Polygon of the region, if given
+
+    Returns:
+        List[RegionAggregate]: One aggregate per timestamp
+    """
+    aggregates = []
+    geometry = None
+    mask = None
+    for timestamp in timestamps:
+        values, _ = _open_grid(timestamp)
+        lon, lat = values[:, 0], values[:, 1]
+        if geometry is None or geometry[0].shape != lon.shape or not (
+            np.array_equal(geometry[0], lon) and np.array_equal(geometry[1], lat)
+        ):
+            geometry = (np.array(lon), np.array(lat))
+            mask = polygon_mask(*geometry, polygon) if polygon else bbox_mask(*geometry, bbox)
+
+        selected = values[mask, 2:]
+        if selected.shape[0]:
+            means, minimums, maximums = selected.mean(axis=0), selected.min(axis=0), selected.max(axis=0)
+            stats = [
+                VariableStats(mean=mean, min=minimum, max=maximum)
+                for mean, minimum, maximum in zip(means.tolist(), minimums.tolist(), maximums.tolist())
+            ]
+        else:
+            stats = [VariableStats() for _ in GRID_COLUMNS[2:]]
+
+        aggregates.append(RegionAggregate(
+            timestamp=timestamp,
+            cell_count=int(selected.shape[0]),
+            **dict(zip(GRID_COLUMNS[2:], stats))
         ))
+    return aggregates
+
+
+@router.post("/aggregate", response_model=RegionAggregateResponse)
+async def get_region_aggregates(query: RegionAggregateQuery):
+    """
+    Get the mean, minimum and maximum of every variable over a region for each timestamp in a range.
+
+    The region is a ``bbox`` or a ``polygon``. Only the per-timestamp
+    aggregates are returned, not the grid cells.
     
-    # Sort responses by timestamp
-    timestamp_responses.sort(key=lambda x: x.timestamp)
-    
-    # Calculate total points
-    total_points = sum(len(ts_data.points) for ts_data in timestamp_responses)
-    
-    return InterpolationTimeRangeResponse(
+    Args:
+        query: Region and time range
+        
+    Returns:
+        RegionAggregateResponse: Aggregates for each available timestamp
+    """
+    if (query.bbox is None) == (query.polygon is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of bbox or polygon")
+    if query.bbox is not None and (query.bbox[0] > query.bbox[2] or query.bbox[1] > query.bbox[3]):
+        raise HTTPException(status_code=400, detail="bbox must be [min_lon, min_lat, max_lon, max_lat]")
+    if query.end_time < query.start_time:
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+
+    timestamps = timestamp_catalog.in_range(query.start_time, query.end_time)
+    if not timestamps:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"No interpolation data found between {query.start_time} and {query.end_time}"
+        )
+    if len(timestamps) > settings.AGGREGATE_MAX_TIMESTAMPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{len(timestamps)} grids in range exceed the limit of {settings.AGGREGATE_MAX_TIMESTAMPS}"
+        )
+
+    aggregates = await run_in_threadpool(_region_aggregates, timestamps, query.bbox, query.polygon)
+    return RegionAggregateResponse(
         start_time=query.start_time,
         end_time=query.end_time,
-        timestamp_count=len(timestamp_responses),
-        total_points=total_points,
-        data=timestamp_responses
+        timestamp_count=len(aggregates),
+        aggregates=aggregates
+    )
+
+
+def _point_series(query: PointSeriesQuery) -> PointSeriesResponse:
+    """
+    Resolve the grid cell closest to a location and fetch its values over a time range.
+
+    The cell is resolved once, against the cached grid of the latest timestamp
+    in the range; its values are then read with a single ``(cell_id, timestamp)``
+    index scan.
+
+    Args:
+        query: Location, time range and distance parameters
+
+    Returns:
+        PointSeriesResponse: The cell and its values per timestamp
+    """
+    latest = mongodb_manager.find_latest_interpolation_timestamp(query.start_time, query.end_time)
+    if latest is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No interpolation data found between {query.start_time} and {query.end_time}"
+        )
+
+    values, _ = _open_grid(latest)
+    distances = idw.pairwise_haversine(
+        np.asarray([query.longitude]), np.asarray([query.latitude]), values[:, 0], values[:, 1]
+    )[0]
+    nearest = int(np.argmin(distances))
+    if distances[nearest] > query.max_distance:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No interpolation grid cell within {query.max_distance} m of ({query.longitude}, {query.latitude})"
+        )
+
+    longitude, latitude = float(values[nearest, 0]), float(values[nearest, 1])
+    cell_id = int(idw.cell_ids(longitude, latitude))
+    series = mongodb_manager.find_interpolation_series(cell_id, query.start_time, query.end_time)
+
+    return PointSeriesResponse(
+        longitude=longitude,
+        latitude=latitude,
+        cell_id=cell_id,
+        distance=float(distances[nearest]),
+        count=len(series),
+        timestamps=[point["timestamp"] for point in series],
+        **{field: [point[field] for point in series] for field in GRID_COLUMNS[2:]}
     )
 
 
+@router.post("/series", response_model=PointSeriesResponse)
+async def get_point_series(query: PointSeriesQuery):
+    """
+    Get the interpolated values at a location for every timestamp in a range.
+
+    The nearest grid cell is used. Unlike ``/by-location``, every timestamp
+    in the range is covered and the cost grows only with the number of
+    timestamps.
+
+    Args:
+        query: Location, time range and distance parameters
+
+    Returns:
+        PointSeriesResponse: Timestamps and one array per variable
+    """
+    if query.end_time < query.start_time:
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+
+    return await run_in_threadpool(_point_series, query)
+
+
+def _contour_payload(timestamp: datetime, variable: str, levels: List[float]) -> Tuple[bytes, dict]:
+    """
+    Trace the isolines of one grid variable and serialize them as GeoJSON.
+
+    Args:
+        timestamp: Grid timestamp
+        variable: Grid variable to contour
+        levels: Contour levels, in order
+
+    Returns:
+        Tuple[bytes, dict]: JSON body and its (empty) extra cache metadata
+    """
+    values, _ = _open_grid(timestamp)
+    collection = contour_collection(values[:, 0], values[:, 1], values[:, GRID_COLUMNS.index(variable)], levels)
+    collection["properties"] = {"timestamp": timestamp.isoformat(), "variable": variable, "levels": levels}
+    return json.dumps(collection, separators=(",", ":")).encode("utf-8"), {}
+
+
+@router.get("/contours/{timestamp}")
+async def get_interpolation_contours(
+    timestamp: datetime,
+    request: Request,
+    variable: Literal["temperature", "wind_speed", "dew_point", "humidity"] = Query("temperature"),
+    levels: str = Query(..., description="Comma-separated contour levels, e.g. 20,25,30")
+):
+    """
+    Get the isolines of a grid variable as a GeoJSON FeatureCollection.
+
+    The grid is contoured on the server with vectorized marching squares, one
+    ``MultiLineString`` feature per level. Isolines of historical grids are
+    cached per (timestamp, variable, levels) in the precompressed payload
+    cache and revalidate with ``If-None-Match`` like ``/grids/{timestamp}``.
+
+    Args:
+        timestamp: Grid timestamp
+        request: Incoming request, for conditional and encoding headers
+        variable: Grid variable to contour
+        levels: Comma-separated contour levels
+
+    Returns:
+        Response: GeoJSON FeatureCollection
+    """
+    try:
+        parsed = sorted({float(level) for level in levels.split(",") if level.strip()})
+    except ValueError:
+        parsed = [math.nan]
+    if not all(math.isfinite(level) for level in parsed):
+        raise HTTPException(status_code=400, detail="levels must be comma-separated finite numbers")
+    if not parsed or len(parsed) > settings.CONTOUR_MAX_LEVELS:
+        raise HTTPException(status_code=400, detail=f"Provide between 1 and {settings.CONTOUR_MAX_LEVELS} levels")
+
+    timestamp = naive_utc(timestamp)
+    digest = hashlib.sha256(json.dumps(parsed).encode("utf-8")).hexdigest()[:16]
+    key = f"contours-{timestamp:%Y%m%dT%H%M%S}-{variable}-{digest}"
+    build = lambda: _contour_payload(timestamp, variable, parsed)
+    if grid_payload_cache.is_cacheable(timestamp):
+        return await _cached_payload_response(key, build, request)
+
+    content, _ = await grid_flight.do(("contours", key), build)
+    return Response(content=content, media_type="application/json")
+
+
 @router.post("/by-location", response_model=List[InterpolationResponse])
 async def get_interpolation_by_location(query: LocationQuery):
     """
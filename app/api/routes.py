@@ -1,14 +1,26 @@
 """
 API routes for the Weather API.
 """
+import asyncio
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Query, Path, Depends
+from fastapi import APIRouter, HTTPException, Query, Path, Depends, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
+from app.config import settings
+from app.db.change_feed import change_feed
 from app.db.mongodb import mongodb_manager
+from app.db.station_registry import station_registry
+from app.db.write_behind import reading_buffer
 from app.models.weather import (
+    READING_FIELDS,
+    NearbyStation,
+    NearestStationsQuery,
+    ReadingsSubmission,
+    StationSeriesResponse,
+    SyncResponse,
     WeatherStation, 
     WeatherEntry, 
     WeatherEntryResponse,
@@ -16,11 +28,65 @@ from app.models.weather import (
     TimeQuery,
     TimeRangeQuery
 )
+from app.utils.columnar import ReadingColumns
+from app.utils.exporter import EXPORT_MEDIA_TYPES, available_formats, export_readings
+from app.utils.pagination import NEXT_CURSOR_HEADER, encode_cursor, parse_cursor
+from app.utils.timestamps import naive_utc
 
 
 router = APIRouter(prefix="/api/v1")
 
 
+def _parse_bbox(bbox: Optional[str]) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Parse an optional ``min_lon,min_lat,max_lon,max_lat`` query value, rejecting malformed ones with a 400.
+
+    Args:
+        bbox: Comma-separated bounding box supplied by the client
+
+    Returns:
+        Optional[Tuple[float, float, float, float]]: The bounding box, if any
+    """
+    if bbox is None:
+        return None
+    try:
+        values = tuple(float(value) for value in bbox.split(","))
+    except ValueError:
+        values = ()
+    if len(values) != 4 or values[0] > values[2] or values[1] > values[3]:
+        raise HTTPException(status_code=400, detail="bbox must be min_lon,min_lat,max_lon,max_lat")
+    return values
+
+
+def _parse_fields(fields: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    Map requested reading variables to their stored entry keys.
+
+    Args:
+        fields: Public variable names (or stored keys); comma-separated values are split
+
+    Returns:
+        Optional[List[str]]: Stored entry keys, or None to keep every variable
+    """
+    if not fields:
+        return None
+
+    stored_keys = []
+    for name in (part.strip() for value in fields for part in value.split(",")):
+        if not name:
+            continue
+        if name in READING_FIELDS:
+            stored_keys.append(READING_FIELDS[name])
+        elif name in READING_FIELDS.values():
+            stored_keys.append(name)
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown field '{name}'; expected one of {', '.join(READING_FIELDS)}"
+            )
+    return stored_keys
+
+
 @router.get("/", response_model=Dict[str, str])
 async def root() -> Dict[str, str]:
     """
@@ -32,37 +98,83 @@ async def root() -> Dict[str, str]:
     return {"status": "Weather API is running"}
 
 
-@router.get("/stations", response_model=List[WeatherStation])
-async def get_stations(limit: int = Query(10, ge=1, le=100)) -> List[WeatherStation]:
+@router.get("/stations", response_model=List[WeatherStation], response_model_exclude_none=True)
+async def get_stations(
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Continuation token returned by the previous page"),
+    include_entries: bool = Query(False, description="Include each station's readings"),
+    fields: Optional[List[str]] = Query(None, description="Reading variables to include; implies include_entries")
+) -> List[WeatherStation]:
     """
     Get a list of weather stations.
+
+    Only station metadata is returned unless ``include_entries`` or
+    ``fields`` is given. When more stations are available, the continuation
+    token for the next page is returned in the ``X-Next-Cursor`` header.
     
     Args:
+        response: Outgoing response, used to set the continuation header
         limit: Maximum number of stations to return
+        cursor: Continuation token from a previous page
+        include_entries: Whether to include each station's readings
+        fields: Reading variables to include in each entry
         
     Returns:
         List[WeatherStation]: List of weather stations
     """
+    after = parse_cursor(cursor)
+    selected = _parse_fields(fields)
     try:
-        stations = mongodb_manager.get_all_stations(limit=limit)
+        stations = mongodb_manager.get_all_stations(
+            limit=limit,
+            after=after,
+            include_entries=include_entries or selected is not None,
+            fields=selected
+        )
+        if len(stations) == limit:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(None, stations[-1]["_id"])
         return stations
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving stations: {str(e)}")
 
 
-@router.get("/stations/{station_id}", response_model=WeatherStation)
-async def get_station_by_id(station_id: str = Path(..., description="The ID of the station to retrieve")) -> WeatherStation:
+@router.get("/stations/{station_id}", response_model=WeatherStation, response_model_exclude_none=True)
+async def get_station_by_id(
+    station_id: str = Path(..., description="The ID of the station to retrieve"),
+    include_entries: bool = Query(
+        True, description="Include the station's readings; false serves the metadata from the in-memory registry"
+    ),
+    fields: Optional[List[str]] = Query(None, description="Reading variables to include")
+) -> WeatherStation:
     """
     Get a weather station by its ID.
+
+    Readings are included by default, which reads every monthly partition.
+    Metadata-only lookups (``include_entries=false``) are opt-in and are
+    answered from the in-memory station registry. Stations added since the
+    registry was last refreshed fall back to MongoDB.
     
     Args:
         station_id: ID of the station to retrieve
+        include_entries: Whether to include the station's readings
+        fields: Reading variables to include in each entry
         
     Returns:
         WeatherStation: The requested weather station
     """
+    selected = _parse_fields(fields)
     try:
-        station = mongodb_manager.find_station_by_id(station_id)
+        if not include_entries and selected is None:
+            station = station_registry.get(station_id)
+            if station:
+                return station
+
+        station = mongodb_manager.find_station_by_id(
+            station_id,
+            include_entries=include_entries or selected is not None,
+            fields=selected
+        )
         if not station:
             raise HTTPException(status_code=404, detail=f"Station with ID {station_id} not found")
         return station
@@ -72,10 +184,14 @@ async def get_station_by_id(station_id: str = Path(..., description="The ID of t
         raise HTTPException(status_code=500, detail=f"Error retrieving station: {str(e)}")
 
 
-@router.post("/stations/by-location", response_model=List[WeatherStation])
+@router.post("/stations/by-location", response_model=List[WeatherStation], response_model_exclude_none=True)
 async def find_stations_by_location(query: LocationQuery) -> List[WeatherStation]:
     """
     Find weather stations near a given location.
+
+    Only station metadata is returned unless ``include_entries`` or
+    ``fields`` is set; metadata-only searches are answered from the
+    in-memory station registry.
     
     Args:
         query: Location query parameters
@@ -83,30 +199,181 @@ async def find_stations_by_location(query: LocationQuery) -> List[WeatherStation
     Returns:
         List[WeatherStation]: List of nearby weather stations
     """
+    selected = _parse_fields(query.fields)
     try:
+        if not query.include_entries and selected is None:
+            return [
+                station for station, _ in
+                station_registry.within(
+                    query.longitude,
+                    query.latitude,
+                    query.max_distance if query.max_distance is not None else settings.MAX_DISTANCE_DEFAULT
+                )
+            ]
+
         stations = mongodb_manager.find_stations_by_location(
             longitude=query.longitude,
             latitude=query.latitude,
-            max_distance=query.max_distance
+            max_distance=query.max_distance,
+            include_entries=query.include_entries or selected is not None,
+            fields=selected
         )
         return stations
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error finding stations by location: {str(e)}")
 
 
+@router.get("/stations/{station_id}/series", response_model=StationSeriesResponse, response_model_exclude_none=True)
+async def get_station_series(
+    station_id: str = Path(..., description="The ID of the station"),
+    start_time: datetime = Query(..., description="Start of the time range"),
+    end_time: datetime = Query(..., description="End of the time range"),
+    step_minutes: int = Query(..., ge=1, description="Step the series was resampled to at ingest"),
+    fields: Optional[List[str]] = Query(None, description="Reading variables to include")
+) -> Dict[str, Any]:
+    """
+    Get a station's readings resampled onto a fixed cadence.
+
+    Series are written at ingest with ``--resample-minutes``. Slots are
+    addressed by offset from the month start, so any time is found with one
+    indexed lookup per month and a ``$slice``, without searching readings.
+    
+    Args:
+        station_id: ID of the station
+        start_time: Start of the time range (rounded down to its slot)
+        end_time: End of the time range
+        step_minutes: Resampling step of the stored series
+        fields: Reading variables to include
+        
+    Returns:
+        Dict[str, Any]: First slot, step, slot count, samples and one array per variable
+    """
+    start_time, end_time = naive_utc(start_time), naive_utc(end_time)
+    if end_time < start_time:
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+    slots = (end_time - start_time).total_seconds() / (step_minutes * 60)
+    if slots >= settings.SERIES_MAX_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range covers more than {settings.SERIES_MAX_POINTS} slots; narrow it or use a longer step"
+        )
+
+    selected = _parse_fields(fields)
+    series = mongodb_manager.find_station_series(station_id, step_minutes * 60, start_time, end_time, selected)
+    if series is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No {step_minutes}-minute series for station {station_id} in the requested range"
+        )
+
+    return {
+        "station_id": station_id,
+        "start": series["start"],
+        "step_minutes": step_minutes,
+        "count": series["count"],
+        "samples": series["samples"],
+        **{name: series[key] for name, key in READING_FIELDS.items() if key in series}
+    }
+
+
+@router.post("/stations/{station_id}/readings", status_code=202)
+async def add_station_readings(
+    submission: ReadingsSubmission,
+    station_id: str = Path(..., description="The ID of the station the readings belong to")
+) -> Dict[str, Any]:
+    """
+    Accept live readings for a station.
+
+    Readings are buffered and written to MongoDB in periodic bulk batches,
+    so the response only confirms they were queued. When the buffer is full
+    a 503 with ``Retry-After`` is returned and the client should retry.
+    Timestamps are stored as naive UTC. A reading for a timestamp the station
+    already has is skipped, and a reading without any values is rejected.
+    
+    Args:
+        submission: Readings to add
+        station_id: ID of the station the readings belong to
+        
+    Returns:
+        Dict[str, Any]: Number of readings accepted and current queue depth
+    """
+    if station_registry.get(station_id) is None and \
+            mongodb_manager.find_station_by_id(station_id, include_entries=False) is None:
+        raise HTTPException(status_code=404, detail=f"Station with ID {station_id} not found")
+
+    entries = [
+        {**reading.model_dump(by_alias=True, exclude_none=True), "timestamp": naive_utc(reading.timestamp)}
+        for reading in submission.readings
+    ]
+    empty = [position for position, entry in enumerate(entries) if len(entry) == 1]
+    if empty:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Readings at positions {empty} have a timestamp but no values"
+        )
+    if not reading_buffer.submit(station_id, entries):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Reading buffer is full, retry later"},
+            headers={"Retry-After": str(settings.INGEST_RETRY_AFTER_SECONDS)}
+        )
+
+    return {"accepted": len(entries), "queued": reading_buffer.stats()["queued"]}
+
+
+@router.post("/stations/nearest", response_model=List[NearbyStation])
+async def find_nearest_stations(query: NearestStationsQuery) -> List[NearbyStation]:
+    """
+    Find the k weather stations nearest to a location.
+    
+    Args:
+        query: Location, k and optional distance limit
+        
+    Returns:
+        List[NearbyStation]: Station metadata with distances, nearest first
+    """
+    try:
+        nearest = station_registry.nearest(
+            query.longitude,
+            query.latitude,
+            k=query.k,
+            max_distance=query.max_distance
+        )
+        return [{**station, "distance": distance} for station, distance in nearest]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error finding nearest stations: {str(e)}")
+
+
 @router.post("/weather/by-timestamp", response_model=List[WeatherEntryResponse])
-async def find_entries_by_timestamp(query: TimeQuery) -> List[WeatherEntryResponse]:
+async def find_entries_by_timestamp(query: TimeQuery, response: Response) -> List[WeatherEntryResponse]:
     """
     Find weather entries across all stations for a specific timestamp.
-    
+
+    With ``snap="nearest"`` (or any ``tolerance``), each station's reading
+    closest to the timestamp within the tolerance window is returned instead
+    of requiring an exact match.
+
     Args:
         query: Time query parameters
-        
+        response: Outgoing response, used to set the continuation header
+
     Returns:
         List[WeatherEntryResponse]: List of weather entries matching the timestamp
     """
+    after = parse_cursor(query.cursor)
     try:
-        entries = mongodb_manager.find_entries_by_timestamp(query.timestamp)
+        if query.snap == "nearest" or query.tolerance is not None:
+            tolerance = query.tolerance if query.tolerance is not None else settings.SNAP_TOLERANCE_DEFAULT
+            entries = mongodb_manager.find_nearest_entries_by_timestamp(
+                query.timestamp, tolerance, max_results=query.limit, after=after
+            )
+        else:
+            entries = mongodb_manager.find_entries_by_timestamp(
+                query.timestamp, max_results=query.limit, after=after
+            )
+
+        if len(entries) == query.limit:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(None, entries[-1]["_id"])
         
         # Transform the results into the response model format
         formatted_entries = []
@@ -124,21 +391,27 @@ async def find_entries_by_timestamp(query: TimeQuery) -> List[WeatherEntryRespon
             formatted_entries.append(formatted_entry)
         
         return formatted_entries
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error finding entries by timestamp: {str(e)}")
 
 
-@router.post("/weather/by-time-range", response_model=List[WeatherEntryResponse])
-async def find_entries_by_time_range(query: TimeRangeQuery) -> List[WeatherEntryResponse]:
+@router.post("/weather/by-time-range", responses={200: {"model": List[WeatherEntryResponse]}})
+async def find_entries_by_time_range(query: TimeRangeQuery) -> StreamingResponse:
     """
     Find weather entries across all stations within a time range.
+
+    Entries are ordered by timestamp. When the page is full, the token for
+    the next page is returned in the ``X-Next-Cursor`` header.
     
     Args:
         query: Time range query parameters
         
     Returns:
-        List[WeatherEntryResponse]: List of weather entries within the time range
+        StreamingResponse: JSON list of ``WeatherEntryResponse`` objects within the time range
     """
+    after = parse_cursor(query.cursor)
     try:
         if query.end_time < query.start_time:
             raise HTTPException(
@@ -146,33 +419,168 @@ async def find_entries_by_time_range(query: TimeRangeQuery) -> List[WeatherEntry
                 detail="End time must be after start time"
             )
         
-        entries = mongodb_manager.find_entries_by_time_range(
+        # Decode the live cursors into compact columns and serialize from them, without per-entry dicts or models
+        columns = mongodb_manager.find_entries_by_time_range(
             start_time=query.start_time,
-            end_time=query.end_time
+            end_time=query.end_time,
+            max_results=query.limit,
+            after=after,
+            decode=lambda rows: ReadingColumns.from_rows(rows, capacity=query.limit)
         )
+
+        headers = {}
+        if len(columns) == query.limit:
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(*columns.last_key)
         
-        # Transform the results into the response model format
-        formatted_entries = []
-        for entry in entries:
-            formatted_entry = {
-                "station_id": entry["station_id"],
-                "station_name": entry["station_name"],
-                "location": entry["location"],
-                "timestamp": entry["entry"]["timestamp"],
-                "Temp - °C": entry["entry"]["Temp - °C"],
-                "Hum - %": entry["entry"]["Hum - %"],
-                "Dew Point - °C": entry["entry"]["Dew Point - °C"],
-                "Avg Wind Speed - km/h": entry["entry"]["Avg Wind Speed - km/h"]
-            }
-            formatted_entries.append(formatted_entry)
-        
-        return formatted_entries
+        return StreamingResponse(columns.iter_json(), media_type="application/json", headers=headers)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error finding entries by time range: {str(e)}")
 
 
+@router.get("/weather/export")
+async def export_station_readings(
+    start_time: datetime = Query(..., description="Start of the time range"),
+    end_time: datetime = Query(..., description="End of the time range"),
+    format: Literal["csv", "parquet"] = Query("csv", description="Output format"),
+    station_id: Optional[List[str]] = Query(None, description="Only export these stations (repeat or comma-separate)")
+) -> StreamingResponse:
+    """
+    Export station readings in a time range as CSV or Parquet.
+
+    The export is streamed from a server-side cursor in batches of
+    ``EXPORT_BATCH_SIZE`` rows (one CSV block or Parquet row group each), so
+    whole months can be downloaded without buffering them on the server.
+    
+    Args:
+        start_time: Start of the time range
+        end_time: End of the time range
+        format: ``csv`` or ``parquet`` (requires pyarrow)
+        station_id: Optional station filter
+        
+    Returns:
+        StreamingResponse: The export file
+    """
+    if end_time < start_time:
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+    if format not in available_formats():
+        raise HTTPException(status_code=400, detail=f"Export format '{format}' is not available on this server")
+
+    station_ids = [part.strip() for value in station_id or [] for part in value.split(",") if part.strip()]
+    filename = f"readings_{start_time:%Y%m%dT%H%M%S}_{end_time:%Y%m%dT%H%M%S}.{format}"
+    return StreamingResponse(
+        export_readings(start_time, end_time, format, station_ids or None),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/sync", response_model=SyncResponse)
+async def sync_changes(
+    since: int = Query(0, ge=0, description="Version returned by the previous sync (0 for everything versioned)")
+) -> Dict[str, Any]:
+    """
+    Get the stations, readings and grid timestamps written since a data version.
+
+    Every write stamps its documents with a monotonically increasing version.
+    Clients keep the ``version`` of their last sync and send it back as
+    ``since``, so a refresh only transfers what changed. Clients that are
+    further behind than ``SYNC_MAX_READINGS`` readings, or that hold a
+    version this server does not know, get a 410 and should reload in full.
+    
+    Args:
+        since: Version the client already holds
+        
+    Returns:
+        Dict[str, Any]: Changes in ``(since, version]`` and the new version
+    """
+    until = mongodb_manager.stable_data_version()
+    if since > until:
+        raise HTTPException(status_code=410, detail=f"Unknown version {since}; reload the full dataset")
+    if since == until:
+        return {"since": since, "version": until}
+
+    changes = mongodb_manager.find_changes_since(since, until, settings.SYNC_MAX_READINGS)
+    if len(changes["readings"]) > settings.SYNC_MAX_READINGS:
+        raise HTTPException(
+            status_code=410,
+            detail=f"More than {settings.SYNC_MAX_READINGS} readings changed since version {since}; reload the full dataset"
+        )
+
+    readings = [
+        {
+            "station_id": row["station_id"],
+            "station_name": row["station_name"],
+            "location": row["location"],
+            "timestamp": row["entry"]["timestamp"],
+            **{key: row["entry"].get(key) for key in READING_FIELDS.values()}
+        }
+        for row in changes["readings"]
+    ]
+    return {
+        "since": since,
+        "version": until,
+        "stations": changes["stations"],
+        "readings": readings,
+        "interpolation_timestamps": changes["interpolation_timestamps"]
+    }
+
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    bbox: Optional[str] = Query(
+        None, description="Only report readings from stations inside min_lon,min_lat,max_lon,max_lat"
+    )
+) -> StreamingResponse:
+    """
+    Subscribe to server-sent events announcing new readings and grids.
+
+    Events are ``interpolation`` (grid timestamps with new or replaced
+    points), ``readings`` (stations with new readings) and ``resync`` (the
+    client fell behind and missed events). Each event's ``id`` is the data
+    version it brings the client to; ``/sync?since=<id>`` fetches the data
+    itself, also after a reconnect or a ``resync``.
+    
+    Args:
+        request: Incoming request, used to notice disconnected clients
+        bbox: Optional region filter for ``readings`` events
+        
+    Returns:
+        StreamingResponse: ``text/event-stream`` that stays open until the client disconnects
+    """
+    region = _parse_bbox(bbox)
+    subscription = change_feed.subscribe(region)
+    if subscription is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many event subscribers",
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)}
+        )
+
+    async def stream():
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), settings.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # Keeps proxies from closing the idle connection
+                    message = ": keepalive\n\n"
+                yield message
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/stats/stations-count")
 async def get_stations_count() -> Dict[str, int]:
     """
@@ -1,6 +1,7 @@
 """
 Configuration settings for the Weather API application.
 """
+from datetime import datetime
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -13,6 +14,8 @@ class Settings(BaseSettings):
     MONGODB_DB_NAME: str = "weather_data"
     WEATHER_COLLECTION: str = "weather_stations"
     INTERPOLATION_COLLECTION: str = "interpolated_data"  # New collection for interpolated data
+    COUNTERS_COLLECTION: str = "counters"  # data version counter for incremental sync
+    SERIES_COLLECTION: str = "weather_series"  # station readings resampled onto a fixed cadence
     
     # API settings
     API_TITLE: str = "Weather Station API"
@@ -22,11 +25,107 @@ class Settings(BaseSettings):
     # Data processing settings
     MAX_RESULTS_DEFAULT: int = 100
     MAX_DISTANCE_DEFAULT: int = 10000  # meters (10km)
+    SNAP_TOLERANCE_DEFAULT: int = 900  # seconds (15 min) either side of the requested time
+
+    # Precompressed payload cache for historical grids
+    PAYLOAD_CACHE_DIR: str = ".cache/payloads"
+    PAYLOAD_CACHE_MIN_AGE_SECONDS: int = 3600  # grids older than this are treated as immutable
+    PAYLOAD_CACHE_MAX_BYTES: int = 1024 ** 3  # least recently used payloads are evicted above this
+    PAYLOAD_CACHE_CONTROL_MAX_AGE: int = 86400  # seconds clients and proxies may reuse a grid
+
+    # Memory-mapped grid cache shared by all workers
+    GRID_CACHE_DIR: str = ".cache/grids"
+    GRID_CACHE_MAX_BYTES: int = 2 * 1024 ** 3  # least recently used grids are evicted above this
+
+    # In-memory station registry
+    STATION_REGISTRY_TTL_SECONDS: int = 300  # reload station metadata at most this often
+    TIMESTAMP_CATALOG_TTL_SECONDS: int = 60  # also reload the interpolation timestamp list this often, to drop deleted grids
+
+    # Startup warm-up (the /ready probe reports ready once it has finished)
+    WARMUP_ENABLED: bool = True
+    WARMUP_GRID_COUNT: int = 6  # most recent grids loaded into the grid cache
     
-    # Data filtering
-    TARGET_MONTH: int = 5  # May
-    TARGET_YEAR: int = 2024
-    
+    # Data filtering: readings outside this range are skipped at ingest (unbounded if unset)
+    INGEST_START_DATE: Optional[datetime] = None
+    INGEST_END_DATE: Optional[datetime] = None
+
+    # Resampled station series (--resample-minutes, /stations/{station_id}/series)
+    SERIES_MAX_POINTS: int = 50000  # slots a single series request may return
+
+    # Incremental sync (/sync?since=<version>)
+    SYNC_MAX_READINGS: int = 50000  # clients further behind than this get a 410 and must reload
+    SYNC_PENDING_TIMEOUT_SECONDS: int = 300  # writes unfinished after this are assumed dead
+
+    # Server-sent change events (/events); limits are per worker process
+    EVENTS_POLL_INTERVAL_SECONDS: float = 2.0  # data version checks while anyone is subscribed
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0  # keep-alive comment sent on idle connections
+    EVENTS_QUEUE_SIZE: int = 16  # undelivered events per subscriber before it is told to resync
+    EVENTS_MAX_SUBSCRIBERS: int = 5000
+
+    # Streaming export of station readings (/weather/export, --export-readings)
+    EXPORT_BATCH_SIZE: int = 5000  # rows per cursor batch and per CSV chunk / Parquet row group
+
+    # Monthly partitions of station readings
+    PARTITION_QUERY_WORKERS: int = 8  # partitions queried concurrently per request
+    PARTITION_LIST_TTL_SECONDS: int = 60  # how long the list of partition collections is cached
+
+    # Write-behind ingestion of live readings
+    INGEST_QUEUE_MAX_READINGS: int = 100000  # buffered readings before submissions get a 503
+    INGEST_FLUSH_READINGS: int = 5000  # flush as soon as this many readings are buffered
+    INGEST_FLUSH_INTERVAL_SECONDS: float = 1.0  # flush at least this often
+    INGEST_RETRY_AFTER_SECONDS: int = 1  # Retry-After sent when the buffer is full
+
+    # Built-in grid generation (--generate-interpolation)
+    GRID_STEP_MINUTES: int = 60  # minutes between generated grid timestamps
+    GRID_RESOLUTION: float = 0.05  # cell size in degrees
+    GRID_BBOX: Optional[list[float]] = None  # [min_lon, min_lat, max_lon, max_lat]; station extent if unset
+    GRID_MAX_CELLS: int = 500000
+    GRID_WORKERS: Optional[int] = None  # worker processes; CPU count if unset
+    IDW_POWER: float = 2.0
+    AGGREGATE_MAX_TIMESTAMPS: int = 2000  # grids a single regional aggregate request may reduce
+    CONTOUR_MAX_LEVELS: int = 50  # isoline levels a single contour request may ask for
+
+    # Opt-in sampling profiler (can be toggled at runtime via /api/v1/diagnostics/profiler)
+    PROFILER_ENABLED: bool = False
+    PROFILER_SAMPLE_RATE: float = 0.01  # fraction of requests profiled while enabled
+    PROFILER_ALLOW_HEADER: bool = False  # profile any request sent with an X-Profile header
+    PROFILER_INTERVAL_MS: float = 5.0  # time between stack samples
+    PROFILER_DIR: str = ".cache/profiles"
+
+    # Slow-query log (see /api/v1/diagnostics/slow-queries)
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_LOG_SIZE: int = 200  # recent slow queries kept per worker
+    SLOW_QUERY_EXPLAIN: bool = True  # capture explain("executionStats") for slow queries
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = 60  # explain the same query at most this often
+
+    # Admission control (see /api/v1/diagnostics/admission); limits are per worker process
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_POOLS: dict[str, int] = {"heavy": 4, "standard": 16, "light": 32}  # concurrent requests per pool
+    ADMISSION_QUEUE_SIZE: int = 32  # requests allowed to wait per pool before new ones are shed
+    ADMISSION_QUEUE_TIMEOUT_MS: float = 500.0  # longest a request waits for a slot before it is shed
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1  # Retry-After sent with a shed request's 503
+    # Paths per pool: "/*" entries match a path prefix, others only the exact path. Exact paths win,
+    # then the longest prefix; unmatched paths use the "standard" pool
+    ADMISSION_ROUTES: dict[str, list[str]] = {
+        "heavy": [
+            "/api/v1/weather/by-time-range",
+            "/api/v1/weather/export",
+            "/api/v1/interpolation/by-time-range",
+            "/api/v1/interpolation/by-location",
+            "/api/v1/interpolation/aggregate",
+            "/api/v1/interpolation/series",
+            "/api/v1/interpolation/contours/*",
+        ],
+        "light": [
+            "/api/v1/stations",
+            "/api/v1/stations/nearest",
+            "/api/v1/stats/*",
+            "/api/v1/interpolation/status",
+        ],
+    }
+    # Path prefixes that bypass admission control
+    ADMISSION_EXEMPT_ROUTES: list[str] = ["/api/v1/diagnostics", "/api/v1/events", "/ready", "/docs", "/redoc", "/openapi.json"]
+
     # Columns to keep
     COLUMNS_TO_KEEP: list[str] = [
         "Date & Time",
@@ -0,0 +1,230 @@
+"""
+Push notifications of new readings and grids to subscribed clients.
+
+Dashboards used to poll ``/interpolation/status`` to find out whether anything
+had changed, and each poll counted the interpolation collection. Instead, one
+background task per worker process watches the data version (see
+:meth:`MongoDBManager.stable_data_version`), which is a single ``find_one``
+by ``_id``. Only when the version moves does it ask MongoDB what changed. It
+then fans the change out to every subscriber of the server-sent events
+stream. Writes from other processes are seen too, e.g. the interpolation
+loader and other API workers.
+
+Each message is serialized once per distinct region filter, not once per
+subscriber. Idle subscribers cost one small queue each. A subscriber that
+stops reading has its queue replaced by a single ``resync`` event, so a slow
+client never holds back the others.
+"""
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.db.mongodb import mongodb_manager
+from app.utils.regions import bbox_mask
+
+BBox = Tuple[float, float, float, float]
+
+
+def _json_default(value: Any) -> str:
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def format_event(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """
+    Format one server-sent event.
+
+    Args:
+        event: Event type
+        data: Payload, sent as JSON
+        event_id: Data version, echoed back by browsers as ``Last-Event-ID`` on reconnect
+
+    Returns:
+        str: The event in ``text/event-stream`` framing
+    """
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, default=_json_default, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscription:
+    """One connected client: its region filter and its queue of formatted events."""
+
+    def __init__(self, bbox: Optional[BBox], queue_size: int):
+        self.bbox = bbox
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+
+    def deliver(self, message: str, version: int) -> bool:
+        """
+        Queue a formatted event without blocking.
+
+        Args:
+            message: Formatted event
+            version: Data version the event brings the client to
+
+        Returns:
+            bool: False if the client had fallen behind and was sent ``resync`` instead
+        """
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(format_event("resync", {"version": version}, version))
+            return False
+
+
+class ChangeFeed:
+    """Per-worker version poller and broadcaster of change events."""
+
+    def __init__(self, poll_interval: float, queue_size: int, max_subscribers: int):
+        """
+        Initialize the feed.
+
+        Args:
+            poll_interval: Seconds between data version checks while anyone is subscribed
+            queue_size: Undelivered events kept per subscriber before it is told to resync
+            max_subscribers: Connections accepted per worker process
+        """
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+
+        self._subscribers: List[Subscription] = []
+        self._task: Optional[asyncio.Task] = None
+        self.version: Optional[int] = None
+
+        self.polls = 0
+        self.failed_polls = 0
+        self.events = 0
+        self.resyncs = 0
+
+    def start(self) -> None:
+        """Start the poller on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        """Stop the poller."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def subscribe(self, bbox: Optional[BBox] = None) -> Optional[Subscription]:
+        """
+        Register a client.
+
+        Args:
+            bbox: Only report readings from stations inside (min_lon, min_lat, max_lon, max_lat)
+
+        Returns:
+            Optional[Subscription]: The subscription, or None if the worker is at ``max_subscribers``
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            return None
+        subscription = Subscription(bbox, self.queue_size)
+        self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a client."""
+        if subscription in self._subscribers:
+            self._subscribers.remove(subscription)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self._subscribers:
+                # Nobody to tell; start from the current version on the next subscriber
+                self.version = None
+                continue
+            try:
+                changes = await run_in_threadpool(self.poll)
+            except Exception as e:
+                self.failed_polls += 1
+                print(f"Change feed poll failed: {e}")
+                continue
+            if changes is not None:
+                self.publish(*changes)
+
+    def poll(self) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Check the data version and summarize what changed since the last check.
+
+        Returns:
+            Optional[Tuple[int, Dict]]: New version and change summary, or None if nothing changed
+        """
+        self.polls += 1
+        version = mongodb_manager.stable_data_version()
+        previous, self.version = self.version, version
+        if previous is None or version <= previous:
+            return None
+        return version, mongodb_manager.find_change_summary(previous, version)
+
+    def publish(self, version: int, changes: Dict[str, Any]) -> None:
+        """
+        Send a change summary to every subscriber.
+
+        ``interpolation`` events go to everyone. ``readings`` events list the
+        stations with new readings, restricted to each subscriber's region,
+        and are skipped when none of them are inside it.
+
+        Args:
+            version: Data version the changes bring clients to
+            changes: Result of :meth:`MongoDBManager.find_change_summary`
+        """
+        messages = []
+        if changes["interpolation_timestamps"]:
+            messages.append(format_event(
+                "interpolation", {"version": version, "timestamps": changes["interpolation_timestamps"]}, version
+            ))
+
+        stations = changes["stations"]
+        ids = np.array([station["station_id"] for station in stations], dtype=object)
+        coords = np.array([station["location"]["coordinates"][:2] for station in stations],
+                          dtype=np.float64).reshape(-1, 2)
+
+        readings_by_bbox: Dict[Optional[BBox], Optional[str]] = {}
+        for subscription in list(self._subscribers):
+            if subscription.bbox not in readings_by_bbox:
+                selected = ids if subscription.bbox is None else ids[bbox_mask(coords[:, 0], coords[:, 1], subscription.bbox)]
+                readings_by_bbox[subscription.bbox] = format_event(
+                    "readings", {"version": version, "stations": selected.tolist()}, version
+                ) if len(selected) else None
+
+            readings = readings_by_bbox[subscription.bbox]
+            for message in messages + ([readings] if readings else []):
+                self.events += 1
+                if not subscription.deliver(message, version):
+                    self.resyncs += 1
+                    break
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get subscriber and poller counters.
+
+        Returns:
+            Dict[str, Any]: Subscribers, last seen version, polls, failed polls,
+            events queued and subscribers told to resync
+        """
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "version": self.version,
+            "polls": self.polls,
+            "failed_polls": self.failed_polls,
+            "events": self.events,
+            "resyncs": self.resyncs
+        }
+
+
+# Shared change feed for this worker process
+change_feed = ChangeFeed(settings.EVENTS_POLL_INTERVAL_SECONDS, settings.EVENTS_QUEUE_SIZE,
+                         settings.EVENTS_MAX_SUBSCRIBERS)
@@ -0,0 +1,275 @@
+"""
+Declarative registry of the MongoDB indexes the API relies on.
+
+Every index is declared here once, with the queries it serves, instead of
+being created ad hoc when the connection opens. ``ensure_indexes`` builds
+whatever is missing. ``verify_indexes`` compares the live indexes with the
+registry and reports missing and unregistered indexes and, from
+``$indexStats``, the indexes that have not served a single operation.
+``benchmark_queries`` runs the queries behind the compound indexes under
+``explain`` so that the effect of an index change can be measured.
+"""
+import re
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import pymongo
+from pymongo import IndexModel
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from app.config import settings
+from app.db.query_log import summarize_explain
+
+
+class IndexSpec(NamedTuple):
+    """One registered index."""
+    keys: Tuple[Tuple[str, Any], ...]
+    purpose: str
+
+    @property
+    def name(self) -> str:
+        """MongoDB's default name for the key pattern, e.g. ``timestamp_1_location_2dsphere``."""
+        return "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+
+# Station metadata and readings loaded before monthly partitioning
+WEATHER_INDEXES = [
+    IndexSpec((("location", pymongo.GEOSPHERE),), "Stations near a point"),
+    IndexSpec((("station_id", pymongo.ASCENDING),), "Station lookups and metadata upserts"),
+    IndexSpec((("entries.timestamp", pymongo.ASCENDING),), "Readings at a timestamp or in a range"),
+    IndexSpec((("version", pymongo.ASCENDING),), "Stations changed since a data version (sync)"),
+]
+
+# Monthly station bucket collections (one document per station and month)
+PARTITION_INDEXES = [
+    IndexSpec((("location", pymongo.GEOSPHERE),), "Stations near a point"),
+    IndexSpec(
+        (("station_id", pymongo.ASCENDING), ("entries.timestamp", pymongo.ASCENDING)),
+        "Bucket lookups by station, and per-station reading ranges (exports)"
+    ),
+    IndexSpec((("entries.timestamp", pymongo.ASCENDING),), "Readings at a timestamp or in a range"),
+    IndexSpec((("entries.version", pymongo.ASCENDING),), "Readings added since a data version (sync)"),
+]
+
+INTERPOLATION_INDEXES = [
+    IndexSpec((("location", pymongo.GEOSPHERE),), "Grid points near a location at any time"),
+    IndexSpec(
+        (("timestamp", pymongo.ASCENDING), ("location", pymongo.GEOSPHERE)),
+        "Grid points near a location at one timestamp"
+    ),
+    IndexSpec(
+        (("timestamp", pymongo.ASCENDING), ("_id", pymongo.ASCENDING)),
+        "Grid and time-range pages in keyset order"
+    ),
+    IndexSpec(
+        (("cell_id", pymongo.ASCENDING), ("timestamp", pymongo.ASCENDING)),
+        "Point time series of one grid cell"
+    ),
+    IndexSpec((("version", pymongo.ASCENDING),), "Grid points written since a data version (sync)"),
+]
+
+# Resampled station series (one document per station, step and month)
+SERIES_INDEXES = [
+    IndexSpec(
+        (("station_id", pymongo.ASCENDING), ("step_seconds", pymongo.ASCENDING), ("start", pymongo.ASCENDING)),
+        "Series document of a station, step and month"
+    ),
+]
+
+
+def _partition_pattern() -> "re.Pattern":
+    return re.compile(rf"^{re.escape(settings.WEATHER_COLLECTION)}_\d{{4}}_\d{{2}}$")
+
+
+def registered_collections(db: Database) -> List[Tuple[Collection, List[IndexSpec]]]:
+    """
+    List every existing collection covered by the registry with its indexes.
+
+    Args:
+        db: Database holding the collections
+
+    Returns:
+        List[Tuple[Collection, List[IndexSpec]]]: Base weather collection,
+        interpolation collection, series collection and every monthly partition
+    """
+    collections = [
+        (db[settings.WEATHER_COLLECTION], WEATHER_INDEXES),
+        (db[settings.INTERPOLATION_COLLECTION], INTERPOLATION_INDEXES),
+        (db[settings.SERIES_COLLECTION], SERIES_INDEXES),
+    ]
+    pattern = _partition_pattern()
+    for name in sorted(db.list_collection_names()):
+        if pattern.match(name):
+            collections.append((db[name], PARTITION_INDEXES))
+    return collections
+
+
+def ensure_collection_indexes(collection: Collection, specs: List[IndexSpec]) -> List[str]:
+    """
+    Build the registered indexes a collection is missing.
+
+    Builds do not block reads or writes of the collection (MongoDB 4.2+
+    ignores ``background`` and always builds this way; older servers honour it).
+
+    Args:
+        collection: Collection to index
+        specs: Indexes it should have
+
+    Returns:
+        List[str]: Names of the indexes that were created
+    """
+    existing = set(collection.index_information())
+    missing = [spec for spec in specs if spec.name not in existing]
+    if not missing:
+        return []
+    return collection.create_indexes([
+        IndexModel(list(spec.keys), name=spec.name, background=True) for spec in missing
+    ])
+
+
+def ensure_indexes(db: Database) -> Dict[str, List[str]]:
+    """
+    Build every missing registered index.
+
+    Args:
+        db: Database holding the collections
+
+    Returns:
+        Dict[str, List[str]]: Created index names per collection (only collections that changed)
+    """
+    created = {}
+    for collection, specs in registered_collections(db):
+        names = ensure_collection_indexes(collection, specs)
+        if names:
+            created[collection.name] = names
+    return created
+
+
+def verify_indexes(db: Database) -> List[Dict[str, Any]]:
+    """
+    Compare the live indexes with the registry and report their usage.
+
+    Usage comes from ``$indexStats`` and counts operations since the index
+    was built or the server last restarted (``since``).
+
+    Args:
+        db: Database holding the collections
+
+    Returns:
+        List[Dict[str, Any]]: Per collection: ``missing`` and ``unregistered``
+        index names, ``unused`` indexes with zero operations, and ``usage`` per index
+    """
+    report = []
+    for collection, specs in registered_collections(db):
+        registered = {spec.name for spec in specs}
+        live = set(collection.index_information()) - {"_id_"}
+        usage = {
+            stats["name"]: {"ops": stats["accesses"]["ops"], "since": stats["accesses"]["since"]}
+            for stats in collection.aggregate([{"$indexStats": {}}])
+            if stats["name"] != "_id_"
+        }
+        report.append({
+            "collection": collection.name,
+            "missing": sorted(registered - live),
+            "unregistered": sorted(live - registered),
+            "unused": sorted(name for name, stats in usage.items() if stats["ops"] == 0),
+            "usage": usage
+        })
+    return report
+
+
+def _benchmark_cases(db: Database) -> List[Tuple[str, Collection, Callable[[], Dict[str, Any]]]]:
+    """Build the explainable commands behind the compound indexes from a sample of the stored data."""
+    interpolation = db[settings.INTERPOLATION_COLLECTION]
+    sample = interpolation.find_one({}, {"timestamp": 1, "location": 1, "cell_id": 1})
+    if sample is None:
+        return []
+
+    timestamp = sample["timestamp"]
+    cases = [
+        ("interpolation near point at timestamp", interpolation, lambda: {
+            "find": interpolation.name,
+            "filter": {
+                "timestamp": timestamp,
+                "location": {"$near": {"$geometry": sample["location"], "$maxDistance": 10000}}
+            },
+            "limit": 100
+        }),
+        ("interpolation grid page", interpolation, lambda: {
+            "find": interpolation.name,
+            "filter": {"timestamp": timestamp},
+            "sort": {"timestamp": 1, "_id": 1},
+            "limit": 1000
+        }),
+    ]
+    if "cell_id" in sample:
+        cases.append(("interpolation point series", interpolation, lambda: {
+            "find": interpolation.name,
+            "filter": {"cell_id": sample["cell_id"], "timestamp": {"$gte": timestamp}},
+            "sort": {"cell_id": 1, "timestamp": 1}
+        }))
+
+    pattern = _partition_pattern()
+    partitions = [name for name in sorted(db.list_collection_names()) if pattern.match(name)]
+    if partitions:
+        partition = db[partitions[-1]]
+        bucket = partition.find_one({}, {"station_id": 1, "entries": {"$slice": 1}})
+        if bucket and bucket.get("entries"):
+            reading_time = bucket["entries"][0]["timestamp"]
+            cases.append(("station bucket readings", partition, lambda: {
+                "find": partition.name,
+                "filter": {"station_id": {"$in": [bucket["station_id"]]},
+                           "entries.timestamp": {"$gte": reading_time}},
+                "projection": {"station_id": 1}
+            }))
+    return cases
+
+
+def benchmark_queries(db: Database, repeat: int = 5) -> List[Dict[str, Any]]:
+    """
+    Time the queries served by the compound indexes and capture their plans.
+
+    Args:
+        db: Database holding the collections
+        repeat: Timed runs per query; the best run is reported
+
+    Returns:
+        List[Dict[str, Any]]: Per query: best wall time in milliseconds plus
+        the explain summary (indexes used, documents examined and returned)
+    """
+    results = []
+    for label, collection, command in _benchmark_cases(db):
+        spec = command()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            db.command(spec)
+            timings.append((time.perf_counter() - started) * 1000)
+        plan = summarize_explain(db.command("explain", spec, verbosity="executionStats"))
+        results.append({"query": label, "collection": collection.name, "best_ms": round(min(timings), 2), **plan})
+    return results
+
+
+def print_report(report: List[Dict[str, Any]], benchmarks: Optional[List[Dict[str, Any]]] = None) -> None:
+    """
+    Print a verification report and optional benchmark results.
+
+    Args:
+        report: Result of :func:`verify_indexes`
+        benchmarks: Result of :func:`benchmark_queries`
+    """
+    for entry in report:
+        print(f"{entry['collection']}:")
+        for name, stats in sorted(entry["usage"].items()):
+            print(f"  {name:<45}{stats['ops']:>12} ops since {stats['since']}")
+        for key in ("missing", "unregistered", "unused"):
+            if entry[key]:
+                print(f"  {key}: {', '.join(entry[key])}")
+
+    if benchmarks:
+        print(f"\n{'query':<40}{'best ms':>10}{'examined':>10}{'returned':>10}  indexes")
+        for row in benchmarks:
+            indexes = ", ".join(row["indexes"]) or ("COLLSCAN" if row["collection_scan"] else "-")
+            print(f"{row['query']:<40}{row['best_ms']:>10}{row['docs_examined'] or 0:>10}"
+                  f"{row['returned'] or 0:>10}  {indexes}")
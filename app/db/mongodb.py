@@ -2,15 +2,32 @@
 MongoDB connection and data operations for the Weather API.
 Supports both weather station data and interpolated weather data.
 """
-from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+import heapq
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 
 import pymongo
-from pymongo import MongoClient
+from pymongo import MongoClient, ReplaceOne, UpdateOne
 from pymongo.collection import Collection
 from pymongo.database import Database
 
 from app.config import settings
+from app.db.indexes import (
+    INTERPOLATION_INDEXES, PARTITION_INDEXES, SERIES_INDEXES, WEATHER_INDEXES, ensure_collection_indexes
+)
+from app.db.query_log import slow_query_log
+from app.models.weather import READING_FIELDS
+from app.utils.columnar import InterpolationColumns
+from app.utils.idw import cell_ids
+from app.utils.pagination import CursorKey, keyset_filter
+from app.utils.resampling import merge_series, month_start, next_month
+from app.utils.timestamps import naive_utc
 
 
 class MongoDBManager:
@@ -26,6 +43,14 @@ class MongoDBManager:
             cls._instance._db = None
             cls._instance._weather_collection = None
             cls._instance._interpolation_collection = None  # New collection for interpolated data
+            cls._instance._counters_collection = None
+            cls._instance._series_collection = None
+            cls._instance._indexed_partitions = set()
+            cls._instance._partition_list = None
+            cls._instance._partition_executor = ThreadPoolExecutor(
+                max_workers=settings.PARTITION_QUERY_WORKERS,
+                thread_name_prefix="partition-query"
+            )
             cls._instance._initialize_connection()
         return cls._instance
     
@@ -41,15 +66,16 @@ class MongoDBManager:
             # Initialize interpolation collection
             self._interpolation_collection = self._db[settings.INTERPOLATION_COLLECTION]
             
-            # Create geo index for location-based queries in weather collection
-            self._weather_collection.create_index([("location", pymongo.GEOSPHERE)])
+            # Initialize counters collection (data version for incremental sync)
+            self._counters_collection = self._db[settings.COUNTERS_COLLECTION]
             
-            # Create index for timestamp-based queries in weather collection
-            self._weather_collection.create_index([("entries.timestamp", pymongo.ASCENDING)])
+            # Initialize resampled station series collection
+            self._series_collection = self._db[settings.SERIES_COLLECTION]
             
-            # Create indexes for interpolation collection
-            self._interpolation_collection.create_index([("location", pymongo.GEOSPHERE)])
-            self._interpolation_collection.create_index([("timestamp", pymongo.ASCENDING)])
+            # Build any registered index the collections are missing
+            ensure_collection_indexes(self._weather_collection, WEATHER_INDEXES)
+            ensure_collection_indexes(self._interpolation_collection, INTERPOLATION_INDEXES)
+            ensure_collection_indexes(self._series_collection, SERIES_INDEXES)
             
             print("MongoDB connection initialized successfully")
         except Exception as e:
@@ -76,9 +102,342 @@ class MongoDBManager:
         """Get interpolation data collection."""
         return self._interpolation_collection
     
+    #
+    # Partition Methods
+    #
+
+    @staticmethod
+    def partition_name(year: int, month: int) -> str:
+        """
+        Get the name of the monthly partition collection for station readings.
+
+        Args:
+            year: Partition year
+            month: Partition month (1-12)
+
+        Returns:
+            str: Collection name, e.g. ``weather_stations_2024_05``
+        """
+        return f"{settings.WEATHER_COLLECTION}_{year:04d}_{month:02d}"
+
+    def weather_partition(self, year: int, month: int) -> Collection:
+        """
+        Get the monthly partition collection for station readings, creating its indexes on first use.
+
+        Args:
+            year: Partition year
+            month: Partition month (1-12)
+
+        Returns:
+            Collection: The partition collection
+        """
+        name = self.partition_name(year, month)
+        collection = self._db[name]
+        if name not in self._indexed_partitions:
+            ensure_collection_indexes(collection, PARTITION_INDEXES)
+            self._indexed_partitions.add(name)
+            self._partition_list = None
+        return collection
+
+    def _list_weather_partitions(self) -> List[Tuple[datetime, str]]:
+        """
+        List existing monthly partitions, cached for PARTITION_LIST_TTL_SECONDS.
+
+        Returns:
+            List[Tuple[datetime, str]]: (month start, collection name) pairs in time order
+        """
+        now = time.monotonic()
+        if self._partition_list is None or now - self._partition_list[0] > settings.PARTITION_LIST_TTL_SECONDS:
+            pattern = re.compile(rf"^{re.escape(settings.WEATHER_COLLECTION)}_(\d{{4}})_(\d{{2}})$")
+            partitions = []
+            for name in self._db.list_collection_names():
+                match = pattern.match(name)
+                if match:
+                    partitions.append((datetime(int(match.group(1)), int(match.group(2)), 1), name))
+            self._partition_list = (now, sorted(partitions))
+        return self._partition_list[1]
+
+    def _weather_collections_for_range(self, start_time: Optional[datetime] = None,
+                                       end_time: Optional[datetime] = None) -> List[Collection]:
+        """
+        Select the collections that can hold readings in a time range.
+
+        The base collection is always included so that stations loaded before
+        partitioning keep answering queries.
+
+        Args:
+            start_time: Start of the range (unbounded if None)
+            end_time: End of the range (unbounded if None)
+
+        Returns:
+            List[Collection]: Base collection followed by overlapping partitions
+        """
+        collections = [self._weather_collection]
+        range_start = naive_utc(start_time) if start_time else None
+        range_end = naive_utc(end_time) if end_time else None
+        for partition_start, name in self._list_weather_partitions():
+            if range_end is not None and partition_start > range_end:
+                continue
+            if range_start is not None and next_month(partition_start) <= range_start:
+                continue
+            collections.append(self._db[name])
+        return collections
+
+    def _query_collections(self, collections: List[Collection],
+                           query: Callable[[Collection], List[Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+        """
+        Run the same query against several collections concurrently.
+
+        Args:
+            collections: Collections to query
+            query: Function running the query against one collection
+
+        Returns:
+            List[List[Dict]]: Results per collection, in the order given
+        """
+        if len(collections) == 1:
+            return [query(collections[0])]
+        return list(self._partition_executor.map(query, collections))
+
+    #
+    # Timed Query Helpers
+    #
+
+    def _find(self, label: str, collection: Collection, query: Dict[str, Any],
+              projection: Optional[Dict[str, Any]] = None,
+              sort: Optional[List[Tuple[str, int]]] = None,
+              limit: int = 0,
+              decode: Callable[[Iterable[Dict[str, Any]]], Any] = list) -> Any:
+        """
+        Run a find, reporting its duration to the slow-query log.
+
+        Args:
+            label: Query name for the slow-query log
+            collection: Collection to query
+            query: Filter document
+            projection: Optional projection
+            sort: Optional sort specification
+            limit: Maximum number of documents (0 for no limit)
+            decode: Consumes the cursor (defaults to building a list)
+
+        Returns:
+            Any: The decoded result, by default a list of matching documents
+        """
+        start = time.perf_counter()
+        cursor = collection.find(query, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+        documents = decode(cursor)
+
+        def command() -> Dict[str, Any]:
+            spec = {"find": collection.name, "filter": query}
+            if projection:
+                spec["projection"] = projection
+            if sort:
+                spec["sort"] = dict(sort)
+            if limit:
+                spec["limit"] = limit
+            return spec
+
+        slow_query_log.observe(label, collection, time.perf_counter() - start, command)
+        return documents
+
+    def _find_one(self, label: str, collection: Collection, query: Dict[str, Any],
+                  projection: Optional[Dict[str, Any]] = None,
+                  sort: Optional[List[Tuple[str, int]]] = None) -> Optional[Dict[str, Any]]:
+        """Run a single-document find through :meth:`_find`."""
+        documents = self._find(label, collection, query, projection, sort, limit=1)
+        return documents[0] if documents else None
+
+    def _aggregate(self, label: str, collection: Collection,
+                   pipeline: List[Dict[str, Any]],
+                   batch_size: Optional[int] = None,
+                   decode: Callable[[Iterable[Dict[str, Any]]], Any] = list) -> Any:
+        """
+        Run an aggregation pipeline, reporting its duration to the slow-query log.
+
+        Args:
+            label: Query name for the slow-query log
+            collection: Collection to query
+            pipeline: Aggregation pipeline
+            batch_size: Documents fetched per cursor batch (server default if None)
+            decode: Consumes the cursor (defaults to building a list); ``iter``
+                keeps the live cursor, and then only the first batch is timed
+
+        Returns:
+            Any: The decoded result, by default a list of the pipeline output
+        """
+        start = time.perf_counter()
+        options = {} if batch_size is None else {"batchSize": batch_size}
+        documents = decode(collection.aggregate(pipeline, **options))
+        slow_query_log.observe(
+            label, collection, time.perf_counter() - start,
+            lambda: {"aggregate": collection.name, "pipeline": pipeline,
+                     "cursor": {} if batch_size is None else {"batchSize": batch_size}}
+        )
+        return documents
+
+    def _count(self, label: str, collection: Collection, query: Dict[str, Any]) -> int:
+        """Count documents, reporting the duration to the slow-query log."""
+        start = time.perf_counter()
+        count = collection.count_documents(query)
+        slow_query_log.observe(
+            label, collection, time.perf_counter() - start,
+            lambda: {"count": collection.name, "query": query}
+        )
+        return count
+
+    def _distinct(self, label: str, collection: Collection, key: str,
+                  query: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Get distinct values of a field, reporting the duration to the slow-query log."""
+        start = time.perf_counter()
+        values = collection.distinct(key, query)
+        slow_query_log.observe(
+            label, collection, time.perf_counter() - start,
+            lambda: {"distinct": collection.name, "key": key, "query": query or {}}
+        )
+        return values
+
+    @staticmethod
+    def _split_entries_by_month(entries: List[Dict[str, Any]]) -> Dict[Tuple[int, int], List[Dict[str, Any]]]:
+        """
+        Group entries by the (year, month) partition of their UTC timestamp.
+
+        Timezone-aware timestamps are converted to naive UTC first, because
+        that is how MongoDB stores them and how range queries pick partitions.
+        """
+        months = defaultdict(list)
+        for entry in entries:
+            timestamp = naive_utc(entry["timestamp"])
+            if timestamp is not entry["timestamp"]:
+                entry = {**entry, "timestamp": timestamp}
+            months[(timestamp.year, timestamp.month)].append(entry)
+        return months
+
+    #
+    # Data Versions
+    #
+
+    @contextmanager
+    def _data_version(self) -> Iterator[int]:
+        """
+        Allocate the version stamped on the documents of one write.
+
+        Versions come from a single atomically incremented counter, so they
+        increase monotonically across every write path and every process.
+        The version stays listed as pending until the write has finished, so
+        :meth:`stable_data_version` never reports it before its documents
+        are visible.
+
+        Yields:
+            int: The new version
+        """
+        counter = self._counters_collection.find_one_and_update(
+            {"_id": "data_version"},
+            [
+                {"$set": {"value": {"$add": [{"$ifNull": ["$value", 0]}, 1]}}},
+                {"$set": {"pending": {"$concatArrays": [
+                    {"$ifNull": ["$pending", []]}, [{"version": "$value", "at": "$$NOW"}]
+                ]}}}
+            ],
+            upsert=True,
+            return_document=pymongo.ReturnDocument.AFTER
+        )
+        version = counter["value"]
+        try:
+            yield version
+        finally:
+            self._counters_collection.update_one(
+                {"_id": "data_version"}, {"$pull": {"pending": {"version": version}}}
+            )
+
+    def _renew_data_version(self, version: int) -> None:
+        """Mark a long-running write's version as still in progress, resetting its pending timeout."""
+        self._counters_collection.update_one(
+            {"_id": "data_version", "pending.version": version},
+            {"$currentDate": {"pending.$.at": True}}
+        )
+
+    def stable_data_version(self) -> int:
+        """
+        Get the highest data version whose writes, and all earlier ones, have finished.
+
+        Pending writes older than ``SYNC_PENDING_TIMEOUT_SECONDS`` are assumed
+        to have died and are ignored.
+
+        Returns:
+            int: The version, 0 if nothing has been written since versioning began
+        """
+        counter = self._find_one("stable_data_version", self._counters_collection, {"_id": "data_version"})
+        if counter is None:
+            return 0
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=settings.SYNC_PENDING_TIMEOUT_SECONDS)
+        pending = [item["version"] for item in counter.get("pending", []) if item["at"] > cutoff]
+        return min(pending) - 1 if pending else counter["value"]
+
+    @staticmethod
+    def _stamp_entries(entries: List[Dict[str, Any]], version: int) -> List[Dict[str, Any]]:
+        """Copy readings with the write's data version added."""
+        return [{**entry, "version": version} for entry in entries]
+
     #
     # Weather Station Data Methods
     #
+
+    @staticmethod
+    def _station_projection(include_entries: bool,
+                            fields: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Build the projection for station documents.
+
+        Args:
+            include_entries: Whether to return the station's readings
+            fields: Stored reading keys to keep in each entry (all if None)
+
+        Returns:
+            Dict[str, int]: MongoDB projection
+        """
+        projection = {"station_id": 1, "station_name": 1, "location": 1}
+        if include_entries:
+            if fields is None:
+                projection["entries"] = 1
+            else:
+                projection["entries.timestamp"] = 1
+                for field in fields:
+                    projection[f"entries.{field}"] = 1
+        return projection
+
+    def _attach_partition_entries(self, stations: List[Dict[str, Any]],
+                                  fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Add the readings held in monthly partitions to station documents.
+
+        Args:
+            stations: Station documents from the base collection
+            fields: Stored reading keys to keep in each entry (all if None)
+
+        Returns:
+            List[Dict]: The same documents with ``entries`` merged and sorted by timestamp
+        """
+        if not stations:
+            return stations
+
+        by_id = {station["station_id"]: station for station in stations}
+        projection = self._station_projection(True, fields)
+        partitions = self._weather_collections_for_range()[1:]
+
+        def fetch(collection: Collection) -> List[Dict[str, Any]]:
+            return self._find("attach_partition_entries", collection, {"station_id": {"$in": list(by_id)}}, projection)
+
+        for documents in self._query_collections(partitions, fetch) if partitions else []:
+            for document in documents:
+                by_id[document["station_id"]].setdefault("entries", []).extend(document.get("entries", []))
+
+        for station in stations:
+            station.setdefault("entries", []).sort(key=lambda entry: entry["timestamp"])
+        return stations
     
     def insert_weather_station(self, station_data: Dict[str, Any]) -> str:
         """
@@ -88,25 +447,59 @@ class MongoDBManager:
             station_data: Dictionary containing station information and readings
             
         Returns:
-            str: ID of the inserted document
+            str: ID of the station's metadata document
         """
-        result = self._weather_collection.insert_one(station_data)
-        return str(result.inserted_id)
+        return self.insert_many_weather_stations([station_data])[0]
     
     def insert_many_weather_stations(self, stations_data: List[Dict[str, Any]]) -> List[str]:
         """
         Insert multiple weather stations with their data into the database.
+
+        Station metadata is upserted into the base collection and readings are
+        split into one document per station per monthly partition.
         
         Args:
             stations_data: List of dictionaries containing station information and readings
             
         Returns:
-            List[str]: IDs of the inserted documents
+            List[str]: IDs of the stations' metadata documents
         """
-        result = self._weather_collection.insert_many(stations_data)
-        return [str(id) for id in result.inserted_ids]
+        if not stations_data:
+            return []
+
+        with self._data_version() as version:
+            return self._insert_stations(stations_data, version)
+
+    def _insert_stations(self, stations_data: List[Dict[str, Any]], version: int) -> List[str]:
+        """Write station metadata and partitioned readings stamped with a data version."""
+        metadata_ops = []
+        partition_docs = defaultdict(list)
+        for station in stations_data:
+            metadata = {key: value for key, value in station.items() if key not in ("_id", "entries", "version")}
+            metadata_ops.append(UpdateOne(
+                {"station_id": metadata["station_id"]}, {"$set": {**metadata, "version": version}}, upsert=True
+            ))
+            entries = self._stamp_entries(station.get("entries", []), version)
+            for month, entries in self._split_entries_by_month(entries).items():
+                partition_docs[month].append({**metadata, "entries": entries})
 
-    def find_stations_by_location(self, longitude: float, latitude: float, max_distance: int = 10000) -> List[Dict[str, Any]]:
+        self._weather_collection.bulk_write(metadata_ops, ordered=False)
+        for (year, month), documents in sorted(partition_docs.items()):
+            self.weather_partition(year, month).insert_many(documents)
+
+        station_ids = [station["station_id"] for station in stations_data]
+        id_by_station = {
+            doc["station_id"]: str(doc["_id"])
+            for doc in self._find(
+                "insert_many_weather_stations", self._weather_collection,
+                {"station_id": {"$in": station_ids}}, {"station_id": 1}
+            )
+        }
+        return [id_by_station[station_id] for station_id in station_ids if station_id in id_by_station]
+
+    def find_stations_by_location(self, longitude: float, latitude: float, max_distance: int = 10000,
+                                  include_entries: bool = False,
+                                  fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Find weather stations near a given location.
         
@@ -114,6 +507,8 @@ class MongoDBManager:
             longitude: Longitude coordinate
             latitude: Latitude coordinate
             max_distance: Maximum distance in meters (default: 10km)
+            include_entries: Whether to return each station's readings
+            fields: Stored reading keys to keep in each entry (all if None)
             
         Returns:
             List[Dict]: List of weather stations near the specified location
@@ -130,19 +525,27 @@ class MongoDBManager:
             }
         }
         
-        return list(self._weather_collection.find(query))
+        stations = self._find(
+            "find_stations_by_location", self._weather_collection,
+            query, self._station_projection(include_entries, fields)
+        )
+        return self._attach_partition_entries(stations, fields) if include_entries else stations
     
     def find_entries_by_timestamp(self, timestamp: datetime, 
-                                 max_results: int = 100) -> List[Dict[str, Any]]:
+                                 max_results: int = 100,
+                                 after: Optional[CursorKey] = None) -> List[Dict[str, Any]]:
         """
         Find weather entries across all stations for a specific timestamp.
+
+        Only the partition holding the timestamp (and the base collection) is queried.
         
         Args:
             timestamp: Datetime object to search for
             max_results: Maximum number of results to return
+            after: Keyset position of the last row of the previous page
             
         Returns:
-            List[Dict]: List of weather entries matching the timestamp
+            List[Dict]: List of weather entries matching the timestamp, ordered by document ID
         """
         pipeline = [
             {
@@ -161,38 +564,194 @@ class MongoDBManager:
                     "entry": "$entries"
                 }
             },
+            {
+                "$sort": {"_id": 1}
+            },
             {
                 "$limit": max_results
             }
         ]
-        
-        return list(self._weather_collection.aggregate(pipeline))
-    
+
+        if after is not None:
+            pipeline.insert(0, {"$match": {"_id": {"$gt": after[1]}}})
+
+        results = self._query_collections(
+            self._weather_collections_for_range(timestamp, timestamp),
+            lambda collection: self._aggregate("find_entries_by_timestamp", collection, pipeline)
+        )
+        return list(islice(heapq.merge(*results, key=lambda row: row["_id"]), max_results))
+
+    def find_nearest_entries_by_timestamp(self, timestamp: datetime, tolerance: int,
+                                          max_results: int = 100,
+                                          after: Optional[CursorKey] = None) -> List[Dict[str, Any]]:
+        """
+        Find, for each station, the weather entry closest to a timestamp.
+
+        Only entries within ``tolerance`` seconds either side of the timestamp
+        are considered. The leading range match is served by the
+        ``entries.timestamp`` index, so stations without a reading in the
+        window are never unwound. A window spanning a month boundary queries
+        both partitions and keeps the closer reading.
+
+        Args:
+            timestamp: Datetime object to search around
+            tolerance: Half-width of the search window in seconds
+            max_results: Maximum number of results to return
+            after: Keyset position (station ID) of the last row of the previous page
+
+        Returns:
+            List[Dict]: One entry per station, ordered by station ID
+        """
+        window_start = timestamp - timedelta(seconds=tolerance)
+        window_end = timestamp + timedelta(seconds=tolerance)
+
+        # $elemMatch lets the multikey index intersect both bounds of the window
+        match = {
+            "entries": {"$elemMatch": {"timestamp": {
+                "$gte": window_start,
+                "$lte": window_end
+            }}}
+        }
+        if after is not None:
+            match["station_id"] = {"$gt": after[1]}
+
+        pipeline = [
+            {
+                "$match": match
+            },
+            {
+                "$project": {
+                    "station_id": "$station_id",
+                    "station_name": "$station_name",
+                    "location": "$location",
+                    "entry": {
+                        "$filter": {
+                            "input": "$entries",
+                            "as": "e",
+                            "cond": {
+                                "$and": [
+                                    {"$gte": ["$$e.timestamp", window_start]},
+                                    {"$lte": ["$$e.timestamp", window_end]}
+                                ]
+                            }
+                        }
+                    }
+                }
+            },
+            {
+                "$unwind": "$entry"
+            },
+            {
+                "$addFields": {
+                    "offset": {"$abs": {"$subtract": ["$entry.timestamp", timestamp]}}
+                }
+            },
+            {
+                "$sort": {"station_id": 1, "offset": 1}
+            },
+            {
+                "$group": {
+                    "_id": "$station_id",
+                    "station_id": {"$first": "$station_id"},
+                    "station_name": {"$first": "$station_name"},
+                    "location": {"$first": "$location"},
+                    "entry": {"$first": "$entry"},
+                    "offset": {"$first": "$offset"}
+                }
+            },
+            {
+                "$sort": {"_id": 1}
+            },
+            {
+                "$limit": max_results
+            }
+        ]
+
+        results = self._query_collections(
+            self._weather_collections_for_range(window_start, window_end),
+            lambda collection: self._aggregate("find_nearest_entries_by_timestamp", collection, pipeline)
+        )
+
+        nearest = {}
+        for rows in results:
+            for row in rows:
+                best = nearest.get(row["station_id"])
+                if best is None or row["offset"] < best["offset"]:
+                    nearest[row["station_id"]] = row
+        return [nearest[station_id] for station_id in sorted(nearest)[:max_results]]
+
     def find_entries_by_time_range(self, start_time: datetime, end_time: datetime, 
-                                  max_results: int = 1000) -> List[Dict[str, Any]]:
+                                  max_results: int = 1000,
+                                  after: Optional[CursorKey] = None,
+                                  decode: Callable[[Iterable[Dict[str, Any]]], Any] = list) -> Any:
         """
         Find weather entries across all stations within a time range.
+
+        Results are ordered by ``(entries.timestamp, _id)``, where ``_id`` is
+        the station bucket document holding the reading. Passing the key of
+        the last row of a page as ``after`` resumes strictly after it.
+
+        The range and the cursor bound are applied inside each bucket before
+        unwinding, and each bucket contributes at most ``max_results`` of its
+        earliest remaining readings (``$sortArray``, MongoDB 5.2+). The blocking
+        sort therefore sees at most ``max_results`` rows per bucket, however
+        much of the range is left.
+
+        Rows are merged from live cursors as ``decode`` consumes them. The base
+        collection and the first month are opened concurrently. Later months
+        hold only later readings, so each is opened only once the month before
+        it is exhausted, and not at all once the page is full.
         
         Args:
             start_time: Start datetime for the range
             end_time: End datetime for the range
             max_results: Maximum number of results to return
+            after: Keyset position of the last row of the previous page
+            decode: Consumes the merged rows (defaults to building a list)
             
         Returns:
-            List[Dict]: List of weather entries within the time range
+            Any: The decoded result, by default a list of weather entries within the time range
         """
+        range_start = start_time
+        if after is not None and after[0] is not None:
+            range_start = max(start_time, after[0])
+
+        # $elemMatch lets the multikey index intersect both bounds of the range
+        bucket_match = {"entries": {"$elemMatch": {"timestamp": {"$gte": range_start, "$lte": end_time}}}}
+        entry_conditions = [
+            {"$gte": ["$$entry.timestamp", range_start]},
+            {"$lte": ["$$entry.timestamp", end_time]}
+        ]
+        if after is not None and after[0] is None:
+            bucket_match["_id"] = {"$gt": after[1]}
+        elif after is not None:
+            # Readings at the cursor's timestamp are only left in later buckets
+            entry_conditions.append({"$or": [
+                {"$gt": ["$$entry.timestamp", after[0]]},
+                {"$gt": ["$_id", after[1]]}
+            ]})
+
         pipeline = [
+            {"$match": bucket_match},
             {
-                "$unwind": "$entries"
-            },
-            {
-                "$match": {
-                    "entries.timestamp": {
-                        "$gte": start_time,
-                        "$lte": end_time
-                    }
+                "$project": {
+                    "station_id": 1,
+                    "station_name": 1,
+                    "location": 1,
+                    "entries": {"$slice": [
+                        {"$sortArray": {
+                            "input": {"$filter": {
+                                "input": "$entries", "as": "entry", "cond": {"$and": entry_conditions}
+                            }},
+                            "sortBy": {"timestamp": 1}
+                        }},
+                        max_results
+                    ]}
                 }
             },
+            {"$unwind": "$entries"},
+            {"$sort": {"entries.timestamp": 1, "_id": 1}},
+            {"$limit": max_results},
             {
                 "$project": {
                     "station_id": "$station_id",
@@ -200,29 +759,184 @@ class MongoDBManager:
                     "location": "$location",
                     "entry": "$entries"
                 }
-            },
-            {
-                "$limit": max_results
             }
         ]
-        
-        return list(self._weather_collection.aggregate(pipeline))
+
+        def run(collection: Collection) -> Iterator[Dict[str, Any]]:
+            return self._aggregate("find_entries_by_time_range", collection, pipeline, decode=iter)
+
+        def later_months(first: Iterator[Dict[str, Any]], months: List[Collection]) -> Iterator[Dict[str, Any]]:
+            yield from first
+            for collection in months:
+                yield from run(collection)
+
+        collections = self._weather_collections_for_range(range_start, end_time)
+        cursors = self._query_collections(collections[:2], run)
+        streams = [cursors[0]]
+        if len(cursors) > 1:
+            streams.append(later_months(cursors[1], collections[2:]))
+
+        merged = heapq.merge(*streams, key=lambda row: (row["entry"]["timestamp"], row["_id"]))
+        return decode(islice(merged, max_results))
     
-    def find_station_by_id(self, station_id: str) -> Optional[Dict[str, Any]]:
+    def iter_entries_for_export(self, start_time: datetime, end_time: datetime,
+                                station_ids: Optional[List[str]] = None,
+                                batch_size: int = 5000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream flattened weather entries in a time range from server-side cursors.
+
+        Collections are read one after another (base collection, then the
+        overlapping partitions in month order), each through an aggregation
+        cursor fetching ``batch_size`` rows per round trip, so only one batch
+        is held in memory at a time. Opening each cursor is reported to the
+        slow-query log. There is no blocking sort: rows come out grouped by
+        station document, in stored order.
+
+        Args:
+            start_time: Start datetime for the range
+            end_time: End datetime for the range
+            station_ids: Only export these stations (all if None)
+            batch_size: Rows fetched per cursor batch
+
+        Yields:
+            Dict: station_id, station_name, longitude, latitude, timestamp and the reading values
+        """
+        # $elemMatch lets the multikey index intersect both bounds of the range
+        match = {"entries": {"$elemMatch": {"timestamp": {"$gte": start_time, "$lte": end_time}}}}
+        if station_ids:
+            match["station_id"] = {"$in": station_ids}
+
+        pipeline = [
+            {"$match": match},
+            {"$unwind": "$entries"},
+            # After the unwind entries is a single reading, which $elemMatch would not match
+            {"$match": {"entries.timestamp": {"$gte": start_time, "$lte": end_time}}},
+            {
+                "$project": {
+                    "_id": 0,
+                    "station_id": 1,
+                    "station_name": 1,
+                    "longitude": {"$arrayElemAt": ["$location.coordinates", 0]},
+                    "latitude": {"$arrayElemAt": ["$location.coordinates", 1]},
+                    "timestamp": "$entries.timestamp",
+                    **{key: f"$entries.{key}" for key in settings.COLUMNS_TO_KEEP if key != "Date & Time"}
+                }
+            }
+        ]
+
+        for collection in self._weather_collections_for_range(start_time, end_time):
+            yield from self._aggregate("iter_entries_for_export", collection, pipeline,
+                                       batch_size=batch_size, decode=iter)
+
+    def find_changes_since(self, since: int, until: int, max_readings: int) -> Dict[str, Any]:
+        """
+        Get everything written with a data version in ``(since, until]``.
+
+        Each lookup is served by a version index, so the cost is proportional
+        to the amount of new data rather than to the size of the dataset.
+
+        Args:
+            since: Version the client already holds
+            until: Upper bound, usually :meth:`stable_data_version`
+            max_readings: Readings beyond which the result is cut off
+
+        Returns:
+            Dict: ``stations`` (changed metadata), ``readings`` (new entries
+            with station metadata, at most ``max_readings + 1``) and
+            ``interpolation_timestamps`` (grids with new or replaced points)
+        """
+        versions = {"$gt": since, "$lte": until}
+
+        stations = self._find(
+            "find_changes_since", self._weather_collection, {"version": versions},
+            {"_id": 0, **self._station_projection(False)}, sort=[("station_id", pymongo.ASCENDING)]
+        )
+
+        pipeline = [
+            {"$match": {"entries": {"$elemMatch": {"version": versions}}}},
+            {"$unwind": "$entries"},
+            {"$match": {"entries.version": versions}},
+            {"$project": {"_id": 0, "station_id": 1, "station_name": 1, "location": 1, "entry": "$entries"}},
+            {"$limit": max_readings + 1}
+        ]
+        partitions = self._weather_collections_for_range()[1:]
+        readings = [
+            row
+            for rows in (self._query_collections(
+                partitions, lambda collection: self._aggregate("find_changes_since", collection, pipeline)
+            ) if partitions else [])
+            for row in rows
+        ]
+        readings.sort(key=lambda row: (row["entry"]["timestamp"], row["station_id"]))
+
+        timestamps = sorted(self._distinct(
+            "find_changes_since", self._interpolation_collection, "timestamp", {"version": versions}
+        ))
+        return {"stations": stations, "readings": readings, "interpolation_timestamps": timestamps}
+
+    def find_change_summary(self, since: int, until: int) -> Dict[str, Any]:
+        """
+        Summarize what was written with a data version in ``(since, until]``.
+
+        Unlike :meth:`find_changes_since` no readings are returned, only the
+        stations that received them, so the result stays small however much
+        was written.
+
+        Args:
+            since: Last version already reported
+            until: Upper bound, usually :meth:`stable_data_version`
+
+        Returns:
+            Dict: ``stations`` (ID and location of each station with new
+            readings) and ``interpolation_timestamps`` (grids with new or replaced points)
+        """
+        versions = {"$gt": since, "$lte": until}
+        pipeline = [
+            {"$match": {"entries": {"$elemMatch": {"version": versions}}}},
+            {"$group": {"_id": "$station_id", "location": {"$first": "$location"}}}
+        ]
+        partitions = self._weather_collections_for_range()[1:]
+        stations = {}
+        for rows in (self._query_collections(
+            partitions, lambda collection: self._aggregate("find_change_summary", collection, pipeline)
+        ) if partitions else []):
+            for row in rows:
+                stations[row["_id"]] = row["location"]
+
+        timestamps = sorted(self._distinct(
+            "find_change_summary", self._interpolation_collection, "timestamp", {"version": versions}
+        ))
+        return {
+            "stations": [{"station_id": station_id, "location": location}
+                         for station_id, location in sorted(stations.items())],
+            "interpolation_timestamps": timestamps
+        }
+
+    def find_station_by_id(self, station_id: str, include_entries: bool = True,
+                           fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
         Find a weather station by its ID.
         
         Args:
             station_id: The ID of the station to find
+            include_entries: Whether to return the station's readings
+            fields: Stored reading keys to keep in each entry (all if None)
             
         Returns:
             Optional[Dict]: The weather station document if found, None otherwise
         """
-        return self._weather_collection.find_one({"station_id": station_id})
+        station = self._find_one(
+            "find_station_by_id", self._weather_collection,
+            {"station_id": station_id},
+            self._station_projection(include_entries, fields)
+        )
+        if station and include_entries:
+            self._attach_partition_entries([station], fields)
+        return station
     
     def update_station_metadata(self, station_id: str, metadata: Dict[str, Any]) -> bool:
         """
-        Update metadata for a weather station.
+        Update metadata for a weather station in the base collection and every partition.
         
         Args:
             station_id: The ID of the station to update
@@ -231,16 +945,22 @@ class MongoDBManager:
         Returns:
             bool: True if the update was successful, False otherwise
         """
-        result = self._weather_collection.update_one(
-            {"station_id": station_id},
-            {"$set": metadata}
-        )
+        with self._data_version() as version:
+            result = self._weather_collection.update_one(
+                {"station_id": station_id},
+                {"$set": {**metadata, "version": version}}
+            )
+        for collection in self._weather_collections_for_range()[1:]:
+            collection.update_many({"station_id": station_id}, {"$set": metadata})
         
         return result.modified_count > 0
     
     def add_entries_to_station(self, station_id: str, entries: List[Dict[str, Any]]) -> bool:
         """
         Add new entries to an existing weather station.
+
+        Entries are pushed into the monthly partition of their timestamp,
+        creating the station's document in that partition if needed.
         
         Args:
             station_id: The ID of the station to update
@@ -249,13 +969,78 @@ class MongoDBManager:
         Returns:
             bool: True if the update was successful, False otherwise
         """
-        result = self._weather_collection.update_one(
-            {"station_id": station_id},
-            {"$push": {"entries": {"$each": entries}}}
-        )
-        
-        return result.modified_count > 0
+        return self.bulk_add_entries({station_id: entries}) > 0
+
+    def bulk_add_entries(self, entries_by_station: Dict[str, List[Dict[str, Any]]]) -> int:
+        """
+        Add new entries to many weather stations with two bulk writes per partition.
+
+        The first unordered ``bulk_write`` makes sure each station has a
+        bucket in every partition it touches. The second one pushes each
+        reading with a filter on ``entries.timestamp $ne``, so a reading whose
+        station already has a reading at that timestamp is skipped. The write
+        is therefore idempotent: retrying a batch that was partly applied
+        never stores a reading twice. The number of round trips depends on
+        the months touched, not on the number of readings.
+
+        Args:
+            entries_by_station: Mapping of station ID to its new entries
+
+        Returns:
+            int: Number of readings stored (readings already present are not counted)
+        """
+        metadata_by_station = {
+            doc["station_id"]: doc for doc in self._find(
+                "bulk_add_entries", self._weather_collection,
+                {"station_id": {"$in": list(entries_by_station)}},
+                {"_id": 0, **self._station_projection(False)}
+            )
+        }
+
+        with self._data_version() as version:
+            return self._push_entries(entries_by_station, metadata_by_station, version)
+
+    def _push_entries(self, entries_by_station: Dict[str, List[Dict[str, Any]]],
+                      metadata_by_station: Dict[str, Dict[str, Any]], version: int) -> int:
+        """Push readings stamped with a data version into their monthly partitions, skipping stored ones."""
+        buckets = defaultdict(list)
+        pushes = defaultdict(list)
+        for station_id, entries in entries_by_station.items():
+            metadata = metadata_by_station.get(station_id)
+            if metadata is None or not entries:
+                continue
+            for month, month_entries in self._split_entries_by_month(self._stamp_entries(entries, version)).items():
+                buckets[month].append(UpdateOne(
+                    {"station_id": station_id},
+                    {"$setOnInsert": {
+                        "station_name": metadata["station_name"], "location": metadata["location"], "entries": []
+                    }},
+                    upsert=True
+                ))
+                pushes[month].extend(
+                    UpdateOne(
+                        {"station_id": station_id, "entries.timestamp": {"$ne": entry["timestamp"]}},
+                        {"$push": {"entries": entry}}
+                    )
+                    for entry in month_entries
+                )
+
+        stored = 0
+        for (year, month), bucket_operations in sorted(buckets.items()):
+            partition = self.weather_partition(year, month)
+            partition.bulk_write(bucket_operations, ordered=False)
+            stored += partition.bulk_write(pushes[(year, month)], ordered=False).modified_count
+        return stored
     
+    def iter_station_metadata(self):
+        """
+        Iterate over the metadata of every weather station, without entries.
+
+        Returns:
+            Cursor: Documents with station_id, station_name and location
+        """
+        return self._weather_collection.find({}, {"_id": 0, **self._station_projection(False)})
+
     def count_stations(self) -> int:
         """
         Count the total number of weather stations in the database.
@@ -263,20 +1048,134 @@ class MongoDBManager:
         Returns:
             int: Number of weather stations
         """
-        return self._weather_collection.count_documents({})
+        return self._count("count_stations", self._weather_collection, {})
     
-    def get_all_stations(self, limit: int = 100) -> List[Dict[str, Any]]:
+    def get_all_stations(self, limit: int = 100,
+                         after: Optional[CursorKey] = None,
+                         include_entries: bool = False,
+                         fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Get all weather stations in the database.
         
         Args:
             limit: Maximum number of stations to return
+            after: Keyset position of the last station of the previous page
+            include_entries: Whether to return each station's readings
+            fields: Stored reading keys to keep in each entry (all if None)
             
         Returns:
-            List[Dict]: List of weather stations
+            List[Dict]: List of weather stations, ordered by document ID
         """
-        return list(self._weather_collection.find({}).limit(limit))
+        query = {"_id": {"$gt": after[1]}} if after is not None else {}
+        projection = self._station_projection(include_entries, fields)
+        stations = self._find(
+            "get_all_stations", self._weather_collection, query, projection,
+            sort=[("_id", pymongo.ASCENDING)], limit=limit
+        )
+        return self._attach_partition_entries(stations, fields) if include_entries else stations
     
+    #
+    # Resampled Station Series Methods
+    #
+
+    def upsert_station_series(self, station: Dict[str, Any], series: List[Dict[str, Any]]) -> int:
+        """
+        Store a station's resampled monthly series, merged into earlier ones with the same step.
+
+        Slots the new series has readings for replace the stored slots, and
+        all other stored slots are kept (see
+        :func:`app.utils.resampling.merge_series`), so loading part of a month
+        does not erase the rest of it. Series are only written at ingest:
+        readings submitted through the API are not resampled until the next
+        load with a resampling step.
+
+        Args:
+            station: Station metadata (``station_id``, ``station_name``, ``location``)
+            series: Monthly documents of one step from :func:`app.utils.resampling.resample_entries`
+
+        Returns:
+            int: Number of monthly documents written
+        """
+        if not series:
+            return 0
+        metadata = {key: station[key] for key in ("station_id", "station_name", "location")}
+        stored = {
+            document["start"]: document
+            for document in self._find(
+                "upsert_station_series", self._series_collection,
+                {
+                    "station_id": metadata["station_id"],
+                    "step_seconds": series[0]["step_seconds"],
+                    "start": {"$in": [month["start"] for month in series]}
+                },
+                {"_id": 0}
+            )
+        }
+        operations = []
+        for month in series:
+            if month["start"] in stored:
+                month = merge_series(stored[month["start"]], month)
+            operations.append(ReplaceOne(
+                {"station_id": metadata["station_id"], "step_seconds": month["step_seconds"], "start": month["start"]},
+                {**metadata, **month},
+                upsert=True
+            ))
+        self._series_collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    def find_station_series(self, station_id: str, step_seconds: int, start_time: datetime,
+                            end_time: datetime, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a station's resampled values over a time range.
+
+        Each month is one ``find_one`` on the series index. The slots are cut
+        out with a ``$slice`` projection whose offset is computed from the
+        month start and the step, so no per-reading search is needed.
+
+        Args:
+            station_id: The ID of the station
+            step_seconds: Step of the resampled series
+            start_time: Start of the range; rounded down to its slot
+            end_time: End of the range (inclusive)
+            fields: Stored reading keys to return (all if None)
+
+        Returns:
+            Optional[Dict]: ``start`` (first slot), ``step_seconds``, ``count``,
+            ``samples`` and one dense array per reading key, with ``None`` and
+            0 samples where nothing was recorded; None if the station has no
+            series with this step in the range
+        """
+        keys = list(fields) if fields else list(READING_FIELDS.values())
+        step = timedelta(seconds=step_seconds)
+        start_time, end_time = naive_utc(start_time), naive_utc(end_time)
+        first = month_start(start_time) + ((start_time - month_start(start_time)) // step) * step
+        count = (end_time - first) // step + 1
+
+        result = {key: [None] * count for key in keys}
+        result["samples"] = [0] * count
+        found = False
+        month = month_start(first)
+        while month <= end_time:
+            following = next_month(month)
+            offset = (max(first, month) - month) // step
+            last = min((end_time - month) // step, (following - month) // step - 1)
+            document = self._find_one(
+                "find_station_series", self._series_collection,
+                {"station_id": station_id, "step_seconds": step_seconds, "start": month},
+                {"_id": 0, "count": 1, **{key: {"$slice": [offset, last - offset + 1]} for key in keys + ["samples"]}}
+            )
+            if document is not None:
+                found = True
+                position = (month + offset * step - first) // step
+                for key in keys + ["samples"]:
+                    values = document.get(key) or []
+                    result[key][position:position + len(values)] = values
+            month = following
+
+        if not found:
+            return None
+        return {"start": first, "step_seconds": step_seconds, "count": count, **result}
+
     #
     # Interpolation Data Methods
     #
@@ -291,58 +1190,244 @@ class MongoDBManager:
         result = self._interpolation_collection.delete_many({})
         return result.deleted_count
     
-    def insert_interpolation_data(self, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Union[str, List[str]]:
+    def delete_interpolation_range(self, start_time: datetime, end_time: datetime,
+                                   keep: Optional[List[datetime]] = None) -> int:
+        """
+        Delete interpolated data within a time range.
+
+        Args:
+            start_time: Start datetime for the range
+            end_time: End datetime for the range
+            keep: Timestamps in the range whose grids are left in place
+
+        Returns:
+            int: Number of documents deleted
+        """
+        query = {
+            "timestamp": {
+                "$gte": start_time,
+                "$lte": end_time
+            }
+        }
+        if keep:
+            query["timestamp"]["$nin"] = keep
+        result = self._interpolation_collection.delete_many(query)
+        return result.deleted_count
+
+    def replace_interpolation_grid(self, timestamp: datetime, documents: List[Dict[str, Any]]) -> int:
+        """
+        Replace the grid of one timestamp with new points.
+
+        The new points are inserted before the old ones are deleted, so
+        readers never find the timestamp without a grid, and a failed insert
+        leaves the old grid in place.
+
+        Args:
+            timestamp: Grid timestamp
+            documents: New interpolation documents for the timestamp
+
+        Returns:
+            int: Number of old documents deleted
+        """
+        with self._data_version() as version:
+            self._insert_interpolation_documents(self._interpolation_collection, documents, version)
+            result = self._interpolation_collection.delete_many(
+                {"timestamp": timestamp, "version": {"$ne": version}}
+            )
+        return result.deleted_count
+    
+    def insert_interpolation_data(self, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                                  collection: Optional[Collection] = None,
+                                  version: Optional[int] = None) -> Union[str, List[str]]:
         """
         Insert interpolated weather data into MongoDB.
         
         Args:
             data: Single document or list of documents with interpolation data
+            collection: Target collection, e.g. a shadow collection (defaults to the live collection)
+            version: Data version of an enclosing write such as a reload (a new one is allocated if None)
             
         Returns:
             Union[str, List[str]]: ID(s) of the inserted document(s)
         """
+        collection = collection if collection is not None else self._interpolation_collection
+        if version is None:
+            with self._data_version() as version:
+                return self._insert_interpolation_documents(collection, data, version)
+        # Inserts into a long reload keep its version pending until the swap
+        self._renew_data_version(version)
+        return self._insert_interpolation_documents(collection, data, version)
+
+    @staticmethod
+    def _insert_interpolation_documents(collection: Collection, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                                        version: int) -> Union[str, List[str]]:
+        """Stamp interpolation documents with a data version and insert them."""
+        for document in data if isinstance(data, list) else [data]:
+            document["version"] = version
         if isinstance(data, list):
-            result = self._interpolation_collection.insert_many(data)
+            result = collection.insert_many(data)
             return [str(id) for id in result.inserted_ids]
-        else:
-            result = self._interpolation_collection.insert_one(data)
-            return str(result.inserted_id)
+        result = collection.insert_one(data)
+        return str(result.inserted_id)
+
+    @contextmanager
+    def interpolation_shadow(self) -> Iterator[Tuple[Collection, int]]:
+        """
+        Build a full interpolation reload in a shadow collection, then swap it in.
+
+        Yields an empty shadow collection and the reload's data version, which
+        the loaded points are stamped with as they are inserted. The version
+        stays pending until the swap, so :meth:`stable_data_version` does not
+        pass it while the points are still invisible. When the block finishes,
+        the shadow is indexed and ``renameCollection`` with ``dropTarget``
+        replaces the live collection in one step, so no reader sees an empty or
+        partial collection and the old data is dropped as a whole collection
+        rather than document by document. If the block raises, the shadow is
+        dropped and the live collection is untouched. Any shadow left behind by
+        an interrupted reload is dropped first.
+
+        Yields:
+            Tuple[Collection, int]: The empty shadow collection and the reload's data version
+        """
+        shadow = self._db[f"{settings.INTERPOLATION_COLLECTION}_shadow"]
+        shadow.drop()
+        with self._data_version() as version:
+            try:
+                yield shadow, version
+                ensure_collection_indexes(shadow, INTERPOLATION_INDEXES)
+                self._client.admin.command(
+                    "renameCollection", f"{self._db.name}.{shadow.name}",
+                    to=f"{self._db.name}.{self._interpolation_collection.name}",
+                    dropTarget=True
+                )
+            except BaseException:
+                shadow.drop()
+                raise
     
     def find_interpolation_by_timestamp(self, timestamp: datetime, 
-                                        max_results: int = 1000) -> List[Dict[str, Any]]:
+                                        max_results: int = 1000,
+                                        after: Optional[CursorKey] = None) -> List[Dict[str, Any]]:
         """
         Get interpolation data for a specific timestamp.
         
         Args:
             timestamp: Datetime object to search for
-            max_results: Maximum number of results to return
+            max_results: Maximum number of results to return (0 for the whole grid)
+            after: Keyset position of the last point of the previous page
             
         Returns:
-            List[Dict]: List of interpolation data points matching the timestamp
+            List[Dict]: List of interpolation data points matching the timestamp, ordered by ID
         """
-        return list(self._interpolation_collection.find(
-            {"timestamp": timestamp}
-        ).limit(max_results))
-    
+        query = {"timestamp": timestamp}
+        if after is not None:
+            query["_id"] = {"$gt": after[1]}
+
+        return self._find(
+            "find_interpolation_by_timestamp", self._interpolation_collection, query,
+            sort=[("timestamp", pymongo.ASCENDING), ("_id", pymongo.ASCENDING)], limit=max_results
+        )
+
+    def find_nearest_interpolation_timestamp(self, timestamp: datetime,
+                                             tolerance: int) -> Optional[datetime]:
+        """
+        Find the available interpolation timestamp closest to a given time.
+
+        Two index-backed lookups are made, one either side of the timestamp,
+        and the closer match within the window wins.
+
+        Args:
+            timestamp: Datetime object to search around
+            tolerance: Half-width of the search window in seconds
+
+        Returns:
+            Optional[datetime]: The nearest timestamp, or None if none is in the window
+        """
+        timestamp = naive_utc(timestamp)
+        window = timedelta(seconds=tolerance)
+
+        before = self._find_one(
+            "find_nearest_interpolation_timestamp", self._interpolation_collection,
+            {"timestamp": {"$lte": timestamp, "$gte": timestamp - window}},
+            projection={"timestamp": 1},
+            sort=[("timestamp", pymongo.DESCENDING)]
+        )
+        after = self._find_one(
+            "find_nearest_interpolation_timestamp", self._interpolation_collection,
+            {"timestamp": {"$gt": timestamp, "$lte": timestamp + window}},
+            projection={"timestamp": 1},
+            sort=[("timestamp", pymongo.ASCENDING)]
+        )
+
+        candidates = [doc["timestamp"] for doc in (before, after) if doc]
+        if not candidates:
+            return None
+
+        return min(candidates, key=lambda ts: abs(ts - timestamp))
+
     def find_interpolation_by_time_range(self, start_time: datetime, end_time: datetime,
-                                         max_results: int = 10000) -> List[Dict[str, Any]]:
+                                         max_results: int = 10000,
+                                         after: Optional[CursorKey] = None) -> List[Dict[str, Any]]:
         """
         Get interpolation data within a time range.
+
+        Results are ordered by ``(timestamp, _id)`` and served from the
+        matching compound index, so resuming ``after`` a keyset position is a
+        single index seek.
         
         Args:
             start_time: Start datetime for the range
             end_time: End datetime for the range
             max_results: Maximum number of results to return
+            after: Keyset position of the last point of the previous page
             
         Returns:
             List[Dict]: List of interpolation data points within the time range
         """
-        return list(self._interpolation_collection.find({
+        return self._find(
+            "find_interpolation_by_time_range", self._interpolation_collection,
+            self._interpolation_range_query(start_time, end_time, after),
+            sort=[("timestamp", pymongo.ASCENDING), ("_id", pymongo.ASCENDING)], limit=max_results
+        )
+
+    def find_interpolation_columns_by_time_range(self, start_time: datetime, end_time: datetime,
+                                                 max_results: int = 10000,
+                                                 after: Optional[CursorKey] = None) -> InterpolationColumns:
+        """
+        Get interpolation data within a time range as compact columns.
+
+        Same query and ordering as :meth:`find_interpolation_by_time_range`,
+        but the cursor is decoded document by document into NumPy arrays
+        instead of a list of dicts.
+
+        Args:
+            start_time: Start datetime for the range
+            end_time: End datetime for the range
+            max_results: Maximum number of results to return
+            after: Keyset position of the last point of the previous page
+
+        Returns:
+            InterpolationColumns: Interpolation points grouped by timestamp
+        """
+        return self._find(
+            "find_interpolation_by_time_range", self._interpolation_collection,
+            self._interpolation_range_query(start_time, end_time, after),
+            sort=[("timestamp", pymongo.ASCENDING), ("_id", pymongo.ASCENDING)], limit=max_results,
+            decode=lambda cursor: InterpolationColumns.from_documents(cursor, capacity=max_results)
+        )
+
+    @staticmethod
+    def _interpolation_range_query(start_time: datetime, end_time: datetime,
+                                   after: Optional[CursorKey] = None) -> Dict[str, Any]:
+        """Build the filter for interpolation points in a time range, resuming after a keyset position."""
+        query = {
             "timestamp": {
                 "$gte": start_time,
                 "$lte": end_time
             }
-        }).limit(max_results))
+        }
+        if after is not None:
+            query = {"$and": [query, keyset_filter("timestamp", after)]}
+        return query
     
     def find_interpolation_near_point(self, longitude: float, latitude: float, 
                                       timestamp: Optional[datetime] = None,
@@ -376,8 +1461,78 @@ class MongoDBManager:
         if timestamp:
             query["timestamp"] = timestamp
             
-        return list(self._interpolation_collection.find(query).limit(max_results))
+        return self._find("find_interpolation_near_point", self._interpolation_collection, query, limit=max_results)
     
+    def find_latest_interpolation_timestamp(self, start_time: datetime,
+                                            end_time: datetime) -> Optional[datetime]:
+        """
+        Find the latest interpolation timestamp within a time range.
+
+        Args:
+            start_time: Start datetime for the range
+            end_time: End datetime for the range
+
+        Returns:
+            Optional[datetime]: The latest timestamp, or None if the range has no grids
+        """
+        document = self._find_one(
+            "find_latest_interpolation_timestamp", self._interpolation_collection,
+            {"timestamp": {"$gte": start_time, "$lte": end_time}},
+            projection={"_id": 0, "timestamp": 1},
+            sort=[("timestamp", pymongo.DESCENDING)]
+        )
+        return document["timestamp"] if document else None
+
+    def find_interpolation_series(self, cell_id: int, start_time: datetime,
+                                  end_time: datetime) -> List[Dict[str, Any]]:
+        """
+        Get one grid cell's values at every timestamp in a range.
+
+        Served by the ``(cell_id, timestamp)`` index: one seek, then one key
+        per timestamp, so the cost grows with the number of timestamps only.
+
+        Args:
+            cell_id: Cell ID from :func:`app.utils.idw.cell_ids`
+            start_time: Start datetime for the range
+            end_time: End datetime for the range
+
+        Returns:
+            List[Dict]: Timestamp and variable values, ordered by timestamp
+        """
+        return self._find(
+            "find_interpolation_series", self._interpolation_collection,
+            {"cell_id": cell_id, "timestamp": {"$gte": start_time, "$lte": end_time}},
+            projection={"_id": 0, "timestamp": 1, "temperature": 1, "wind_speed": 1, "dew_point": 1, "humidity": 1},
+            sort=[("cell_id", pymongo.ASCENDING), ("timestamp", pymongo.ASCENDING)]
+        )
+
+    def backfill_interpolation_cell_ids(self, batch_size: int = 10000) -> int:
+        """
+        Add ``cell_id`` to interpolation documents stored without one.
+
+        Args:
+            batch_size: Documents updated per bulk write
+
+        Returns:
+            int: Number of documents updated
+        """
+        updated = 0
+        while True:
+            documents = self._find(
+                "backfill_interpolation_cell_ids", self._interpolation_collection,
+                {"cell_id": {"$exists": False}}, {"location": 1}, limit=batch_size
+            )
+            if not documents:
+                return updated
+            coordinates = [document["location"]["coordinates"] for document in documents]
+            ids = cell_ids([c[0] for c in coordinates], [c[1] for c in coordinates]).tolist()
+            result = self._interpolation_collection.bulk_write(
+                [UpdateOne({"_id": document["_id"]}, {"$set": {"cell_id": cell_id}})
+                 for document, cell_id in zip(documents, ids)],
+                ordered=False
+            )
+            updated += result.modified_count
+
     def count_interpolation_points(self) -> int:
         """
         Count the total number of interpolation data points in the database.
@@ -385,8 +1540,24 @@ class MongoDBManager:
         Returns:
             int: Number of interpolation data points
         """
-        return self._interpolation_collection.count_documents({})
+        return self._count("count_interpolation_points", self._interpolation_collection, {})
     
+    def latest_interpolation_version(self) -> int:
+        """
+        Get the highest data version among the interpolation points.
+
+        Served by the version index, so it is cheap enough to check on every
+        request, and it moves whenever grids are inserted or reloaded.
+
+        Returns:
+            int: The version, 0 if no point carries one
+        """
+        document = self._find_one(
+            "latest_interpolation_version", self._interpolation_collection, {},
+            {"_id": 0, "version": 1}, sort=[("version", pymongo.DESCENDING)]
+        )
+        return document.get("version", 0) if document else 0
+
     def get_available_interpolation_timestamps(self) -> List[datetime]:
         """
         Get all available timestamps for interpolation data.
@@ -394,7 +1565,7 @@ class MongoDBManager:
         Returns:
             List[datetime]: List of unique timestamps in the interpolation collection
         """
-        return self._interpolation_collection.distinct("timestamp")
+        return self._distinct("get_available_interpolation_timestamps", self._interpolation_collection, "timestamp")
 
 
 # Export the singleton instance
@@ -0,0 +1,209 @@
+"""
+Slow-query log for MongoDB reads.
+
+``MongoDBManager`` times every read it issues and reports it here. Queries
+slower than ``SLOW_QUERY_THRESHOLD_MS`` are logged with their parameters,
+and the same command is re-run with ``explain`` (``executionStats``
+verbosity) on a background thread, so the request that hit the slow query is
+not delayed further. The plan summary records documents examined versus
+returned, the indexes used and whether the collection was scanned.
+"""
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from pymongo.collection import Collection
+
+from app.config import settings
+
+
+def _find_key(document: Any, key: str) -> Optional[Any]:
+    """Depth-first search for the first value stored under a key."""
+    if isinstance(document, dict):
+        if key in document:
+            return document[key]
+        children = document.values()
+    elif isinstance(document, list):
+        children = document
+    else:
+        return None
+    for child in children:
+        found = _find_key(child, key)
+        if found is not None:
+            return found
+    return None
+
+
+def _collect(document: Any, key: str, values: set) -> set:
+    """Collect every value stored under a key anywhere in a document."""
+    if isinstance(document, dict):
+        for name, value in document.items():
+            if name == key and isinstance(value, str):
+                values.add(value)
+            else:
+                _collect(value, key, values)
+    elif isinstance(document, list):
+        for value in document:
+            _collect(value, key, values)
+    return values
+
+
+def summarize_explain(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce an ``executionStats`` explain result to the figures that matter.
+
+    Works for both find and aggregate explains, including pipelines whose
+    first stage is a ``$cursor``.
+
+    Args:
+        explain: Raw explain command result
+
+    Returns:
+        Dict[str, Any]: Documents and keys examined, documents returned,
+        execution time, indexes used and whether a collection scan happened
+    """
+    stats = _find_key(explain, "executionStats") or {}
+    winning_plan = _find_key(explain, "winningPlan") or {}
+    stages = _collect(winning_plan, "stage", set())
+    return {
+        "docs_examined": stats.get("totalDocsExamined"),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "returned": stats.get("nReturned"),
+        "execution_ms": stats.get("executionTimeMillis"),
+        "indexes": sorted(_collect(winning_plan, "indexName", set())),
+        "collection_scan": "COLLSCAN" in stages
+    }
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert query parameters (ObjectIds, datetimes) to JSON-safe values."""
+    return json.loads(json.dumps(value, default=str))
+
+
+class SlowQueryLog:
+    """Bounded log of slow queries with asynchronously captured explain plans."""
+
+    def __init__(self, threshold_ms: float, max_entries: int, explain: bool, explain_interval: float):
+        """
+        Initialize the log.
+
+        Args:
+            threshold_ms: Queries slower than this are logged
+            max_entries: Number of recent slow queries kept
+            explain: Whether to capture explain plans for slow queries
+            explain_interval: Minimum time in seconds between explains of the same query
+        """
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self._lock = threading.Lock()
+        self._recent: deque = deque(maxlen=max_entries)
+        self._by_query: Dict[str, Dict[str, Any]] = {}
+        self._last_explained: Dict[str, float] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-explain")
+
+    def observe(self, label: str, collection: Collection, elapsed: float,
+                command: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Report a completed query.
+
+        Args:
+            label: Name of the query, usually the MongoDBManager method
+            collection: Collection the query ran against
+            elapsed: Query duration in seconds
+            command: Builds the equivalent database command, only called for slow queries
+        """
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+
+        spec = command()
+        entry = {
+            "query": label,
+            "collection": collection.name,
+            "duration_ms": round(elapsed_ms, 1),
+            "at": datetime.now(timezone.utc).isoformat(),
+            "command": _jsonable(spec),
+            "explain": None
+        }
+        print(f"Slow query {label} on {collection.name}: {elapsed_ms:.0f} ms")
+
+        with self._lock:
+            self._recent.append(entry)
+            stats = self._by_query.setdefault(label, {
+                "query": label, "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                "last_command": None, "last_collection": None, "explain": None
+            })
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["last_command"] = entry["command"]
+            stats["last_collection"] = collection.name
+
+            now = time.monotonic()
+            last_explained = self._last_explained.get(label)
+            explain = self.explain and (last_explained is None or now - last_explained >= self.explain_interval)
+            if explain:
+                self._last_explained[label] = now
+
+        if explain:
+            self._executor.submit(self._explain, label, collection, spec, entry)
+
+    def _explain(self, label: str, collection: Collection, spec: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        try:
+            result = collection.database.command("explain", spec, verbosity="executionStats")
+            summary = summarize_explain(result)
+        except Exception as e:
+            summary = {"error": str(e)}
+        with self._lock:
+            entry["explain"] = summary
+            self._by_query[label]["explain"] = summary
+
+    def top(self, limit: int = 10, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+        """
+        Get the worst offending queries.
+
+        Args:
+            limit: Number of queries to return
+            order_by: ``total_ms``, ``max_ms`` or ``count``
+
+        Returns:
+            List[Dict[str, Any]]: Per-query totals with the latest parameters and explain summary
+        """
+        with self._lock:
+            rows = [
+                {
+                    **stats,
+                    "total_ms": round(stats["total_ms"], 1),
+                    "max_ms": round(stats["max_ms"], 1),
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 1)
+                }
+                for stats in self._by_query.values()
+            ]
+        return sorted(rows, key=lambda row: row[order_by], reverse=True)[:limit]
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Get the most recent slow queries, newest first.
+
+        Args:
+            limit: Number of entries to return
+
+        Returns:
+            List[Dict[str, Any]]: Slow query entries
+        """
+        with self._lock:
+            return [dict(entry) for entry in list(self._recent)[::-1][:limit]]
+
+
+# Shared slow-query log for this worker process
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    max_entries=settings.SLOW_QUERY_LOG_SIZE,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+    explain_interval=settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS
+)
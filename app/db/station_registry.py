@@ -0,0 +1,202 @@
+"""
+In-memory registry of weather station metadata with a spatial index.
+
+The station set is small and changes rarely, so station ID lookups and
+nearby-station searches are served from memory instead of MongoDB. Metadata is
+held in parallel arrays (IDs, names and an ``(n, 2)`` coordinate array) and
+indexed with a haversine ball tree when scikit-learn is installed, falling back
+to a vectorized brute-force haversine scan otherwise.
+"""
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.db.mongodb import mongodb_manager
+
+try:
+    from sklearn.neighbors import BallTree
+except ImportError:  # optional dependency
+    BallTree = None
+
+
+# Earth radius used by MongoDB 2dsphere distance calculations, in meters
+EARTH_RADIUS_M = 6378100.0
+
+
+def haversine_distances(lon: float, lat: float, coords: np.ndarray) -> np.ndarray:
+    """
+    Compute great-circle distances from one point to many.
+
+    Args:
+        lon: Longitude of the query point in degrees
+        lat: Latitude of the query point in degrees
+        coords: ``(n, 2)`` array of [longitude, latitude] in degrees
+
+    Returns:
+        np.ndarray: Distances in meters
+    """
+    lon1, lat1 = np.radians(lon), np.radians(lat)
+    lon2, lat2 = np.radians(coords[:, 0]), np.radians(coords[:, 1])
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class _RegistryState(NamedTuple):
+    """Immutable snapshot of the registry contents, swapped in atomically on refresh."""
+    ids: List[str]
+    names: List[str]
+    coords: np.ndarray
+    positions: Dict[str, int]
+    tree: Any
+
+    def station(self, position: int) -> Dict[str, Any]:
+        lon, lat = self.coords[position]
+        return {
+            "station_id": self.ids[position],
+            "station_name": self.names[position],
+            "location": {"type": "Point", "coordinates": [float(lon), float(lat)]}
+        }
+
+
+class StationRegistry:
+    """Array-backed, spatially indexed cache of station metadata."""
+
+    def __init__(self, ttl_seconds: int):
+        """
+        Initialize an empty registry.
+
+        Args:
+            ttl_seconds: Age after which the registry reloads itself on next use
+        """
+        self.ttl_seconds = ttl_seconds
+        self._refresh_lock = threading.Lock()
+        self._state = _RegistryState([], [], np.empty((0, 2), dtype=np.float64), {}, None)
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._state.ids)
+
+    def refresh(self) -> int:
+        """
+        Reload station metadata from MongoDB and rebuild the spatial index.
+
+        Returns:
+            int: Number of stations in the registry
+        """
+        ids, names, coords = [], [], []
+        positions = {}
+        for station in mongodb_manager.iter_station_metadata():
+            station_id = station["station_id"]
+            if station_id in positions:
+                continue
+            positions[station_id] = len(ids)
+            ids.append(station_id)
+            names.append(station["station_name"])
+            coords.append(station["location"]["coordinates"][:2])
+
+        coord_array = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        tree = None
+        if BallTree is not None and len(ids) > 0:
+            # BallTree's haversine metric expects [latitude, longitude] in radians
+            tree = BallTree(np.radians(coord_array[:, ::-1]), metric="haversine")
+
+        self._state = _RegistryState(ids, names, coord_array, positions, tree)
+        self.loaded_at = time.monotonic()
+        return len(ids)
+
+    def _current(self) -> _RegistryState:
+        """Return the current snapshot, reloading it first if it is stale."""
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl_seconds:
+            # Only one caller reloads; the others keep using the previous snapshot
+            if self._refresh_lock.acquire(blocking=self.loaded_at is None):
+                try:
+                    if self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl_seconds:
+                        self.refresh()
+                finally:
+                    self._refresh_lock.release()
+        return self._state
+
+    def get(self, station_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up station metadata by ID.
+
+        Args:
+            station_id: The ID of the station
+
+        Returns:
+            Optional[Dict]: Station metadata, or None if unknown
+        """
+        state = self._current()
+        position = state.positions.get(station_id)
+        return state.station(position) if position is not None else None
+
+    def within(self, longitude: float, latitude: float,
+               max_distance: float) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find stations within a distance of a point, nearest first.
+
+        Args:
+            longitude: Longitude coordinate
+            latitude: Latitude coordinate
+            max_distance: Maximum distance in meters
+
+        Returns:
+            List[Tuple[Dict, float]]: (station metadata, distance in meters) pairs
+        """
+        state = self._current()
+        if not state.ids:
+            return []
+
+        if state.tree is not None:
+            query = np.radians([[latitude, longitude]])
+            positions, distances = state.tree.query_radius(
+                query, r=max_distance / EARTH_RADIUS_M, return_distance=True, sort_results=True
+            )
+            positions, distances = positions[0], distances[0] * EARTH_RADIUS_M
+        else:
+            all_distances = haversine_distances(longitude, latitude, state.coords)
+            positions = np.flatnonzero(all_distances <= max_distance)
+            positions = positions[np.argsort(all_distances[positions], kind="stable")]
+            distances = all_distances[positions]
+
+        return [(state.station(p), float(d)) for p, d in zip(positions, distances)]
+
+    def nearest(self, longitude: float, latitude: float, k: int,
+                max_distance: Optional[float] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find the k stations nearest to a point.
+
+        Args:
+            longitude: Longitude coordinate
+            latitude: Latitude coordinate
+            k: Number of stations to return
+            max_distance: Optional maximum distance in meters
+
+        Returns:
+            List[Tuple[Dict, float]]: (station metadata, distance in meters) pairs, nearest first
+        """
+        state = self._current()
+        if not state.ids:
+            return []
+
+        k = min(k, len(state.ids))
+        if state.tree is not None:
+            distances, positions = state.tree.query(np.radians([[latitude, longitude]]), k=k)
+            positions, distances = positions[0], distances[0] * EARTH_RADIUS_M
+        else:
+            all_distances = haversine_distances(longitude, latitude, state.coords)
+            positions = np.argpartition(all_distances, k - 1)[:k]
+            positions = positions[np.argsort(all_distances[positions], kind="stable")]
+            distances = all_distances[positions]
+
+        return [
+            (state.station(p), float(d)) for p, d in zip(positions, distances)
+            if max_distance is None or d <= max_distance
+        ]
+
+
+# Shared registry instance
+station_registry = StationRegistry(settings.STATION_REGISTRY_TTL_SECONDS)
@@ -0,0 +1,127 @@
+"""
+In-memory catalog of the available interpolation timestamps.
+
+The list of grid timestamps is read on every status request and every
+regional aggregate, but it only changes when grids are loaded or generated.
+It is held as a sorted ``datetime64`` array, so range lookups are a binary
+search instead of a ``distinct`` over the collection. Each use checks the
+highest data version of the interpolation points, an indexed ``find_one``,
+and reloads the array as soon as grids have been inserted or reloaded. The
+array is also reloaded every ``TIMESTAMP_CATALOG_TTL_SECONDS``, which bounds
+how long deleted grids stay listed.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.db.mongodb import mongodb_manager
+from app.utils.timestamps import naive_utc
+
+
+def _as_datetime64(value: datetime) -> np.datetime64:
+    """Convert a datetime to naive UTC ``datetime64``, as timestamps are stored."""
+    return np.datetime64(naive_utc(value), "us")
+
+
+class TimestampCatalog:
+    """Sorted, periodically refreshed array of interpolation timestamps."""
+
+    def __init__(self, ttl_seconds: int):
+        """
+        Initialize an empty catalog.
+
+        Args:
+            ttl_seconds: Age after which the catalog reloads itself on next use
+        """
+        self.ttl_seconds = ttl_seconds
+        self._refresh_lock = threading.Lock()
+        self._timestamps = np.empty(0, dtype="datetime64[us]")
+        self.loaded_at: Optional[float] = None
+        self.version: Optional[int] = None
+
+    def __len__(self) -> int:
+        return int(self._timestamps.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the catalog array."""
+        return int(self._timestamps.nbytes)
+
+    def refresh(self) -> int:
+        """
+        Reload the timestamps from MongoDB.
+
+        Returns:
+            int: Number of timestamps in the catalog
+        """
+        # Read the version first, so a write during the reload triggers another one
+        version = mongodb_manager.latest_interpolation_version()
+        timestamps = mongodb_manager.get_available_interpolation_timestamps()
+        self._timestamps = np.unique(np.asarray(timestamps, dtype="datetime64[us]"))
+        self.version = version
+        self.loaded_at = time.monotonic()
+        return len(self)
+
+    def _current(self) -> np.ndarray:
+        """Return the current array, reloading it first if grids were written or it is stale."""
+        version = mongodb_manager.latest_interpolation_version()
+        changed = self.loaded_at is None or version != self.version
+        if changed or time.monotonic() - self.loaded_at > self.ttl_seconds:
+            # New grids must be seen at once, so callers wait for that reload;
+            # for a periodic one, only one caller reloads and the others keep the previous array
+            if self._refresh_lock.acquire(blocking=changed):
+                try:
+                    # Skip the reload if another caller did it while this one waited
+                    if self.loaded_at is None or self.version != version or \
+                            time.monotonic() - self.loaded_at > self.ttl_seconds:
+                        self.refresh()
+                finally:
+                    self._refresh_lock.release()
+        return self._timestamps
+
+    def all(self) -> List[datetime]:
+        """
+        Get every available timestamp.
+
+        Returns:
+            List[datetime]: Timestamps in order
+        """
+        return self._current().astype(datetime).tolist()
+
+    def in_range(self, start_time: datetime, end_time: datetime) -> List[datetime]:
+        """
+        Get the available timestamps within a time range.
+
+        Args:
+            start_time: Start of the range (inclusive)
+            end_time: End of the range (inclusive)
+
+        Returns:
+            List[datetime]: Timestamps in order
+        """
+        timestamps = self._current()
+        first = np.searchsorted(timestamps, _as_datetime64(start_time), side="left")
+        last = np.searchsorted(timestamps, _as_datetime64(end_time), side="right")
+        return timestamps[first:last].astype(datetime).tolist()
+
+    def latest(self, count: int) -> List[datetime]:
+        """
+        Get the most recent timestamps.
+
+        Args:
+            count: Number of timestamps
+
+        Returns:
+            List[datetime]: Up to ``count`` timestamps, newest first
+        """
+        if count <= 0:
+            return []
+        return self._current()[::-1][:count].astype(datetime).tolist()
+
+
+# Shared catalog instance
+timestamp_catalog = TimestampCatalog(settings.TIMESTAMP_CATALOG_TTL_SECONDS)
@@ -0,0 +1,170 @@
+"""
+Write-behind buffer for live station readings.
+
+Readings posted to the API are accepted into an in-process buffer that
+coalesces them per station and is flushed to MongoDB by a background thread,
+either when enough readings have accumulated or when the flush interval
+elapses. Each flush is a handful of ``bulk_write`` calls (one per monthly
+partition touched), however many stations and readings it carries. When the
+buffer is full, new submissions are rejected so callers can back off.
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from app.config import settings
+from app.db.mongodb import mongodb_manager
+
+
+class ReadingWriteBehindBuffer:
+    """Coalescing, bounded buffer of station readings flushed in bulk."""
+
+    def __init__(self, max_readings: int, flush_readings: int, flush_interval: float):
+        """
+        Initialize the buffer.
+
+        Args:
+            max_readings: Maximum number of readings held before submissions are rejected
+            flush_readings: Number of buffered readings that triggers an immediate flush
+            flush_interval: Maximum time in seconds a reading waits before being flushed
+        """
+        self.max_readings = max_readings
+        self.flush_readings = flush_readings
+        self.flush_interval = flush_interval
+
+        self._condition = threading.Condition()
+        self._pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._pending_count = 0
+        self._running = False
+        self._thread = None
+
+        self.accepted = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.last_flush_seconds = 0.0
+
+    def start(self) -> None:
+        """Start the background flush thread."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="reading-write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread after flushing everything still buffered."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def submit(self, station_id: str, entries: List[Dict[str, Any]]) -> bool:
+        """
+        Buffer readings for a station.
+
+        Args:
+            station_id: The ID of the station the readings belong to
+            entries: Weather entries to add
+
+        Returns:
+            bool: True if the readings were accepted, False if the buffer is full
+        """
+        with self._condition:
+            if self._pending_count + len(entries) > self.max_readings:
+                self.rejected += len(entries)
+                return False
+            self._pending[station_id].extend(entries)
+            self._pending_count += len(entries)
+            self.accepted += len(entries)
+            if self._pending_count >= self.flush_readings:
+                self._condition.notify()
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._running and self._pending_count < self.flush_readings:
+                    self._condition.wait(self.flush_interval)
+                if not self._running:
+                    return
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all buffered readings to MongoDB.
+
+        On failure the readings are put back into the buffer to be retried by
+        the next flush. The retry is safe even if part of the batch was
+        written, because ``bulk_add_entries`` skips readings that are already
+        stored. Readings that no longer fit within ``max_readings`` are
+        dropped and counted in ``dropped``.
+
+        Returns:
+            int: Number of readings written
+        """
+        with self._condition:
+            if not self._pending_count:
+                return 0
+            batch, count = self._pending, self._pending_count
+            self._pending, self._pending_count = defaultdict(list), 0
+
+        start = time.perf_counter()
+        try:
+            mongodb_manager.bulk_add_entries(batch)
+        except Exception as e:
+            with self._condition:
+                # Readings accepted since the batch was taken keep their place
+                room = max(self.max_readings - self._pending_count, 0)
+                requeued = 0
+                for station_id, entries in batch.items():
+                    kept = entries[:room - requeued]
+                    if kept:
+                        self._pending[station_id][:0] = kept
+                        requeued += len(kept)
+                self._pending_count += requeued
+                self.dropped += count - requeued
+                self.failed_flushes += 1
+            print(f"Error flushing {count} buffered readings ({count - requeued} dropped): {e}")
+            return 0
+
+        with self._condition:
+            self.flushed += count
+            self.flushes += 1
+            self.last_flush_seconds = time.perf_counter() - start
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get buffer counters.
+
+        Returns:
+            Dict[str, Any]: Queue depth and accepted/rejected/dropped/flushed totals
+        """
+        with self._condition:
+            return {
+                "queued": self._pending_count,
+                "capacity": self.max_readings,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "dropped": self.dropped,
+                "flushed": self.flushed,
+                "flushes": self.flushes,
+                "failed_flushes": self.failed_flushes,
+                "last_flush_seconds": self.last_flush_seconds
+            }
+
+
+# Shared buffer for readings posted to the API
+reading_buffer = ReadingWriteBehindBuffer(
+    max_readings=settings.INGEST_QUEUE_MAX_READINGS,
+    flush_readings=settings.INGEST_FLUSH_READINGS,
+    flush_interval=settings.INGEST_FLUSH_INTERVAL_SECONDS
+)
@@ -2,11 +2,20 @@
 Data models for the Weather API.
 """
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional
 
 from pydantic import BaseModel, Field
 
 
+# Public reading names accepted by ``fields=`` -> stored entry keys
+READING_FIELDS = {
+    "temperature": "Temp - °C",
+    "humidity": "Hum - %",
+    "dew_point": "Dew Point - °C",
+    "avg_wind_speed": "Avg Wind Speed - km/h",
+}
+
+
 class GeoLocation(BaseModel):
     """Model for geographic location."""
     
@@ -15,13 +24,17 @@ class GeoLocation(BaseModel):
 
 
 class WeatherEntry(BaseModel):
-    """Model for a single weather data entry."""
+    """Model for a single weather data entry.
+
+    Reading values are optional because station endpoints can project a
+    subset of them with ``fields=``; unselected values are omitted.
+    """
     
     timestamp: datetime = Field(..., description="Date and time of the measurement")
-    temperature: float = Field(..., description="Temperature in °C", alias="Temp - °C")
-    humidity: float = Field(..., description="Relative humidity in %", alias="Hum - %")
-    dew_point: float = Field(..., description="Dew point in °C", alias="Dew Point - °C")
-    avg_wind_speed: float = Field(..., description="Average wind speed in km/h", alias="Avg Wind Speed - km/h")
+    temperature: Optional[float] = Field(None, description="Temperature in °C", alias="Temp - °C")
+    humidity: Optional[float] = Field(None, description="Relative humidity in %", alias="Hum - %")
+    dew_point: Optional[float] = Field(None, description="Dew point in °C", alias="Dew Point - °C")
+    avg_wind_speed: Optional[float] = Field(None, description="Average wind speed in km/h", alias="Avg Wind Speed - km/h")
     
     class Config:
         allow_population_by_field_name = True
@@ -66,6 +79,15 @@ class WeatherStation(BaseModel):
         }
 
 
+class NearbyStation(BaseModel):
+    """Model for station metadata with its distance from a query point."""
+    
+    station_id: str
+    station_name: str
+    location: GeoLocation
+    distance: float = Field(..., description="Distance from the query point in meters")
+
+
 class WeatherEntryResponse(BaseModel):
     """Model for weather entry responses with station information."""
     
@@ -82,23 +104,91 @@ class WeatherEntryResponse(BaseModel):
         allow_population_by_field_name = True
 
 
+class StationMetadata(BaseModel):
+    """Model for station metadata without readings."""
+    
+    station_id: str
+    station_name: str
+    location: GeoLocation
+
+
+class SyncResponse(BaseModel):
+    """Model for the changes written between two data versions."""
+    
+    since: int = Field(..., description="Version the client already held")
+    version: int = Field(..., description="Version to send as 'since' on the next sync")
+    stations: List[StationMetadata] = Field(default_factory=list, description="Stations added or updated")
+    readings: List[WeatherEntryResponse] = Field(default_factory=list, description="Readings added")
+    interpolation_timestamps: List[datetime] = Field(
+        default_factory=list, description="Grid timestamps with new or replaced points"
+    )
+
+
+class StationSeriesResponse(BaseModel):
+    """Model for a station's readings resampled onto a fixed cadence, one dense array per variable."""
+    
+    station_id: str
+    start: datetime = Field(..., description="Start of the first slot")
+    step_minutes: int = Field(..., description="Slot length; slot i starts at start + i * step")
+    count: int = Field(..., description="Number of slots")
+    samples: List[int] = Field(..., description="Readings averaged into each slot; 0 marks a gap")
+    temperature: Optional[List[Optional[float]]] = None
+    humidity: Optional[List[Optional[float]]] = None
+    dew_point: Optional[List[Optional[float]]] = None
+    avg_wind_speed: Optional[List[Optional[float]]] = None
+
+
 # Request models for API endpoints
+class ReadingsSubmission(BaseModel):
+    """Model for live readings posted by a station."""
+    
+    readings: List[WeatherEntry] = Field(..., min_length=1, description="Readings to add to the station")
+
+
+class NearestStationsQuery(BaseModel):
+    """Model for k-nearest station queries."""
+    
+    longitude: float = Field(..., description="Longitude coordinate", ge=-180, le=180)
+    latitude: float = Field(..., description="Latitude coordinate", ge=-90, le=90)
+    k: int = Field(5, ge=1, le=100, description="Number of stations to return")
+    max_distance: Optional[int] = Field(None, description="Optional maximum distance in meters")
+
+
+
 class LocationQuery(BaseModel):
     """Model for location-based queries."""
     
     longitude: float = Field(..., description="Longitude coordinate", ge=-180, le=180)
     latitude: float = Field(..., description="Latitude coordinate", ge=-90, le=90)
     max_distance: Optional[int] = Field(10000, description="Maximum distance in meters")
+    include_entries: bool = Field(False, description="Include each station's readings")
+    fields: Optional[List[str]] = Field(
+        None,
+        description="Reading variables to include (temperature, humidity, dew_point, avg_wind_speed); implies include_entries"
+    )
 
 
 class TimeQuery(BaseModel):
     """Model for time-based queries."""
     
     timestamp: datetime = Field(..., description="Timestamp to search for")
+    snap: Literal["exact", "nearest"] = Field(
+        "exact",
+        description="'exact' matches the timestamp exactly, 'nearest' returns each station's closest reading"
+    )
+    tolerance: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Search window in seconds either side of the timestamp (implies snap=nearest)"
+    )
+    cursor: Optional[str] = Field(None, description="Continuation token returned by the previous page")
+    limit: int = Field(100, ge=1, le=1000, description="Maximum number of entries per page")
 
 
 class TimeRangeQuery(BaseModel):
     """Model for time range queries."""
     
     start_time: datetime = Field(..., description="Start of the time range")
-    end_time: datetime = Field(..., description="End of the time range")
\ No newline at end of file
+    end_time: datetime = Field(..., description="End of the time range")
+    cursor: Optional[str] = Field(None, description="Continuation token returned by the previous page")
+    limit: int = Field(1000, ge=1, le=10000, description="Maximum number of entries per page")
\ No newline at end of file
@@ -0,0 +1,242 @@
+"""
+Admission control and load shedding per route class.
+
+Every request is assigned to a pool by its path: ``heavy`` for unbounded
+time-range scans, exports, aggregations and contours, ``light`` for cheap
+metadata lookups, and ``standard`` for the rest. Light routes are listed by
+exact path, so a station's readings never ride on the light pool's capacity. Each pool admits a fixed number of
+concurrent requests. Excess requests wait in a bounded FIFO queue. A request
+that finds the queue full, or that waits longer than the queue timeout, is
+answered at once with ``503`` and ``Retry-After`` instead of piling onto
+MongoDB. Cheap endpoints keep their own capacity, so a burst of heavy
+queries cannot starve them, and tail latency stays bounded under overload.
+
+Limits are enforced per worker process, on the event loop, without locks.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionPool:
+    """Concurrency limit with a bounded, time-limited FIFO wait queue."""
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float):
+        """
+        Initialize the pool.
+
+        Args:
+            name: Pool name, for metrics
+            limit: Requests executing at once
+            queue_size: Requests allowed to wait for a slot
+            queue_timeout: Longest wait for a slot, in seconds
+        """
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._counters = {
+            "admitted": 0, "queued": 0, "shed_queue_full": 0, "shed_timeout": 0,
+            "max_queue_depth": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0
+        }
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting in the queue if the pool is full.
+
+        Raises:
+            Overloaded: If the queue is full or the wait times out
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self._counters["admitted"] += 1
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            self._counters["shed_queue_full"] += 1
+            raise Overloaded("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._counters["queued"] += 1
+        self._counters["max_queue_depth"] = max(self._counters["max_queue_depth"], len(self._waiters))
+        started = time.perf_counter()
+        try:
+            await asyncio.wait([waiter], timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        waited_ms = (time.perf_counter() - started) * 1000
+        self._counters["wait_ms_total"] += waited_ms
+        self._counters["wait_ms_max"] = max(self._counters["wait_ms_max"], waited_ms)
+
+        if not waiter.done():
+            self._abandon(waiter)
+            self._counters["shed_timeout"] += 1
+            raise Overloaded("timeout")
+        self._counters["admitted"] += 1
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        """Leave the queue; a slot handed over in the meantime is passed on."""
+        if waiter.done() and not waiter.cancelled():
+            self.release()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self) -> None:
+        """Give a slot back, handing it straight to the oldest waiter if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the pool's configuration, current load and counters.
+
+        Returns:
+            Dict[str, Any]: Limits, ``in_flight``, ``queue_depth`` and cumulative counters
+        """
+        counters = dict(self._counters)
+        counters["wait_ms_total"] = round(counters["wait_ms_total"], 1)
+        counters["wait_ms_max"] = round(counters["wait_ms_max"], 1)
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "queue_timeout_ms": self.queue_timeout * 1000,
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            **counters
+        }
+
+
+class AdmissionController:
+    """Routes requests to admission pools by exact path or path prefix."""
+
+    DEFAULT_POOL = "standard"
+
+    def __init__(self, pools: Dict[str, int], routes: Dict[str, List[str]], exempt: List[str],
+                 queue_size: int, queue_timeout: float):
+        """
+        Initialize the controller.
+
+        Args:
+            pools: Concurrency limit per pool name
+            routes: Paths per pool name; ``/*`` entries are prefixes, others exact paths
+            exempt: Path prefixes that bypass admission control
+            queue_size: Wait queue size of every pool
+            queue_timeout: Longest wait for a slot, in seconds
+        """
+        limits = {self.DEFAULT_POOL: 16, **pools}
+        self.pools = {
+            name: AdmissionPool(name, limit, queue_size, queue_timeout) for name, limit in limits.items()
+        }
+        self._exact: Dict[str, str] = {}
+        prefixes = [(prefix.rstrip("/"), None) for prefix in exempt]
+        for name, paths in routes.items():
+            for path in paths:
+                if path.endswith("/*"):
+                    prefixes.append((path[:-2].rstrip("/"), name))
+                else:
+                    self._exact[path.rstrip("/")] = name
+        # Longest prefix first, so the most specific route wins
+        self._prefixes = sorted(prefixes, key=lambda item: len(item[0]), reverse=True)
+
+    def pool_for(self, path: str) -> Optional[AdmissionPool]:
+        """
+        Select the pool for a request path.
+
+        Args:
+            path: Request path
+
+        Returns:
+            Optional[AdmissionPool]: The pool, or None if the path is exempt
+        """
+        name = self._exact.get(path.rstrip("/"))
+        if name is not None:
+            return self.pools.get(name, self.pools[self.DEFAULT_POOL])
+        for prefix, name in self._prefixes:
+            if path == prefix or path.startswith(prefix + "/"):
+                if name is None:
+                    return None
+                return self.pools.get(name, self.pools[self.DEFAULT_POOL])
+        return self.pools[self.DEFAULT_POOL]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get every pool's load and counters.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Stats per pool name
+        """
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+
+class AdmissionMiddleware:
+    """ASGI middleware admitting or shedding requests per route pool."""
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None,
+                 retry_after: Optional[int] = None):
+        self.app = app
+        self.controller = controller or admission_controller
+        self.retry_after = retry_after or settings.ADMISSION_RETRY_AFTER_SECONDS
+
+    async def __call__(self, scope, receive, send):
+        pool = self.controller.pool_for(scope["path"]) if scope["type"] == "http" else None
+        if pool is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await pool.acquire()
+        except Overloaded as e:
+            await self._shed(send, pool.name, e.reason)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            pool.release()
+
+    async def _shed(self, send, pool: str, reason: str) -> None:
+        body = json.dumps({"detail": f"Server is busy ({pool} pool {reason.replace('_', ' ')}); retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+# Shared admission controller for this worker process
+admission_controller = AdmissionController(
+    pools=settings.ADMISSION_POOLS,
+    routes=settings.ADMISSION_ROUTES,
+    exempt=settings.ADMISSION_EXEMPT_ROUTES,
+    queue_size=settings.ADMISSION_QUEUE_SIZE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000
+)
@@ -0,0 +1,283 @@
+"""
+Compact column-oriented containers for large query results.
+
+A station reading or grid point held as a Python dict with long string keys,
+then copied into a formatted dict and a Pydantic model, costs several hundred
+bytes per value. These containers decode query results straight into
+parallel NumPy arrays (one float64 per value) and serialize them to the same
+JSON the response models produce, one chunk at a time, so large time-range
+queries never materialize per-row dicts or models.
+"""
+import json
+import math
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+
+# Rows serialized per yielded chunk
+_CHUNK_ROWS = 5000
+
+_DATETIME = TypeAdapter(datetime)
+
+
+def _json_datetime(value: datetime) -> str:
+    """Serialize a datetime exactly as the response models do."""
+    return _DATETIME.dump_json(value).decode("utf-8")
+
+
+def _json_numbers(values: np.ndarray) -> List[str]:
+    """Serialize floats as JSON numbers, with NaN as null."""
+    strings = [repr(value) for value in values.tolist()]
+    if not np.isfinite(values).all():
+        for index in np.flatnonzero(~np.isfinite(values)).tolist():
+            strings[index] = "null"
+    return strings
+
+
+class InterpolationColumns:
+    """Interpolation points of a time-range query, grouped by timestamp."""
+
+    __slots__ = ("timestamps", "offsets", "longitude", "latitude",
+                 "temperature", "wind_speed", "dew_point", "humidity", "last_key")
+
+    VALUE_FIELDS = ("temperature", "wind_speed", "dew_point", "humidity")
+
+    def __init__(self, timestamps: List[datetime], offsets: np.ndarray, columns: Dict[str, np.ndarray],
+                 last_key: Optional[Tuple[datetime, ObjectId]]):
+        """
+        Initialize the container.
+
+        Args:
+            timestamps: Distinct timestamps, in order
+            offsets: Start row of each timestamp's points, plus the total row count
+            columns: ``longitude``, ``latitude`` and the value fields as float64 arrays
+            last_key: (timestamp, _id) of the last row, for keyset pagination
+        """
+        self.timestamps = timestamps
+        self.offsets = offsets
+        self.longitude = columns["longitude"]
+        self.latitude = columns["latitude"]
+        self.temperature = columns["temperature"]
+        self.wind_speed = columns["wind_speed"]
+        self.dew_point = columns["dew_point"]
+        self.humidity = columns["humidity"]
+        self.last_key = last_key
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Dict[str, Any]], capacity: int = 0) -> "InterpolationColumns":
+        """
+        Decode interpolation documents sorted by timestamp, one at a time.
+
+        Args:
+            documents: Documents or a live cursor, ordered by ``(timestamp, _id)``
+            capacity: Expected number of rows (e.g. the query limit), to preallocate
+
+        Returns:
+            InterpolationColumns: The decoded points
+        """
+        size = max(capacity, 1024)
+        columns = {name: np.empty(size) for name in ("longitude", "latitude") + cls.VALUE_FIELDS}
+        timestamps: List[datetime] = []
+        starts: List[int] = []
+        count = 0
+        document = None
+        for document in documents:
+            if count == size:
+                size *= 2
+                for name, column in columns.items():
+                    columns[name] = np.resize(column, size)
+            timestamp = document["timestamp"]
+            if not timestamps or timestamp != timestamps[-1]:
+                timestamps.append(timestamp)
+                starts.append(count)
+            coordinates = document["location"]["coordinates"]
+            columns["longitude"][count] = coordinates[0]
+            columns["latitude"][count] = coordinates[1]
+            for name in cls.VALUE_FIELDS:
+                value = document.get(name)
+                columns[name][count] = math.nan if value is None else value
+            count += 1
+
+        last_key = (document["timestamp"], document["_id"]) if document is not None else None
+        starts.append(count)
+        return cls(
+            timestamps,
+            np.asarray(starts, dtype=np.int64),
+            {name: column[:count].copy() for name, column in columns.items()},
+            last_key
+        )
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def iter_json(self, start_time: datetime, end_time: datetime,
+                  next_cursor: Optional[str]) -> Iterator[bytes]:
+        """
+        Serialize as an ``InterpolationTimeRangeResponse`` in chunks.
+
+        Args:
+            start_time: Start of the queried range
+            end_time: End of the queried range
+            next_cursor: Continuation token for the next page, if any
+
+        Yields:
+            bytes: Consecutive pieces of the JSON document
+        """
+        yield (
+            f'{{"start_time":{_json_datetime(start_time)},"end_time":{_json_datetime(end_time)},'
+            f'"timestamp_count":{len(self.timestamps)},"total_points":{len(self)},"data":['
+        ).encode("utf-8")
+
+        for group, timestamp in enumerate(self.timestamps):
+            first, last = int(self.offsets[group]), int(self.offsets[group + 1])
+            timestamp_json = _json_datetime(timestamp)
+            yield (
+                f'{"," if group else ""}{{"timestamp":{timestamp_json},"point_count":{last - first},"points":['
+            ).encode("utf-8")
+            for chunk_start in range(first, last, _CHUNK_ROWS):
+                chunk = slice(chunk_start, min(chunk_start + _CHUNK_ROWS, last))
+                rows = zip(
+                    _json_numbers(self.longitude[chunk]), _json_numbers(self.latitude[chunk]),
+                    _json_numbers(self.temperature[chunk]), _json_numbers(self.wind_speed[chunk]),
+                    _json_numbers(self.dew_point[chunk]), _json_numbers(self.humidity[chunk])
+                )
+                body = ",".join(
+                    f'{{"longitude":{lon},"latitude":{lat},"temperature":{temp},"wind_speed":{wind},'
+                    f'"dew_point":{dew},"humidity":{hum},"timestamp":{timestamp_json}}}'
+                    for lon, lat, temp, wind, dew, hum in rows
+                )
+                yield (("," if chunk_start > first else "") + body).encode("utf-8")
+            yield b'],"next_cursor":null}'
+
+        yield f'],"next_cursor":{json.dumps(next_cursor)}}}'.encode("utf-8")
+
+
+class ReadingColumns:
+    """Station readings of a weather query with station metadata stored once per station."""
+
+    __slots__ = ("stations", "station_index", "timestamps", "temperature", "humidity",
+                 "dew_point", "avg_wind_speed", "last_key")
+
+    # Attribute -> stored entry key (and response alias)
+    VALUE_KEYS = {
+        "temperature": "Temp - °C",
+        "humidity": "Hum - %",
+        "dew_point": "Dew Point - °C",
+        "avg_wind_speed": "Avg Wind Speed - km/h",
+    }
+
+    def __init__(self, stations: List[Dict[str, Any]], station_index: np.ndarray, timestamps: np.ndarray,
+                 values: Dict[str, np.ndarray], last_key: Optional[Tuple[datetime, ObjectId]]):
+        """
+        Initialize the container.
+
+        Args:
+            stations: Distinct station metadata (station_id, station_name, location)
+            station_index: Row -> index into ``stations``
+            timestamps: Reading timestamps as datetime64[us]
+            values: Reading values per attribute in ``VALUE_KEYS``
+            last_key: (entry timestamp, _id) of the last row, for keyset pagination
+        """
+        self.stations = stations
+        self.station_index = station_index
+        self.timestamps = timestamps
+        self.temperature = values["temperature"]
+        self.humidity = values["humidity"]
+        self.dew_point = values["dew_point"]
+        self.avg_wind_speed = values["avg_wind_speed"]
+        self.last_key = last_key
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]], capacity: int = 0) -> "ReadingColumns":
+        """
+        Decode unwound reading rows (``station_id``, ``station_name``, ``location``, ``entry``).
+
+        Args:
+            rows: Rows in response order
+            capacity: Expected number of rows, to preallocate
+
+        Returns:
+            ReadingColumns: The decoded readings
+        """
+        size = max(capacity, 1024)
+        station_index = np.empty(size, dtype=np.int32)
+        timestamps = np.empty(size, dtype="datetime64[us]")
+        values = {name: np.empty(size) for name in cls.VALUE_KEYS}
+        stations: List[Dict[str, Any]] = []
+        positions: Dict[str, int] = {}
+        count = 0
+        row = None
+        for row in rows:
+            if count == size:
+                size *= 2
+                station_index = np.resize(station_index, size)
+                timestamps = np.resize(timestamps, size)
+                for name, column in values.items():
+                    values[name] = np.resize(column, size)
+            position = positions.get(row["station_id"])
+            if position is None:
+                position = positions[row["station_id"]] = len(stations)
+                stations.append({
+                    "station_id": row["station_id"],
+                    "station_name": row["station_name"],
+                    "location": row["location"]
+                })
+            entry = row["entry"]
+            station_index[count] = position
+            timestamps[count] = entry["timestamp"]
+            for name, key in cls.VALUE_KEYS.items():
+                value = entry.get(key)
+                values[name][count] = math.nan if value is None else value
+            count += 1
+
+        last_key = (row["entry"]["timestamp"], row["_id"]) if row is not None else None
+        return cls(
+            stations,
+            station_index[:count].copy(),
+            timestamps[:count].copy(),
+            {name: column[:count].copy() for name, column in values.items()},
+            last_key
+        )
+
+    def __len__(self) -> int:
+        return int(self.station_index.shape[0])
+
+    def iter_json(self) -> Iterator[bytes]:
+        """
+        Serialize as a list of ``WeatherEntryResponse`` (by alias) in chunks.
+
+        Yields:
+            bytes: Consecutive pieces of the JSON array
+        """
+        prefixes = [
+            '{"station_id":%s,"station_name":%s,"location":{"type":%s,"coordinates":[%s]},' % (
+                json.dumps(station["station_id"], ensure_ascii=False),
+                json.dumps(station["station_name"], ensure_ascii=False),
+                json.dumps(station["location"].get("type", "Point")),
+                ",".join(repr(float(value)) for value in station["location"]["coordinates"])
+            )
+            for station in self.stations
+        ]
+        unique_times, time_index = np.unique(self.timestamps, return_inverse=True)
+        time_json = [_json_datetime(value) for value in unique_times.astype(datetime).tolist()]
+        aliases = [json.dumps(key, ensure_ascii=False) for key in self.VALUE_KEYS.values()]
+
+        yield b"["
+        for chunk_start in range(0, len(self), _CHUNK_ROWS):
+            chunk = slice(chunk_start, min(chunk_start + _CHUNK_ROWS, len(self)))
+            rows = zip(
+                self.station_index[chunk].tolist(), time_index[chunk].tolist(),
+                _json_numbers(self.temperature[chunk]), _json_numbers(self.humidity[chunk]),
+                _json_numbers(self.dew_point[chunk]), _json_numbers(self.avg_wind_speed[chunk])
+            )
+            body = ",".join(
+                f'{prefixes[station]}"timestamp":{time_json[moment]},{aliases[0]}:{temp},{aliases[1]}:{hum},'
+                f'{aliases[2]}:{dew},{aliases[3]}:{wind}}}'
+                for station, moment, temp, hum, dew, wind in rows
+            )
+            yield (("," if chunk_start else "") + body).encode("utf-8")
+        yield b"]"
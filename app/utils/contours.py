@@ -0,0 +1,178 @@
+"""
+Vectorized marching squares over interpolation grids.
+
+Grids are stored as flat lists of cells. They are rasterized onto their
+distinct longitudes and latitudes, with NaN where a cell is missing. Every
+cell square is then classified against a level with array operations, and
+the crossing points on its edges are linearly interpolated in bulk. Only
+joining the resulting segments into polylines is a Python loop, and it is
+linear in the number of segments, not in the size of the grid.
+"""
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Corners of a square, as (row, column) offsets from its lower-left corner:
+# lower-left, lower-right, upper-right, upper-left
+_CORNERS = np.array([[0, 0], [0, 1], [1, 1], [1, 0]])
+
+# Edges of a square as pairs of corners: bottom, right, top, left
+_EDGE_CORNERS = np.array([[0, 1], [1, 2], [3, 2], [0, 3]])
+
+# Segments per case as pairs of edges (-1 for none). The case bits are the
+# corners at or above the level (1 lower-left, 2 lower-right, 4 upper-right,
+# 8 upper-left). The two saddles (5 and 10) use cases 16 and 17 when the
+# square's centre is below the level.
+_SEGMENTS = np.full((18, 2, 2), -1)
+for _case, _pairs in {
+    1: [(3, 0)], 2: [(0, 1)], 3: [(3, 1)], 4: [(1, 2)], 5: [(3, 2), (0, 1)], 6: [(0, 2)], 7: [(3, 2)],
+    8: [(3, 2)], 9: [(0, 2)], 10: [(3, 0), (1, 2)], 11: [(1, 2)], 12: [(3, 1)], 13: [(0, 1)], 14: [(3, 0)],
+    16: [(3, 0), (1, 2)], 17: [(0, 1), (3, 2)],
+}.items():
+    _SEGMENTS[_case, :len(_pairs)] = _pairs
+
+
+def rasterize(lon: np.ndarray, lat: np.ndarray, values: np.ndarray,
+              decimals: int = 5) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Arrange flat grid cells on a regular raster.
+
+    Args:
+        lon: Cell longitudes
+        lat: Cell latitudes
+        values: Cell values
+        decimals: Coordinates are rounded to this many decimals before
+            matching, so that floating point noise does not split a column
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Sorted distinct longitudes,
+        sorted distinct latitudes and the ``(len(lats), len(lons))`` value
+        raster, NaN where no cell exists
+    """
+    xs, columns = np.unique(np.round(lon, decimals), return_inverse=True)
+    ys, rows = np.unique(np.round(lat, decimals), return_inverse=True)
+    raster = np.full((ys.shape[0], xs.shape[0]), np.nan)
+    raster[rows, columns] = values
+    return xs, ys, raster
+
+
+def isolines(xs: np.ndarray, ys: np.ndarray, raster: np.ndarray, level: float) -> List[List[List[float]]]:
+    """
+    Trace the isolines of one level.
+
+    Squares with a missing corner are skipped, so lines end at gaps in the grid.
+
+    Args:
+        xs: Raster longitudes
+        ys: Raster latitudes
+        raster: Values, one row per latitude
+        level: Contour level
+
+    Returns:
+        List[List[List[float]]]: Polylines of [longitude, latitude] points;
+        closed rings repeat their first point
+    """
+    if raster.shape[0] < 2 or raster.shape[1] < 2:
+        return []
+
+    corners = np.stack([raster[:-1, :-1], raster[:-1, 1:], raster[1:, 1:], raster[1:, :-1]])
+    above = corners >= level
+    cases = above[0] * 1 + above[1] * 2 + above[2] * 4 + above[3] * 8
+    cases[np.isnan(corners).any(axis=0)] = 0
+
+    saddle = (cases == 5) | (cases == 10)
+    centre_below = corners.mean(axis=0) < level
+    cases[saddle & centre_below] += np.where(cases[saddle & centre_below] == 5, 11, 7)
+
+    rows, columns = np.nonzero((cases != 0) & (cases != 15))
+    if rows.size == 0:
+        return []
+    pairs = _SEGMENTS[cases[rows, columns]]
+
+    # One row per segment: its square and its two edges
+    present = pairs[:, :, 0] >= 0
+    seg_rows = np.repeat(rows[:, None], 2, axis=1)[present]
+    seg_columns = np.repeat(columns[:, None], 2, axis=1)[present]
+    seg_edges = pairs[present]
+
+    width = raster.shape[1]
+    ends = []
+    for side in (0, 1):
+        edge = seg_edges[:, side]
+        a = _CORNERS[_EDGE_CORNERS[edge, 0]]
+        b = _CORNERS[_EDGE_CORNERS[edge, 1]]
+        a_row, a_column = seg_rows + a[:, 0], seg_columns + a[:, 1]
+        b_row, b_column = seg_rows + b[:, 0], seg_columns + b[:, 1]
+        a_value, b_value = raster[a_row, a_column], raster[b_row, b_column]
+        t = (level - a_value) / (b_value - a_value)
+        x = xs[a_column] + t * (xs[b_column] - xs[a_column])
+        y = ys[a_row] + t * (ys[b_row] - ys[a_row])
+        # Squares sharing an edge share its ID: horizontal edges even, vertical odd
+        edge_ids = (a_row * width + a_column) * 2 + (a_row != b_row)
+        ends.append((edge_ids, x, y))
+
+    return _join_segments(ends)
+
+
+def _join_segments(ends: List[Tuple[np.ndarray, np.ndarray, np.ndarray]]) -> List[List[List[float]]]:
+    """Chain segments that share an edge into polylines."""
+    (start_ids, start_x, start_y), (end_ids, end_x, end_y) = ends
+    start_ids, end_ids = start_ids.tolist(), end_ids.tolist()
+    points = dict(zip(start_ids, zip(start_x.tolist(), start_y.tolist())))
+    points.update(zip(end_ids, zip(end_x.tolist(), end_y.tolist())))
+
+    touching = defaultdict(list)
+    for segment, (start, end) in enumerate(zip(start_ids, end_ids)):
+        touching[start].append(segment)
+        touching[end].append(segment)
+
+    used = [False] * len(start_ids)
+    lines = []
+    for first in range(len(start_ids)):
+        if used[first]:
+            continue
+        used[first] = True
+        chain = deque([start_ids[first], end_ids[first]])
+        for forward in (True, False):
+            tip = chain[-1] if forward else chain[0]
+            while True:
+                segment = next((s for s in touching[tip] if not used[s]), None)
+                if segment is None:
+                    break
+                used[segment] = True
+                tip = end_ids[segment] if start_ids[segment] == tip else start_ids[segment]
+                if forward:
+                    chain.append(tip)
+                else:
+                    chain.appendleft(tip)
+        lines.append([[round(x, 6), round(y, 6)] for x, y in (points[edge] for edge in chain)])
+    return lines
+
+
+def contour_collection(lon: np.ndarray, lat: np.ndarray, values: np.ndarray,
+                       levels: Sequence[float]) -> Dict[str, Any]:
+    """
+    Build GeoJSON isolines of a grid variable.
+
+    Args:
+        lon: Cell longitudes
+        lat: Cell latitudes
+        values: Cell values of the variable
+        levels: Contour levels
+
+    Returns:
+        Dict[str, Any]: GeoJSON ``FeatureCollection`` with one ``MultiLineString``
+        feature per level that has any isolines
+    """
+    xs, ys, raster = rasterize(lon, lat, values)
+    features = []
+    for level in levels:
+        lines = isolines(xs, ys, raster, level)
+        if lines:
+            features.append({
+                "type": "Feature",
+                "geometry": {"type": "MultiLineString", "coordinates": lines},
+                "properties": {"level": level, "line_count": len(lines)}
+            })
+    return {"type": "FeatureCollection", "features": features}
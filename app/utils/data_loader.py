@@ -12,20 +12,30 @@ from dateutil import parser
 
 from app.config import settings
 from app.db.mongodb import mongodb_manager
+from app.utils.resampling import resample_entries, validate_step
 
 
 class WeatherDataLoader:
     """Loader for weather data files."""
     
-    def __init__(self, data_directory: str):
+    def __init__(self, data_directory: str, start_date: Optional[datetime] = None,
+                 end_date: Optional[datetime] = None, resample_minutes: Optional[int] = None):
         """
         Initialize the data loader.
         
         Args:
             data_directory: Path to the directory containing weather data files
+            start_date: Earliest reading to load (defaults to settings.INGEST_START_DATE)
+            end_date: Latest reading to load (defaults to settings.INGEST_END_DATE)
+            resample_minutes: Also store each station resampled onto this step (must divide a day)
         """
+        if resample_minutes is not None:
+            validate_step(resample_minutes)
         self.data_directory = Path(data_directory)
         self.db_manager = mongodb_manager
+        self.start_date = start_date if start_date is not None else settings.INGEST_START_DATE
+        self.end_date = end_date if end_date is not None else settings.INGEST_END_DATE
+        self.resample_minutes = resample_minutes
     
     def _parse_datetime(self, datetime_str: str) -> Optional[datetime]:
         """
@@ -42,20 +52,23 @@ class WeatherDataLoader:
         except (ValueError, TypeError):
             return None
     
-    def _is_may_2024(self, dt: Optional[datetime]) -> bool:
+    def _in_date_range(self, dt: Optional[datetime]) -> bool:
         """
-        Check if a datetime is in May 2024.
+        Check if a datetime falls within the loader's date range.
         
         Args:
             dt: Datetime object to check
             
         Returns:
-            bool: True if the datetime is in May 2024, False otherwise
+            bool: True if the datetime is within the range, False otherwise
         """
         if dt is None:
             return False
-        
-        return dt.year == settings.TARGET_YEAR and dt.month == settings.TARGET_MONTH
+        if self.start_date is not None and dt < self.start_date:
+            return False
+        if self.end_date is not None and dt > self.end_date:
+            return False
+        return True
     
     def _extract_station_metadata(self, file_path: Path) -> Dict[str, Any]:
         """
@@ -105,7 +118,7 @@ class WeatherDataLoader:
             file_path: Path to the weather data file
             
         Returns:
-            Dict[str, Any]: Dictionary containing station data with May 2024 entries
+            Dict[str, Any]: Dictionary containing station data with entries in the date range
         """
         print(f"Processing file: {file_path}")
         
@@ -129,16 +142,16 @@ class WeatherDataLoader:
             # Parse the datetime column
             df['timestamp'] = df['Date & Time'].apply(self._parse_datetime)
             
-            # Filter for May 2024 data
-            may_2024_data = df[df['timestamp'].apply(self._is_may_2024)]
+            # Filter for the requested date range
+            range_data = df[df['timestamp'].apply(self._in_date_range)]
             
-            if may_2024_data.empty:
-                print(f"No May 2024 data found in {file_path}")
+            if range_data.empty:
+                print(f"No data in the requested date range found in {file_path}")
                 return station_data
             
             # Convert the filtered data to a list of dictionaries
             entries = []
-            for _, row in may_2024_data.iterrows():
+            for _, row in range_data.iterrows():
                 entry = {
                     "timestamp": row['timestamp'],
                     "Temp - °C": float(row['Temp - °C']) if 'Temp - °C' in row else 0.0,
@@ -185,6 +198,8 @@ class WeatherDataLoader:
             if station_data_list:
                 result_ids = self.db_manager.insert_many_weather_stations(station_data_list)
                 print(f"Successfully loaded {len(result_ids)} weather stations into MongoDB")
+                if self.resample_minutes is not None:
+                    self.store_resampled_series(station_data_list)
                 return result_ids
             else:
                 print("No valid station data found to insert")
@@ -194,16 +209,42 @@ class WeatherDataLoader:
             print(f"Error loading weather data: {e}")
             return []
 
+    def store_resampled_series(self, station_data_list: List[Dict[str, Any]]) -> int:
+        """
+        Resample each station's readings onto the loader's step and store the series.
+
+        Args:
+            station_data_list: Processed stations with their entries
 
-def load_data_from_directory(directory_path: str) -> List[str]:
+        Returns:
+            int: Number of monthly series documents written
+        """
+        written = 0
+        for station_data in station_data_list:
+            series = resample_entries(station_data["entries"], self.resample_minutes)
+            written += self.db_manager.upsert_station_series(station_data, series)
+        print(f"Stored {written} monthly series resampled to {self.resample_minutes} minutes")
+        return written
+
+
+def load_data_from_directory(directory_path: str, start_date: Optional[datetime] = None,
+                             end_date: Optional[datetime] = None,
+                             resample_minutes: Optional[int] = None) -> List[str]:
     """
     Load weather data from a directory into MongoDB.
+
+    Readings are written into monthly partition collections, so any span of
+    history can be loaded.
     
     Args:
         directory_path: Path to the directory containing weather data files
+        start_date: Earliest reading to load (unbounded if None)
+        end_date: Latest reading to load (unbounded if None)
+        resample_minutes: Also store each station resampled onto this step in minutes
         
     Returns:
         List[str]: List of inserted station document IDs
     """
-    loader = WeatherDataLoader(directory_path)
+    loader = WeatherDataLoader(directory_path, start_date=start_date, end_date=end_date,
+                               resample_minutes=resample_minutes)
     return loader.load_all_files()
\ No newline at end of file
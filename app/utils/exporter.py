@@ -0,0 +1,181 @@
+"""
+Streaming export of station readings to CSV or Parquet.
+
+Rows are pulled from a server-side cursor in batches and encoded one chunk at
+a time: a block of CSV lines, or one Parquet row group, per batch. Memory use
+therefore stays constant however large the exported range is, and the API can
+hand the chunks straight to the client.
+"""
+import csv
+import io
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from app.config import settings
+from app.db.mongodb import mongodb_manager
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional dependency
+    pyarrow = None
+
+
+# Exported column -> key in the rows produced by iter_entries_for_export
+EXPORT_COLUMNS = {
+    "station_id": "station_id",
+    "station_name": "station_name",
+    "longitude": "longitude",
+    "latitude": "latitude",
+    "timestamp": "timestamp",
+    "temperature": "Temp - °C",
+    "humidity": "Hum - %",
+    "dew_point": "Dew Point - °C",
+    "avg_wind_speed": "Avg Wind Speed - km/h",
+}
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def available_formats() -> List[str]:
+    """
+    List the export formats supported by the installed libraries.
+
+    Returns:
+        List[str]: ``csv``, plus ``parquet`` when pyarrow is installed
+    """
+    return ["csv", "parquet"] if pyarrow is not None else ["csv"]
+
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[bytes]:
+    """
+    Encode rows as CSV, one block of lines per batch.
+
+    Args:
+        rows: Exported rows
+        batch_size: Rows per yielded chunk
+
+    Yields:
+        bytes: CSV chunks, starting with the header line
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in _batches(rows, batch_size):
+        for row in batch:
+            values = [row.get(key) for key in EXPORT_COLUMNS.values()]
+            writer.writerow([
+                value.isoformat() if column == "timestamp" and value is not None else value
+                for column, value in zip(EXPORT_COLUMNS, values)
+            ])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting the bytes a writer produces until they are drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_parquet(rows: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[bytes]:
+    """
+    Encode rows as Parquet, one row group per batch.
+
+    Args:
+        rows: Exported rows
+        batch_size: Rows per row group
+
+    Yields:
+        bytes: Consecutive pieces of the Parquet file
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    if pyarrow is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+
+    schema = pyarrow.schema([
+        ("station_id", pyarrow.string()),
+        ("station_name", pyarrow.string()),
+        ("longitude", pyarrow.float64()),
+        ("latitude", pyarrow.float64()),
+        ("timestamp", pyarrow.timestamp("ms")),
+        ("temperature", pyarrow.float64()),
+        ("humidity", pyarrow.float64()),
+        ("dew_point", pyarrow.float64()),
+        ("avg_wind_speed", pyarrow.float64()),
+    ])
+    sink = _ChunkSink()
+    with pyarrow.parquet.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for batch in _batches(rows, batch_size):
+            columns = {column: [row.get(key) for row in batch] for column, key in EXPORT_COLUMNS.items()}
+            writer.write_table(pyarrow.Table.from_pydict(columns, schema=schema), row_group_size=len(batch))
+            data = sink.drain()
+            if data:
+                yield data
+    yield sink.drain()
+
+
+def export_readings(start_time: datetime, end_time: datetime, export_format: str = "csv",
+                    station_ids: Optional[List[str]] = None,
+                    batch_size: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Stream station readings in a time range as CSV or Parquet.
+
+    Args:
+        start_time: Start of the range
+        end_time: End of the range
+        export_format: ``csv`` or ``parquet``
+        station_ids: Only export these stations (all if None)
+        batch_size: Rows per cursor batch and output chunk (defaults to settings.EXPORT_BATCH_SIZE)
+
+    Returns:
+        Iterator[bytes]: Encoded chunks of the export
+
+    Raises:
+        ValueError: If the format is not available
+    """
+    if export_format not in available_formats():
+        raise ValueError(f"Unsupported export format '{export_format}'; available: {', '.join(available_formats())}")
+
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    rows = mongodb_manager.iter_entries_for_export(start_time, end_time, station_ids, batch_size)
+    encode = iter_parquet if export_format == "parquet" else iter_csv
+    return encode(rows, batch_size)
@@ -0,0 +1,174 @@
+"""
+Memory-mapped on-disk cache of interpolation grids shared across workers.
+
+Each timestamp's grid is written once as a fixed-layout float64 ``.npy`` file
+with one row per cell (see ``GRID_COLUMNS``), next to a ``.ids.npy`` file with
+the cells' document IDs in sorted order for keyset paging. Workers open the
+files with ``mmap``, so every worker process reads the same pages from the OS
+page cache rather than decoding its own copy from MongoDB. Values are kept
+as float64 so responses match the stored documents exactly. The directory is
+bounded by size and evicts the least recently used grids first.
+"""
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.utils.timestamps import naive_utc
+
+
+# Column layout of a cached grid
+GRID_COLUMNS = ("longitude", "latitude", "temperature", "wind_speed", "dew_point", "humidity")
+
+# Open memory maps kept per process, keyed by path
+_MAX_OPEN_MAPS = 64
+
+
+class GridCache:
+    """Size-bounded directory of memory-mapped grids keyed by timestamp."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Initialize the grid cache.
+
+        Args:
+            directory: Directory holding the cached grid files
+            max_bytes: Total size above which the least recently used grids are evicted
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._maps: "OrderedDict[str, Tuple[Tuple[int, int], np.ndarray]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _paths(self, timestamp: datetime) -> Tuple[Path, Path]:
+        # The same instant maps to the same files whatever its timezone
+        stem = f"{naive_utc(timestamp):%Y%m%dT%H%M%S}"
+        return self.directory / f"{stem}.npy", self.directory / f"{stem}.ids.npy"
+
+    def _open(self, path: Path) -> np.ndarray:
+        """Memory-map a cached file, reusing this process's existing map if the file is unchanged."""
+        stat = path.stat()
+        identity = (stat.st_ino, stat.st_mtime_ns)
+        key = str(path)
+        with self._lock:
+            cached = self._maps.get(key)
+            if cached is not None and cached[0] == identity:
+                self._maps.move_to_end(key)
+                return cached[1]
+
+        array = np.load(path, mmap_mode="r")
+        with self._lock:
+            self._maps[key] = (identity, array)
+            self._maps.move_to_end(key)
+            while len(self._maps) > _MAX_OPEN_MAPS:
+                self._maps.popitem(last=False)
+        return array
+
+    def get(self, timestamp: datetime) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Open a cached grid.
+
+        Args:
+            timestamp: Grid timestamp, naive UTC or timezone-aware
+
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray]]: (values of shape (n, 6), sorted hex document IDs), or None on a miss
+        """
+        values_path, ids_path = self._paths(timestamp)
+        try:
+            values = self._open(values_path)
+            ids = self._open(ids_path)
+            # Record the access for LRU eviction
+            os.utime(ids_path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return values, ids
+
+    def put(self, timestamp: datetime, values: np.ndarray, ids: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Store a grid and return its memory-mapped view.
+
+        Args:
+            timestamp: Grid timestamp, naive UTC or timezone-aware
+            values: Cell values of shape (n, 6) in ``GRID_COLUMNS`` order, sorted by document ID
+            ids: Hex document IDs of the cells, in ascending order
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Memory-mapped (values, ids)
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        values_path, ids_path = self._paths(timestamp)
+        self._write_atomic(values_path, np.ascontiguousarray(values, dtype=np.float64))
+        # The IDs file is written last: its presence marks a complete entry
+        self._write_atomic(ids_path, np.asarray(ids, dtype="S24"))
+        self.evict()
+        return self.get(timestamp) or (values, np.asarray(ids, dtype="S24"))
+
+    def _write_atomic(self, path: Path, array: np.ndarray) -> None:
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as tmp_file:
+            np.save(tmp_file, array)
+        os.replace(tmp_path, path)
+
+    def size_bytes(self) -> int:
+        """
+        Get the total size of the cached grids.
+
+        Returns:
+            int: Size in bytes
+        """
+        try:
+            return sum(entry.stat().st_size for entry in self.directory.glob("*.npy"))
+        except OSError:
+            return 0
+
+    def evict(self) -> int:
+        """
+        Delete the least recently used grids until the cache fits in max_bytes.
+
+        Returns:
+            int: Number of grids evicted
+        """
+        grids = []
+        total = 0
+        for ids_path in self.directory.glob("*.ids.npy"):
+            values_path = ids_path.with_name(ids_path.name.replace(".ids.npy", ".npy"))
+            try:
+                size = ids_path.stat().st_size + values_path.stat().st_size
+                grids.append((ids_path.stat().st_mtime, ids_path, values_path, size))
+            except OSError:
+                continue
+            total += size
+
+        evicted = 0
+        for _, ids_path, values_path, size in sorted(grids, key=lambda grid: grid[0]):
+            if total <= self.max_bytes:
+                break
+            for path in (ids_path, values_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        """Remove every cached grid."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        with self._lock:
+            self._maps.clear()
+
+
+# Shared cache of interpolation grids
+grid_cache = GridCache(settings.GRID_CACHE_DIR, settings.GRID_CACHE_MAX_BYTES)
@@ -0,0 +1,157 @@
+"""
+Vectorized inverse distance weighting (IDW) over regular lon/lat grids.
+
+This module only depends on NumPy so that it can be imported cheaply by the
+worker processes of the grid generation pipeline.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+EARTH_RADIUS_M = 6378100.0
+
+# Cells per chunk when computing the (cells x stations) distance matrix
+_CHUNK_CELLS = 20000
+
+# Worker-process state set once by init_worker()
+_worker_state = {}
+
+
+def make_grid(bbox: Tuple[float, float, float, float], resolution: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the cell centres of a regular grid covering a bounding box.
+
+    Args:
+        bbox: (min_lon, min_lat, max_lon, max_lat) in degrees
+        resolution: Cell size in degrees
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Flattened longitudes and latitudes, row-major by latitude
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    lons = np.arange(min_lon, max_lon + resolution / 2, resolution)
+    lats = np.arange(min_lat, max_lat + resolution / 2, resolution)
+    grid_lon, grid_lat = np.meshgrid(lons, lats)
+    return grid_lon.ravel(), grid_lat.ravel()
+
+
+def cell_ids(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """
+    Encode cell centres as stable integer cell IDs.
+
+    Coordinates are quantized to 1e-5 degrees (about a metre), so the same
+    cell gets the same ID in every grid that shares its geometry, whether the
+    grid was generated or loaded from CSV.
+
+    Args:
+        lon: Cell longitudes
+        lat: Cell latitudes
+
+    Returns:
+        np.ndarray: int64 cell IDs
+    """
+    lon_q = np.rint((np.asarray(lon, dtype=np.float64) + 180.0) * 1e5).astype(np.int64)
+    lat_q = np.rint((np.asarray(lat, dtype=np.float64) + 90.0) * 1e5).astype(np.int64)
+    return (lon_q << 25) | lat_q
+
+
+def pairwise_haversine(lon1: np.ndarray, lat1: np.ndarray,
+                       lon2: np.ndarray, lat2: np.ndarray) -> np.ndarray:
+    """
+    Compute great-circle distances between two sets of points.
+
+    Args:
+        lon1: Longitudes of the first set, shape (n,)
+        lat1: Latitudes of the first set, shape (n,)
+        lon2: Longitudes of the second set, shape (m,)
+        lat2: Latitudes of the second set, shape (m,)
+
+    Returns:
+        np.ndarray: Distance matrix in meters, shape (n, m)
+    """
+    lon1, lat1 = np.radians(lon1)[:, None], np.radians(lat1)[:, None]
+    lon2, lat2 = np.radians(lon2)[None, :], np.radians(lat2)[None, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def idw_grid(grid_lon: np.ndarray, grid_lat: np.ndarray,
+             station_lon: np.ndarray, station_lat: np.ndarray,
+             values: np.ndarray, power: float = 2.0) -> np.ndarray:
+    """
+    Interpolate station values onto grid cells with inverse distance weighting.
+
+    Missing station values (NaN) are ignored per variable. A cell that
+    coincides with a station takes that station's value.
+
+    Args:
+        grid_lon: Cell longitudes, shape (n,)
+        grid_lat: Cell latitudes, shape (n,)
+        station_lon: Station longitudes, shape (s,)
+        station_lat: Station latitudes, shape (s,)
+        values: Station values, shape (s, v)
+        power: IDW power parameter
+
+    Returns:
+        np.ndarray: Interpolated values, shape (n, v); NaN where no station has data
+    """
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    result = np.empty((grid_lon.shape[0], values.shape[1]), dtype=np.float64)
+
+    for start in range(0, grid_lon.shape[0], _CHUNK_CELLS):
+        stop = start + _CHUNK_CELLS
+        distances = pairwise_haversine(grid_lon[start:stop], grid_lat[start:stop], station_lon, station_lat)
+        exact = distances < 1e-6
+        weights = 1.0 / np.maximum(distances, 1e-6) ** power
+        # A coincident station dominates every other weight
+        weights = np.where(exact.any(axis=1, keepdims=True), exact.astype(np.float64), weights)
+
+        numerator = weights @ filled
+        denominator = weights @ valid.astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[start:stop] = np.where(denominator > 0, numerator / denominator, np.nan)
+
+    return result
+
+
+def init_worker(grid_lon: np.ndarray, grid_lat: np.ndarray,
+                station_lon: np.ndarray, station_lat: np.ndarray, power: float) -> None:
+    """
+    Store the shared grid and station geometry in a worker process.
+
+    Args:
+        grid_lon: Cell longitudes
+        grid_lat: Cell latitudes
+        station_lon: Station longitudes
+        station_lat: Station latitudes
+        power: IDW power parameter
+    """
+    _worker_state.update(
+        grid_lon=grid_lon, grid_lat=grid_lat,
+        station_lon=station_lon, station_lat=station_lat,
+        power=power
+    )
+
+
+def compute_grid(task: Tuple[int, np.ndarray]) -> Tuple[int, Optional[np.ndarray]]:
+    """
+    Worker entry point: interpolate one timestamp's station values.
+
+    Args:
+        task: (timestamp index, station values of shape (s, v))
+
+    Returns:
+        Tuple[int, Optional[np.ndarray]]: Timestamp index and the (n, v) grid, or None if no station had data
+    """
+    index, values = task
+    if np.isnan(values).all():
+        return index, None
+    state = _worker_state
+    grid = idw_grid(
+        state["grid_lon"], state["grid_lat"],
+        state["station_lon"], state["station_lat"],
+        values, state["power"]
+    )
+    return index, grid.astype(np.float32)
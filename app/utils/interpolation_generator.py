@@ -0,0 +1,241 @@
+"""
+Batch generation of interpolated grids from station readings.
+
+Replaces the externally produced interpolation CSVs: station readings for a
+time range are read once, each station's reading closest to every grid
+timestamp is selected with vectorized searches, and the grids are computed
+with vectorized IDW across a process pool. Finished grids are written
+straight to the interpolation collection.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.db.mongodb import mongodb_manager
+from app.utils import idw
+from app.utils.grid_cache import grid_cache
+from app.utils.payload_cache import grid_payload_cache
+
+
+# Stored station reading key -> interpolation document field
+VARIABLES = {
+    "Temp - °C": "temperature",
+    "Avg Wind Speed - km/h": "wind_speed",
+    "Dew Point - °C": "dew_point",
+    "Hum - %": "humidity",
+}
+
+
+def _grid_timestamps(start_time: datetime, end_time: datetime, step: timedelta) -> List[datetime]:
+    """List the grid timestamps from start to end (inclusive) at a fixed step."""
+    timestamps = []
+    current = start_time
+    while current <= end_time:
+        timestamps.append(current)
+        current += step
+    return timestamps
+
+
+def _read_station_series(start_time: datetime, end_time: datetime
+                         ) -> Tuple[List[str], np.ndarray, np.ndarray, Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+    """
+    Read every station reading in a time range, page by page.
+
+    Args:
+        start_time: Start of the range
+        end_time: End of the range
+
+    Returns:
+        Tuple: (station IDs, station longitudes, station latitudes,
+        per-station (epoch seconds, values of shape (r, v)) sorted by time)
+    """
+    rows: Dict[str, Tuple[List[float], List[List[float]]]] = {}
+    coordinates: Dict[str, List[float]] = {}
+    after = None
+    page_size = 10000
+    while True:
+        page = mongodb_manager.find_entries_by_time_range(start_time, end_time, max_results=page_size, after=after)
+        for row in page:
+            station_id = row["station_id"]
+            times, values = rows.setdefault(station_id, ([], []))
+            entry = row["entry"]
+            times.append(entry["timestamp"].timestamp())
+            values.append([entry.get(key, np.nan) for key in VARIABLES])
+            coordinates.setdefault(station_id, row["location"]["coordinates"][:2])
+        if len(page) < page_size:
+            break
+        after = (page[-1]["entry"]["timestamp"], page[-1]["_id"])
+
+    station_ids = sorted(rows)
+    series = {}
+    for station_id in station_ids:
+        times = np.asarray(rows[station_id][0], dtype=np.float64)
+        values = np.asarray(rows[station_id][1], dtype=np.float64)
+        order = np.argsort(times, kind="stable")
+        series[station_id] = (times[order], values[order])
+
+    lon = np.asarray([coordinates[s][0] for s in station_ids], dtype=np.float64)
+    lat = np.asarray([coordinates[s][1] for s in station_ids], dtype=np.float64)
+    return station_ids, lon, lat, series
+
+
+def _snap_station_values(station_ids: List[str], series: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                         targets: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Select each station's reading closest to every target time.
+
+    Args:
+        station_ids: Station IDs, in output order
+        series: Per-station (epoch seconds, values) sorted by time
+        targets: Target epoch seconds, shape (t,)
+        tolerance: Maximum distance in seconds between a target and a reading
+
+    Returns:
+        np.ndarray: Values of shape (t, s, v), NaN where no reading is within tolerance
+    """
+    snapped = np.full((targets.shape[0], len(station_ids), len(VARIABLES)), np.nan)
+    for column, station_id in enumerate(station_ids):
+        times, values = series[station_id]
+        if times.size == 0:
+            continue
+        right = np.clip(np.searchsorted(times, targets), 0, times.size - 1)
+        left = np.clip(right - 1, 0, times.size - 1)
+        use_left = np.abs(times[left] - targets) <= np.abs(times[right] - targets)
+        nearest = np.where(use_left, left, right)
+        within = np.abs(times[nearest] - targets) <= tolerance
+        snapped[within, column] = values[nearest[within]]
+    return snapped
+
+
+def _station_bbox(lon: np.ndarray, lat: np.ndarray) -> Tuple[float, float, float, float]:
+    """Bounding box of the stations."""
+    return float(lon.min()), float(lat.min()), float(lon.max()), float(lat.max())
+
+
+def generate_interpolation(start_time: datetime, end_time: datetime,
+                           step_minutes: Optional[int] = None,
+                           resolution: Optional[float] = None,
+                           bbox: Optional[Tuple[float, float, float, float]] = None,
+                           workers: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Generate interpolated grids for a time range and store them in MongoDB.
+
+    Existing interpolation data for the regenerated range is replaced grid by
+    grid. Each new grid is written before the old one for its timestamp is
+    deleted, and old grids with no new one are removed only after every grid
+    has been written. Readers therefore never miss a grid, and a failed run
+    leaves the remaining old grids in place.
+
+    Args:
+        start_time: First grid timestamp
+        end_time: Last grid timestamp (inclusive)
+        step_minutes: Minutes between grid timestamps (defaults to settings.GRID_STEP_MINUTES)
+        resolution: Cell size in degrees (defaults to settings.GRID_RESOLUTION)
+        bbox: (min_lon, min_lat, max_lon, max_lat); defaults to settings.GRID_BBOX or the station extent
+        workers: Number of worker processes (defaults to settings.GRID_WORKERS or the CPU count)
+
+    Returns:
+        Tuple[int, int]: (Number of grids generated, total data points written)
+    """
+    step = timedelta(minutes=step_minutes or settings.GRID_STEP_MINUTES)
+    resolution = resolution or settings.GRID_RESOLUTION
+    workers = workers or settings.GRID_WORKERS or os.cpu_count()
+    tolerance = step / 2
+
+    timestamps = _grid_timestamps(start_time, end_time, step)
+    if not timestamps:
+        print("No grid timestamps in the requested range")
+        return 0, 0
+
+    print(f"Reading station readings between {start_time} and {end_time}")
+    station_ids, station_lon, station_lat, series = _read_station_series(
+        start_time - tolerance, end_time + tolerance
+    )
+    if not station_ids:
+        print("No station readings found in the requested range")
+        return 0, 0
+
+    bbox = bbox or (tuple(settings.GRID_BBOX) if settings.GRID_BBOX else _station_bbox(station_lon, station_lat))
+    grid_lon, grid_lat = idw.make_grid(bbox, resolution)
+    if grid_lon.size > settings.GRID_MAX_CELLS:
+        raise ValueError(
+            f"Grid of {grid_lon.size} cells exceeds GRID_MAX_CELLS ({settings.GRID_MAX_CELLS}); "
+            f"use a coarser resolution or a smaller bounding box"
+        )
+
+    targets = np.asarray([ts.timestamp() for ts in timestamps], dtype=np.float64)
+    snapped = _snap_station_values(station_ids, series, targets, tolerance.total_seconds())
+    print(f"Generating {len(timestamps)} grids of {grid_lon.size} cells from {len(station_ids)} stations "
+          f"with {workers} workers")
+
+    # Fork workers where possible: a fresh interpreter would import the app package and reconnect to MongoDB
+    context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+
+    written_timestamps = []
+    points_written = 0
+    deleted = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=idw.init_worker,
+        initargs=(grid_lon, grid_lat, station_lon, station_lat, settings.IDW_POWER)
+    ) as executor:
+        tasks = ((index, snapped[index]) for index in range(len(timestamps)))
+        for index, grid in executor.map(idw.compute_grid, tasks):
+            if grid is None:
+                continue
+            written, replaced = _write_grid(timestamps[index], grid_lon, grid_lat, grid)
+            if written:
+                written_timestamps.append(timestamps[index])
+                points_written += written
+                deleted += replaced
+
+    # Grids in the range that were not regenerated are removed only now, so a failed run keeps them
+    deleted += mongodb_manager.delete_interpolation_range(start_time, end_time, keep=written_timestamps)
+    if deleted:
+        print(f"Replaced {deleted} existing interpolation points in the range")
+
+    grids_written = len(written_timestamps)
+    grid_payload_cache.clear()
+    grid_cache.clear()
+    print(f"Generated {grids_written} grids with {points_written} interpolation points")
+    return grids_written, points_written
+
+
+def _write_grid(timestamp: datetime, grid_lon: np.ndarray, grid_lat: np.ndarray,
+                grid: np.ndarray) -> Tuple[int, int]:
+    """
+    Write one generated grid to the interpolation collection, replacing any stored grid for its timestamp.
+
+    Args:
+        timestamp: Grid timestamp
+        grid_lon: Cell longitudes
+        grid_lat: Cell latitudes
+        grid: Interpolated values of shape (n, v)
+
+    Returns:
+        Tuple[int, int]: (Number of data points written, number of old data points deleted)
+    """
+    fields = list(VARIABLES.values())
+    complete = ~np.isnan(grid).any(axis=1)
+    documents = [
+        {
+            "timestamp": timestamp,
+            "cell_id": cell_id,
+            "location": {"type": "Point", "coordinates": [float(lon), float(lat)]},
+            **{field: float(value) for field, value in zip(fields, values)}
+        }
+        for lon, lat, cell_id, values in zip(
+            grid_lon[complete], grid_lat[complete],
+            idw.cell_ids(grid_lon[complete], grid_lat[complete]).tolist(),
+            grid[complete].tolist()
+        )
+    ]
+    if not documents:
+        return 0, 0
+    return len(documents), mongodb_manager.replace_interpolation_grid(timestamp, documents)
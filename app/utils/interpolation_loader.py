@@ -5,27 +5,49 @@ import os
 import csv
 import re
 from datetime import datetime
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
+
+from pymongo.collection import Collection
 
 from app.db.mongodb import mongodb_manager
+from app.utils.grid_cache import grid_cache
+from app.utils.idw import cell_ids
+from app.utils.payload_cache import grid_payload_cache
 
 
 def load_interpolation_data(directory_path: str, clear_existing: bool = True) -> Tuple[int, int]:
     """
     Load interpolation data from CSV files in the specified directory.
+
+    When replacing existing data, the files are loaded into a shadow
+    collection which is indexed and then renamed over the live collection, so
+    readers keep seeing the previous data until the new data is complete.
     
     Args:
         directory_path: Path to directory containing interpolation CSV files
-        clear_existing: Whether to clear existing interpolation data
+        clear_existing: Whether to replace existing interpolation data
     
     Returns:
         Tuple[int, int]: (Number of files processed, total data points loaded)
     """
-    # Clear existing data if requested
     if clear_existing:
-        deleted_count = mongodb_manager.clear_interpolation_collection()
-        print(f"Cleared {deleted_count} existing interpolation data points")
-    
+        with mongodb_manager.interpolation_shadow() as (shadow, version):
+            files_processed, total_points = _load_files(directory_path, collection=shadow, version=version)
+        print("Replaced the existing interpolation data")
+    else:
+        files_processed, total_points = _load_files(directory_path, collection=None)
+
+    # Cached payloads may describe grids that were just replaced
+    grid_payload_cache.clear()
+    grid_cache.clear()
+
+    print(f"Completed loading {files_processed} files with {total_points} interpolation points")
+    return files_processed, total_points
+
+
+def _load_files(directory_path: str, collection: Optional[Collection],
+                version: Optional[int] = None) -> Tuple[int, int]:
+    """Load every interpolation CSV in a directory into a collection (the live one if None)."""
     files_processed = 0
     total_points = 0
     
@@ -45,23 +67,26 @@ def load_interpolation_data(directory_path: str, clear_existing: bool = True) ->
             # timestamp = datetime.fromisoformat(timestamp_str)
             
             file_path = os.path.join(directory_path, filename)
-            points_loaded = process_interpolation_file(file_path, timestamp)
+            points_loaded = process_interpolation_file(file_path, timestamp, collection, version)
             
             files_processed += 1
             total_points += points_loaded
             print(f"Processed {filename}: {points_loaded} data points")
     
-    print(f"Completed loading {files_processed} files with {total_points} interpolation points")
     return files_processed, total_points
 
 
-def process_interpolation_file(file_path: str, timestamp: datetime) -> int:
+def process_interpolation_file(file_path: str, timestamp: datetime,
+                               collection: Optional[Collection] = None,
+                               version: Optional[int] = None) -> int:
     """
     Process a single interpolation CSV file and load into MongoDB.
     
     Args:
         file_path: Path to the CSV file
         timestamp: Timestamp extracted from filename
+        collection: Target collection (defaults to the live interpolation collection)
+        version: Data version of the enclosing reload (each file gets its own if None)
         
     Returns:
         int: Number of data points loaded
@@ -80,6 +105,7 @@ def process_interpolation_file(file_path: str, timestamp: datetime) -> int:
                 # Prepare document for MongoDB
                 document = {
                     "timestamp": timestamp,
+                    "cell_id": int(cell_ids(longitude, latitude)),
                     "location": {
                         "type": "Point",
                         "coordinates": [longitude, latitude]
@@ -97,6 +123,6 @@ def process_interpolation_file(file_path: str, timestamp: datetime) -> int:
     
     # Insert data points in batches
     if data_points:
-        mongodb_manager.insert_interpolation_data(data_points)
+        mongodb_manager.insert_interpolation_data(data_points, collection, version)
     
     return len(data_points)
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Keyset pagination helpers.
+
+List endpoints page through results ordered by ``(timestamp, _id)`` and hand
+clients an opaque continuation token for the last row they received. The next
+page starts strictly after that key instead of skipping an offset.
+
+``_id`` is the ID of the document the row came from. For interpolation points
+that is the point itself; for station readings it is the station's monthly
+bucket document, so two readings of one station with the same timestamp share
+a key.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple, Union
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+
+CursorKey = Tuple[Optional[datetime], Union[ObjectId, str]]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: Optional[datetime], document_id: Union[ObjectId, str]) -> str:
+    """
+    Encode a keyset position as an opaque continuation token.
+
+    Args:
+        timestamp: Timestamp of the last returned row, or None for ID-only ordering
+        document_id: ObjectId (or string key such as a station ID) of the last returned row
+
+    Returns:
+        str: URL-safe continuation token
+    """
+    payload = {
+        "t": timestamp.isoformat() if timestamp is not None else None,
+        "id": str(document_id),
+        "k": "oid" if isinstance(document_id, ObjectId) else "str"
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> CursorKey:
+    """
+    Decode a continuation token produced by :func:`encode_cursor`.
+
+    Args:
+        token: Continuation token supplied by the client
+
+    Returns:
+        CursorKey: (timestamp, key) position to resume after
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        timestamp = datetime.fromisoformat(payload["t"]) if payload.get("t") else None
+        if payload.get("k", "oid") == "str":
+            return timestamp, str(payload["id"])
+        return timestamp, ObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
+
+
+def parse_cursor(token: Optional[str]) -> Optional[CursorKey]:
+    """
+    Decode an optional continuation token, rejecting malformed ones with a 400.
+
+    Args:
+        token: Continuation token supplied by the client
+
+    Returns:
+        Optional[CursorKey]: Keyset position to resume after, if any
+    """
+    if token is None:
+        return None
+    try:
+        return decode_cursor(token)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def keyset_filter(timestamp_field: str, after: CursorKey) -> Dict[str, Any]:
+    """
+    Build the query clause selecting rows strictly after a keyset position.
+
+    Args:
+        timestamp_field: Name of the timestamp field in the ordering
+        after: Position of the last row of the previous page
+
+    Returns:
+        Dict[str, Any]: MongoDB filter clause
+    """
+    timestamp, document_id = after
+    if timestamp is None:
+        return {"_id": {"$gt": document_id}}
+
+    return {
+        "$or": [
+            {timestamp_field: {"$gt": timestamp}},
+            {timestamp_field: timestamp, "_id": {"$gt": document_id}}
+        ]
+    }
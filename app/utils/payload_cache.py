@@ -0,0 +1,258 @@
+"""
+On-disk cache of precompressed response payloads for historical grids.
+
+An interpolation grid for a past timestamp does not change once it has been
+loaded, so its serialized JSON is built once, compressed with every available
+codec, and stored on disk next to a small metadata file carrying its strong
+ETag. Later requests are answered straight from these files, and conditional
+requests whose ``If-None-Match`` matches are answered with 304 without querying
+MongoDB. The cache lives on disk so that every server worker and the data
+loaders share it; loaders clear it whenever the underlying data is replaced.
+The directory is bounded by size and evicts the least recently used payloads
+first, since keys such as contour level sets are chosen by clients.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+# Content-Encoding token -> file suffix, in order of preference
+_ENCODING_SUFFIXES = {
+    "br": ".br",
+    "zstd": ".zst",
+    "gzip": ".gz",
+}
+
+
+def _compress(encoding: str, body: bytes) -> bytes:
+    """Compress a payload with the given content encoding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=11)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=19).compress(body)
+    return gzip.compress(body, compresslevel=9)
+
+
+def available_encodings() -> List[str]:
+    """
+    List the content encodings this installation can produce.
+
+    Returns:
+        List[str]: Encodings in order of preference
+    """
+    encodings = []
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: Optional[str], encodings: List[str]) -> Optional[str]:
+    """
+    Pick the preferred encoding accepted by the client.
+
+    Args:
+        accept_encoding: Value of the request's Accept-Encoding header
+        encodings: Encodings available for the payload, in order of preference
+
+    Returns:
+        Optional[str]: Chosen encoding, or None to send the identity payload
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token.strip().lower()] = quality
+
+    for encoding in encodings:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+class PayloadCache:
+    """Disk-backed store of precompressed JSON payloads keyed by string."""
+
+    def __init__(self, directory: str, min_age_seconds: int, max_bytes: int):
+        """
+        Initialize the payload cache.
+
+        Args:
+            directory: Directory holding the cached payload files
+            min_age_seconds: How old a timestamp must be before its grid is treated as immutable
+            max_bytes: Total size above which the least recently used payloads are evicted
+        """
+        self.directory = Path(directory)
+        self.min_age = timedelta(seconds=min_age_seconds)
+        self.max_bytes = max_bytes
+
+    def is_cacheable(self, timestamp: datetime) -> bool:
+        """
+        Check whether a grid timestamp is old enough to be cached.
+
+        Args:
+            timestamp: Grid timestamp
+
+        Returns:
+            bool: True if the grid is considered immutable
+        """
+        now = datetime.now(timezone.utc)
+        if timestamp.tzinfo is None:
+            now = now.replace(tzinfo=None)
+        return timestamp <= now - self.min_age
+
+    def _path(self, key: str, suffix: str = "") -> Path:
+        return self.directory / f"{key}.json{suffix}"
+
+    def get_metadata(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the metadata of a cached payload.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[Dict[str, Any]]: Metadata with ``etag`` and ``encodings``, or None on a miss
+        """
+        meta_path = self._path(key, ".meta")
+        try:
+            with open(meta_path, "r", encoding="utf-8") as meta_file:
+                metadata = json.load(meta_file)
+            # Record the access for LRU eviction
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            return None
+        return metadata
+
+    def read(self, key: str, encoding: Optional[str]) -> Optional[bytes]:
+        """
+        Read a cached payload in the given encoding.
+
+        Args:
+            key: Cache key
+            encoding: Content encoding, or None for the identity payload
+
+        Returns:
+            Optional[bytes]: Payload bytes, or None if missing
+        """
+        suffix = _ENCODING_SUFFIXES[encoding] if encoding else ""
+        try:
+            return self._path(key, suffix).read_bytes()
+        except OSError:
+            return None
+
+    def store(self, key: str, body: bytes, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Compress and store a payload under a key.
+
+        Each file is written to a temporary name and renamed into place, and
+        the metadata file is written last, so a reader that finds the metadata
+        always finds complete payloads.
+
+        Args:
+            key: Cache key
+            body: Identity (uncompressed) payload
+            extra: Additional metadata to store with the payload
+
+        Returns:
+            Dict[str, Any]: Metadata of the stored payload
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        encodings = available_encodings()
+        self._write_atomic(self._path(key), body)
+        for encoding in encodings:
+            self._write_atomic(self._path(key, _ENCODING_SUFFIXES[encoding]), _compress(encoding, body))
+
+        metadata = dict(extra or {})
+        metadata["etag"] = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        metadata["encodings"] = encodings
+        self._write_atomic(self._path(key, ".meta"), json.dumps(metadata).encode("utf-8"))
+        self.evict()
+        return metadata
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+
+    def evict(self) -> int:
+        """
+        Delete the least recently used payloads until the cache fits in max_bytes.
+
+        Returns:
+            int: Number of payloads evicted
+        """
+        payloads = []
+        total = 0
+        for meta_path in self.directory.glob("*.json.meta"):
+            key = meta_path.name[:-len(".json.meta")]
+            paths = [meta_path] + [self._path(key, suffix) for suffix in ["", *_ENCODING_SUFFIXES.values()]]
+            size = 0
+            for path in paths:
+                try:
+                    size += path.stat().st_size
+                except OSError:
+                    pass
+            try:
+                payloads.append((meta_path.stat().st_mtime, paths, size))
+            except OSError:
+                continue
+            total += size
+
+        evicted = 0
+        for _, paths, size in sorted(payloads, key=lambda payload: payload[0]):
+            if total <= self.max_bytes:
+                break
+            # The metadata file goes first, so readers miss instead of finding partial payloads
+            for path in paths:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        """Remove every cached payload."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+# Shared cache for historical interpolation grids
+grid_payload_cache = PayloadCache(
+    settings.PAYLOAD_CACHE_DIR,
+    settings.PAYLOAD_CACHE_MIN_AGE_SECONDS,
+    settings.PAYLOAD_CACHE_MAX_BYTES
+)
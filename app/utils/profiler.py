@@ -0,0 +1,252 @@
+"""
+Opt-in sampling profiler for API requests.
+
+A background thread samples the Python stacks of every thread with
+``sys._current_frames()`` while a profiled request is in flight, so the
+request itself runs uninstrumented. Samples are aggregated per route and
+written as folded stacks (``frame;frame;frame count``) to
+``PROFILER_DIR/<method>_<route>.folded``, which flamegraph.pl, speedscope and
+similar tools render as flamegraphs.
+
+Which requests are profiled is controlled by ``PROFILER_*`` settings and can
+be changed at runtime through a control file in the profile directory, which
+every worker process re-reads, so no restart is needed.
+
+Samples from requests that overlap a profiled request are attributed to it
+too; keep the sample rate low enough that profiled requests rarely overlap.
+"""
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+
+PROFILE_HEADER = b"x-profile"
+
+# Leaf frames of threads that are parked rather than working
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+class ProfilerControl:
+    """Runtime profiler switches shared by all workers through a control file."""
+
+    def __init__(self, directory: str, check_interval: float = 1.0):
+        """
+        Initialize the control.
+
+        Args:
+            directory: Profile directory holding ``control.json``
+            check_interval: Minimum time in seconds between checks of the control file
+        """
+        self.path = Path(directory) / "control.json"
+        self.check_interval = check_interval
+        self._checked = 0.0
+        self._mtime = None
+        self._values = self._defaults()
+
+    @staticmethod
+    def _defaults() -> Dict[str, Any]:
+        return {
+            "enabled": settings.PROFILER_ENABLED,
+            "sample_rate": settings.PROFILER_SAMPLE_RATE,
+            "allow_header": settings.PROFILER_ALLOW_HEADER
+        }
+
+    def current(self) -> Dict[str, Any]:
+        """
+        Get the current switches, re-reading the control file if it changed.
+
+        Returns:
+            Dict[str, Any]: ``enabled``, ``sample_rate`` and ``allow_header``
+        """
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval:
+            self._checked = now
+            try:
+                mtime = self.path.stat().st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != self._mtime:
+                self._mtime = mtime
+                values = self._defaults()
+                if mtime is not None:
+                    try:
+                        values.update(json.loads(self.path.read_text()))
+                    except (OSError, ValueError) as e:
+                        print(f"Ignoring unreadable profiler control file {self.path}: {e}")
+                self._values = values
+        return self._values
+
+    def update(self, **changes: Any) -> Dict[str, Any]:
+        """
+        Change switches for every worker.
+
+        Args:
+            **changes: New values for ``enabled``, ``sample_rate`` or ``allow_header``
+
+        Returns:
+            Dict[str, Any]: The switches now in effect
+        """
+        values = {**self.current(), **{key: value for key, value in changes.items() if value is not None}}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"control.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(values))
+        os.replace(tmp_path, self.path)
+        self._checked = 0.0
+        return self.current()
+
+
+class SamplingProfiler:
+    """Stack sampler aggregating folded stacks per route."""
+
+    def __init__(self, directory: str, interval_ms: float):
+        """
+        Initialize the profiler.
+
+        Args:
+            directory: Directory the folded stack files are written to
+            interval_ms: Time between stack samples in milliseconds
+        """
+        self.directory = Path(directory)
+        self.interval = interval_ms / 1000
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._active: List[Counter] = []
+        self._profiles: Dict[str, Counter] = {}
+        self._requests: Counter = Counter()
+        self._thread = None
+
+    def begin(self) -> Counter:
+        """
+        Start sampling on behalf of a request.
+
+        Returns:
+            Counter: Sample collector to pass to :meth:`end`
+        """
+        samples: Counter = Counter()
+        with self._lock:
+            self._active.append(samples)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return samples
+
+    def end(self, samples: Counter, route: str) -> None:
+        """
+        Stop sampling for a request and fold its samples into the route's profile.
+
+        Args:
+            samples: Collector returned by :meth:`begin`
+            route: Route label, e.g. ``POST /api/v1/interpolation/by-timestamp``
+        """
+        with self._lock:
+            self._active.remove(samples)
+            profile = self._profiles.setdefault(route, Counter())
+            profile.update(samples)
+            self._requests[route] += 1
+            snapshot = dict(profile)
+        self._write(route, snapshot)
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while True:
+            self._wake.wait()
+            with self._lock:
+                if not self._active:
+                    self._wake.clear()
+                    continue
+            stacks = self._sample(own_ident)
+            with self._lock:
+                for samples in self._active:
+                    samples.update(stacks)
+            time.sleep(self.interval)
+
+    @staticmethod
+    def _sample(own_ident: int) -> List[str]:
+        """Capture the folded stack of every busy thread."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            frames.append(names.get(ident, f"thread-{ident}"))
+            stacks.append(";".join(reversed(frames)))
+        return stacks
+
+    def _write(self, route: str, profile: Dict[str, int]) -> None:
+        """Rewrite a route's folded stack file."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_')}.folded"
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as profile_file:
+            for stack, count in profile.items():
+                profile_file.write(f"{stack} {count}\n")
+        os.replace(tmp_path, path)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-route profile counters for this worker.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Profiled requests and samples per route
+        """
+        with self._lock:
+            return {
+                route: {"requests": self._requests[route], "samples": sum(profile.values())}
+                for route, profile in self._profiles.items()
+            }
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling a sampled fraction of requests."""
+
+    def __init__(self, app, profiler: Optional[SamplingProfiler] = None, control: Optional[ProfilerControl] = None):
+        self.app = app
+        self.profiler = profiler or sampling_profiler
+        self.control = control or profiler_control
+
+    def _should_profile(self, scope) -> bool:
+        switches = self.control.current()
+        if switches["allow_header"] and any(name == PROFILE_HEADER for name, _ in scope.get("headers", [])):
+            return True
+        return switches["enabled"] and random.random() < switches["sample_rate"]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        samples = self.profiler.begin()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            self.profiler.end(samples, f"{scope['method']} {path}")
+
+
+# Shared profiler state for this worker process
+profiler_control = ProfilerControl(settings.PROFILER_DIR)
+sampling_profiler = SamplingProfiler(settings.PROFILER_DIR, settings.PROFILER_INTERVAL_MS)
@@ -0,0 +1,58 @@
+"""
+Vectorized region masks over grid cells.
+"""
+from typing import Sequence
+
+import numpy as np
+
+
+def bbox_mask(lon: np.ndarray, lat: np.ndarray, bbox: Sequence[float]) -> np.ndarray:
+    """
+    Select the cells inside a bounding box (edges included).
+
+    Args:
+        lon: Cell longitudes
+        lat: Cell latitudes
+        bbox: (min_lon, min_lat, max_lon, max_lat)
+
+    Returns:
+        np.ndarray: Boolean mask over the cells
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return (lon >= min_lon) & (lon <= max_lon) & (lat >= min_lat) & (lat <= max_lat)
+
+
+def polygon_mask(lon: np.ndarray, lat: np.ndarray, polygon: Sequence[Sequence[float]]) -> np.ndarray:
+    """
+    Select the cells inside a polygon with the even-odd ray casting rule.
+
+    The loop runs over the polygon's edges; each edge is tested against every
+    cell at once.
+
+    Args:
+        lon: Cell longitudes
+        lat: Cell latitudes
+        polygon: Ring of [lon, lat] vertices; closing the ring is optional
+
+    Returns:
+        np.ndarray: Boolean mask over the cells
+    """
+    vertices = np.asarray(polygon, dtype=np.float64)[:, :2]
+    inside = np.zeros(lon.shape, dtype=bool)
+
+    # Only cells inside the polygon's bounding box can be inside the polygon
+    candidates = np.flatnonzero(bbox_mask(lon, lat, (*vertices.min(axis=0), *vertices.max(axis=0))))
+    x, y = lon[candidates], lat[candidates]
+    crossings = np.zeros(candidates.shape, dtype=bool)
+
+    x1, y1 = vertices[:, 0], vertices[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    for ax, ay, bx, by in zip(x1, y1, x2, y2):
+        if ay == by:
+            continue
+        straddles = (ay > y) != (by > y)
+        crossing_x = ax + (y - ay) * (bx - ax) / (by - ay)
+        crossings ^= straddles & (x < crossing_x)
+
+    inside[candidates] = crossings
+    return inside
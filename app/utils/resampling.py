@@ -0,0 +1,133 @@
+"""
+Resampling of station readings onto a fixed cadence.
+
+Raw readings arrive at irregular times, so finding the reading for a given
+time means searching ``entries.timestamp``. A resampled series stores one
+document per station, month and step. Each document holds the month start,
+the step and one dense array per variable, where slot ``i`` covers
+``[start + i * step, start + (i + 1) * step)``. The value for any time is
+then found by offset arithmetic and a ``$slice`` projection, with no
+per-entry index. Slots without readings hold ``null`` and a ``samples``
+count of 0, which flags the gap.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from app.models.weather import READING_FIELDS
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def validate_step(step_minutes: int) -> None:
+    """
+    Check that a step divides a day, so every month starts on a slot boundary.
+
+    Args:
+        step_minutes: Resampling step in minutes
+
+    Raises:
+        ValueError: If the step does not divide a day
+    """
+    if step_minutes <= 0 or MINUTES_PER_DAY % step_minutes != 0:
+        raise ValueError(f"Resampling step must divide a day evenly, got {step_minutes} minutes")
+
+
+def month_start(timestamp: datetime) -> datetime:
+    """Get the start of the month containing a timestamp."""
+    return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(start: datetime) -> datetime:
+    """Get the start of the month after a month start."""
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def _dense(values: List[Any], offsets: np.ndarray, length: int, fill: Any) -> List[Any]:
+    """Scatter plain Python values into a list of ``length`` slots, filling the rest."""
+    dense = np.full(length, fill, dtype=object)
+    dense[offsets] = values
+    return dense.tolist()
+
+
+def resample_entries(entries: List[Dict[str, Any]], step_minutes: int) -> List[Dict[str, Any]]:
+    """
+    Resample a station's readings onto a fixed cadence, split by month.
+
+    Each slot holds the mean of the readings inside it. Leading slots before
+    the first reading of a month are padded, so slot 0 is always the month
+    start.
+
+    Args:
+        entries: Readings with ``timestamp`` and the stored reading keys
+        step_minutes: Resampling step in minutes
+
+    Returns:
+        List[Dict[str, Any]]: Per month: ``start``, ``step_seconds``,
+        ``count``, ``samples`` (readings per slot) and one array per reading key
+    """
+    validate_step(step_minutes)
+    if not entries:
+        return []
+
+    columns = list(READING_FIELDS.values())
+    frame = pd.DataFrame(entries)
+    frame.index = pd.DatetimeIndex(pd.to_datetime(frame["timestamp"]))
+    frame = frame.reindex(columns=columns).apply(pd.to_numeric, errors="coerce").sort_index()
+
+    # Slots are aligned to midnight, which the step divides, so also to month starts
+    step = pd.Timedelta(minutes=step_minutes)
+    resampler = frame.resample(step, origin="start_day")
+    means = resampler.mean()
+    samples = resampler.size()
+
+    series = []
+    for period in means.index.to_period("M").unique():
+        start = period.start_time
+        in_month = (means.index >= start) & (means.index < (period + 1).start_time)
+        offsets = ((means.index[in_month] - start) // step).to_numpy()
+        length = int(offsets[-1]) + 1
+        month = means[in_month]
+        document = {
+            "start": start.to_pydatetime(),
+            "step_seconds": step_minutes * 60,
+            "count": length,
+            "samples": _dense(samples[in_month].tolist(), offsets, length, 0),
+        }
+        for column in columns:
+            values = month[column].round(3).astype(object).where(month[column].notna(), None)
+            document[column] = _dense(values.tolist(), offsets, length, None)
+        series.append(document)
+    return series
+
+
+def merge_series(stored: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Overlay a newly resampled month onto the stored document for that month.
+
+    Slots the update has readings for take its values. Every other slot keeps
+    the stored values, so loading part of a month does not erase the rest.
+
+    Args:
+        stored: Stored monthly document
+        update: Monthly document from :func:`resample_entries` for the same station, step and month
+
+    Returns:
+        Dict[str, Any]: The merged monthly document
+    """
+    length = max(len(stored.get("samples") or []), update["count"])
+
+    def padded(document: Dict[str, Any], key: str, fill: Any) -> List[Any]:
+        values = document.get(key) or []
+        return values + [fill] * (length - len(values))
+
+    covered = [samples > 0 for samples in padded(update, "samples", 0)]
+    merged = {"start": update["start"], "step_seconds": update["step_seconds"], "count": length}
+    for key, fill in [("samples", 0)] + [(column, None) for column in READING_FIELDS.values()]:
+        merged[key] = [
+            new if use_new else old
+            for old, new, use_new in zip(padded(stored, key, fill), padded(update, key, fill), covered)
+        ]
+    return merged
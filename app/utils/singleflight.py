@@ -0,0 +1,89 @@
+"""
+Single-flight coalescing of identical concurrent requests.
+
+When many clients ask for the same thing at the same moment (a freshly
+published grid, the interpolation status), only the first caller runs the
+work; everyone who arrives while it is in flight awaits the same result.
+Nothing is cached once the work finishes, so later callers always see fresh
+data.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Hashable
+
+from starlette.concurrency import run_in_threadpool
+
+
+class SingleFlight:
+    """Group of keyed in-flight executions shared by concurrent callers."""
+
+    def __init__(self, name: str):
+        """
+        Initialize a single-flight group.
+
+        Args:
+            name: Group name reported in the metrics
+        """
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+        _groups[name] = self
+
+    async def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking function once per key among concurrent callers.
+
+        The function runs in the threadpool as its own task, so a caller that
+        disconnects does not cancel the work for the others. Exceptions are
+        delivered to every caller.
+
+        Args:
+            key: Identity of the work; callers with equal keys share one execution
+            fn: Blocking function to run
+            *args: Arguments for the function
+
+        Returns:
+            Any: The function's result
+        """
+        future = self._in_flight.get(key)
+        if future is None:
+            self.executions += 1
+            future = asyncio.ensure_future(run_in_threadpool(fn, *args))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future) -> None:
+        self._in_flight.pop(key, None)
+        # Mark the exception as retrieved in case every caller has gone away
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the group's counters.
+
+        Returns:
+            Dict[str, int]: Executions run, duplicate executions saved, and work currently in flight
+        """
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight)
+        }
+
+
+# Every group created in this process, by name
+_groups: Dict[str, SingleFlight] = {}
+
+
+def singleflight_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Get the counters of every single-flight group.
+
+    Returns:
+        Dict[str, Dict[str, int]]: Counters keyed by group name
+    """
+    return {name: group.stats() for name, group in _groups.items()}
@@ -0,0 +1,23 @@
+"""
+Timestamp normalization shared by the database layer, the API and the caches.
+"""
+from datetime import datetime, timezone
+
+
+def naive_utc(value: datetime) -> datetime:
+    """
+    Convert a datetime to naive UTC, as stored by MongoDB.
+
+    Naive datetimes are taken to be UTC already. Cache keys and partition
+    choices must go through this, so that ``12:00+02:00`` and ``10:00`` map to
+    the same stored timestamp.
+
+    Args:
+        value: Naive (UTC) or timezone-aware datetime
+
+    Returns:
+        datetime: Naive UTC datetime
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
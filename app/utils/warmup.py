@@ -0,0 +1,91 @@
+"""
+Startup warm-up of the in-process caches.
+
+After a deploy or restart, the first requests for the station list and the
+latest grids would otherwise pay the full MongoDB round trip and decode
+cost. The warm-up runs a list of named steps once at startup: the station
+registry, the timestamp catalog and the most recent grids. It records each
+step's duration and memory footprint. The ``/ready`` probe reports ready only
+once it has finished, so a load balancer keeps traffic away until then.
+"""
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# A warm-up step returns (items loaded, bytes of cache data held, if known)
+WarmupStep = Callable[[], Tuple[int, Optional[int]]]
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Warmup:
+    """Runs the warm-up steps once and reports readiness."""
+
+    def __init__(self):
+        self.ready = False
+        self.started_at: Optional[str] = None
+        self.duration_ms: Optional[float] = None
+        self.steps: List[Dict[str, Any]] = []
+
+    def run(self, steps: List[Tuple[str, WarmupStep]]) -> None:
+        """
+        Run every step in order, then mark the service ready.
+
+        A failing step is recorded and skipped: an empty cache only costs
+        latency, so it must not keep the service out of rotation.
+
+        Args:
+            steps: (name, step) pairs
+        """
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        started = time.perf_counter()
+        for name, step in steps:
+            step_started = time.perf_counter()
+            rss_before = _rss_bytes()
+            record: Dict[str, Any] = {"step": name}
+            try:
+                items, cache_bytes = step()
+                record.update(items=items, cache_bytes=cache_bytes)
+            except Exception as e:
+                record["error"] = str(e)
+                print(f"Warm-up step {name} failed: {e}")
+            rss_after = _rss_bytes()
+            record["duration_ms"] = round((time.perf_counter() - step_started) * 1000, 1)
+            record["rss_delta_bytes"] = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+            self.steps.append(record)
+
+        self.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.ready = True
+        print(f"Warm-up finished in {self.duration_ms:.0f} ms")
+
+    def skip(self) -> None:
+        """Mark the service ready without warming up."""
+        self.ready = True
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Get the warm-up state.
+
+        Returns:
+            Dict[str, Any]: Readiness, total duration, process RSS and per-step
+            items, cache bytes, RSS delta and duration
+        """
+        return {
+            "ready": self.ready,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "rss_bytes": _rss_bytes(),
+            "steps": list(self.steps)
+        }
+
+
+# Shared warm-up state for this worker process
+warmup = Warmup()
@@ -124,14 +124,47 @@
 Main entry point for the Weather Station API application.
 """
 import argparse
+import asyncio
 import uvicorn
+from dateutil import parser as date_parser
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
 from app.api import routes
 from app.api import interpolation
+from app.api import diagnostics
+from app.db import indexes
+from app.db.change_feed import change_feed
+from app.db.mongodb import mongodb_manager
+from app.db.station_registry import station_registry
+from app.db.timestamp_catalog import timestamp_catalog
+from app.db.write_behind import reading_buffer
+from app.utils.admission import AdmissionMiddleware
+from app.utils.profiler import ProfilingMiddleware
+from app.utils.warmup import warmup
 from app.utils import data_loader
+from app.utils import exporter
 from app.utils import interpolation_loader
+from app.utils import interpolation_generator
+
+
+def warmup_steps():
+    """Build the startup warm-up steps: station registry, timestamp catalog and the latest grids."""
+    def stations():
+        count = station_registry.refresh()
+        print(f"Station registry loaded with {count} stations")
+        return count, None
+    
+    def timestamps():
+        return timestamp_catalog.refresh(), timestamp_catalog.nbytes
+    
+    def grids():
+        latest = timestamp_catalog.latest(settings.WARMUP_GRID_COUNT)
+        return len(latest), sum(interpolation.preload_grid(timestamp) for timestamp in latest)
+    
+    return [("station_registry", stations), ("timestamp_catalog", timestamps), ("latest_grids", grids)]
 
 
 def create_application() -> FastAPI:
@@ -144,9 +177,39 @@ def create_application() -> FastAPI:
         redoc_url="/redoc",
     )
     
+    # Event handlers
+    @app.on_event("startup")
+    async def startup():
+        reading_buffer.start()
+        change_feed.start()
+        if settings.WARMUP_ENABLED:
+            # Warm up in the background; /ready reports ready once it is done
+            app.state.warmup_task = asyncio.ensure_future(run_in_threadpool(warmup.run, warmup_steps()))
+        else:
+            warmup.skip()
+    
+    @app.on_event("shutdown")
+    async def shutdown():
+        change_feed.stop()
+        reading_buffer.stop()
+    
+    # Profile a sampled fraction of requests when enabled
+    app.add_middleware(ProfilingMiddleware)
+    
+    # Shed load per route pool before it reaches the handlers (outermost middleware)
+    if settings.ADMISSION_ENABLED:
+        app.add_middleware(AdmissionMiddleware)
+    
     # Include routers
     app.include_router(routes.router)
     app.include_router(interpolation.router)
+    app.include_router(diagnostics.router)
+    
+    @app.get("/ready", tags=["Root"])
+    async def ready():
+        """Readiness probe: 503 until the startup warm-up has finished."""
+        report = warmup.report()
+        return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
     
     @app.get("/", tags=["Root"])
     async def root():
@@ -176,20 +239,96 @@ def main():
     # Data loading arguments
     parser.add_argument("--load-weather-data", help="Path to directory with weather station CSV files")
     parser.add_argument("--load-interpolation", help="Path to directory with interpolation CSV files")
+    parser.add_argument("--start-date", type=date_parser.parse, help="Earliest reading to load (e.g. 2024-01-01)")
+    parser.add_argument("--end-date", type=date_parser.parse, help="Latest reading to load (e.g. 2024-12-31T23:59:59)")
+    parser.add_argument("--resample-minutes", type=int,
+                        help="Also store each loaded station resampled onto this step (e.g. 5 or 15)")
+    
+    # Grid generation arguments
+    parser.add_argument("--generate-interpolation", action="store_true",
+                        help="Generate interpolated grids from station readings between --start-date and --end-date")
+    parser.add_argument("--grid-resolution", type=float, help="Grid cell size in degrees")
+    parser.add_argument("--grid-bbox", help="Grid bounding box as min_lon,min_lat,max_lon,max_lat")
+    parser.add_argument("--grid-step-minutes", type=int, help="Minutes between generated grids")
+    parser.add_argument("--workers", type=int, help="Worker processes for grid generation")
+    parser.add_argument("--backfill-cell-ids", action="store_true",
+                        help="Add cell IDs to interpolation data loaded before point series were supported")
+    
+    # Index management arguments
+    parser.add_argument("--ensure-indexes", action="store_true", help="Build any missing registered index")
+    parser.add_argument("--verify-indexes", action="store_true",
+                        help="Report missing, unregistered and unused indexes and benchmark the indexed queries")
+    
+    # Export arguments
+    parser.add_argument("--export-readings", metavar="OUTPUT_FILE",
+                        help="Export station readings between --start-date and --end-date to a .csv or .parquet file")
+    parser.add_argument("--stations", help="Comma-separated station IDs to export (all if omitted)")
     
     args = parser.parse_args()
     
     # Handle data loading
     if args.load_weather_data:
         print(f"Loading weather station data from {args.load_weather_data}")
-        data_loader.load_data_from_directory(args.load_weather_data)
+        data_loader.load_data_from_directory(
+            args.load_weather_data,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            resample_minutes=args.resample_minutes
+        )
     
     if args.load_interpolation:
         print(f"Loading interpolation data from {args.load_interpolation}")
         interpolation_loader.load_interpolation_data(args.load_interpolation)
     
+    if args.generate_interpolation:
+        if not (args.start_date and args.end_date):
+            parser.error("--generate-interpolation requires --start-date and --end-date")
+        bbox = tuple(float(value) for value in args.grid_bbox.split(",")) if args.grid_bbox else None
+        if bbox is not None and len(bbox) != 4:
+            parser.error("--grid-bbox must be min_lon,min_lat,max_lon,max_lat")
+        print(f"Generating interpolation grids from {args.start_date} to {args.end_date}")
+        interpolation_generator.generate_interpolation(
+            args.start_date,
+            args.end_date,
+            step_minutes=args.grid_step_minutes,
+            resolution=args.grid_resolution,
+            bbox=bbox,
+            workers=args.workers
+        )
+    
+    if args.backfill_cell_ids:
+        print("Backfilling interpolation cell IDs")
+        updated = mongodb_manager.backfill_interpolation_cell_ids()
+        print(f"Added cell IDs to {updated} interpolation points")
+    
+    if args.ensure_indexes:
+        print("Building missing indexes")
+        created = indexes.ensure_indexes(mongodb_manager.db)
+        for collection, names in created.items():
+            print(f"{collection}: created {', '.join(names)}")
+        print(f"Created indexes on {len(created)} collections")
+    
+    if args.verify_indexes:
+        indexes.print_report(indexes.verify_indexes(mongodb_manager.db), indexes.benchmark_queries(mongodb_manager.db))
+    
+    if args.export_readings:
+        if not (args.start_date and args.end_date):
+            parser.error("--export-readings requires --start-date and --end-date")
+        export_format = "parquet" if args.export_readings.endswith(".parquet") else "csv"
+        if export_format not in exporter.available_formats():
+            parser.error("Parquet export requires pyarrow")
+        station_ids = [part.strip() for part in args.stations.split(",")] if args.stations else None
+        print(f"Exporting readings from {args.start_date} to {args.end_date} to {args.export_readings}")
+        written = 0
+        with open(args.export_readings, "wb") as output_file:
+            for chunk in exporter.export_readings(args.start_date, args.end_date, export_format, station_ids):
+                output_file.write(chunk)
+                written += len(chunk)
+        print(f"Wrote {written} bytes to {args.export_readings}")
+    
     # Start the API server if not loading data
-    if not (args.load_weather_data or args.load_interpolation):
+    if not (args.load_weather_data or args.load_interpolation or args.generate_interpolation
+            or args.backfill_cell_ids or args.ensure_indexes or args.verify_indexes or args.export_readings):
         uvicorn.run(
             "main:app",
             host=args.host,
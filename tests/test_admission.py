@@ -0,0 +1,136 @@
+"""
+Tests for admission pools and route classification.
+"""
+import asyncio
+
+import pytest
+
+from app.utils.admission import AdmissionController, AdmissionPool, Overloaded
+
+
+async def _settle() -> None:
+    """Let every ready task run until it blocks again."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_waiters_are_admitted_in_fifo_order():
+    async def scenario():
+        pool = AdmissionPool("test", limit=1, queue_size=4, queue_timeout=1.0)
+        await pool.acquire()
+        admitted = []
+
+        async def wait(name):
+            await pool.acquire()
+            admitted.append(name)
+
+        tasks = [asyncio.create_task(wait(name)) for name in ("first", "second", "third")]
+        await _settle()
+        assert pool.stats()["queue_depth"] == 3
+
+        for expected in (["first"], ["first", "second"], ["first", "second", "third"]):
+            pool.release()
+            await _settle()
+            assert admitted == expected
+            # The slot is handed over, never given back to the pool in between
+            assert pool.in_flight == 1
+
+        pool.release()
+        await asyncio.gather(*tasks)
+        assert pool.in_flight == 0
+        assert pool.stats()["admitted"] == 4
+
+    asyncio.run(scenario())
+
+
+def test_requests_are_shed_when_the_queue_is_full():
+    async def scenario():
+        pool = AdmissionPool("test", limit=1, queue_size=0, queue_timeout=1.0)
+        await pool.acquire()
+        with pytest.raises(Overloaded) as error:
+            await pool.acquire()
+        assert error.value.reason == "queue_full"
+        assert pool.stats()["shed_queue_full"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_requests_are_shed_after_the_queue_timeout():
+    async def scenario():
+        pool = AdmissionPool("test", limit=1, queue_size=4, queue_timeout=0.01)
+        await pool.acquire()
+        with pytest.raises(Overloaded) as error:
+            await pool.acquire()
+        assert error.value.reason == "timeout"
+        assert pool.stats()["queue_depth"] == 0
+        assert pool.stats()["shed_timeout"] == 1
+
+        # The timed-out waiter is gone, so the slot returns to the pool
+        pool.release()
+        assert pool.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        pool = AdmissionPool("test", limit=1, queue_size=4, queue_timeout=1.0)
+        await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await _settle()
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert pool.stats()["queue_depth"] == 0
+
+        pool.release()
+        assert pool.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_to_a_cancelled_waiter_is_passed_on():
+    async def scenario():
+        pool = AdmissionPool("test", limit=1, queue_size=4, queue_timeout=1.0)
+        await pool.acquire()
+        cancelled = asyncio.create_task(pool.acquire())
+        next_in_line = asyncio.create_task(pool.acquire())
+        await _settle()
+
+        # Hand the slot over, then cancel the waiter before it resumes
+        pool.release()
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+
+        await asyncio.wait_for(next_in_line, timeout=1.0)
+        assert pool.in_flight == 1
+        assert pool.stats()["queue_depth"] == 0
+
+        pool.release()
+        assert pool.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_routes_match_exact_paths_before_prefixes():
+    controller = AdmissionController(
+        pools={"heavy": 1, "light": 1},
+        routes={
+            "heavy": ["/api/v1/weather/export", "/api/v1/interpolation/contours/*"],
+            "light": ["/api/v1/stations", "/api/v1/stations/nearest", "/api/v1/stats/*"],
+        },
+        exempt=["/api/v1/diagnostics"],
+        queue_size=1,
+        queue_timeout=1.0
+    )
+
+    assert controller.pool_for("/api/v1/stations").name == "light"
+    assert controller.pool_for("/api/v1/stations/nearest").name == "light"
+    assert controller.pool_for("/api/v1/stats/stations-count").name == "light"
+    assert controller.pool_for("/api/v1/stations/ST001").name == "standard"
+    assert controller.pool_for("/api/v1/stations/ST001/readings").name == "standard"
+    assert controller.pool_for("/api/v1/weather/export").name == "heavy"
+    assert controller.pool_for("/api/v1/interpolation/contours/2024-01-01T00:00:00").name == "heavy"
+    assert controller.pool_for("/api/v1/diagnostics/admission") is None
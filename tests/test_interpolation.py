@@ -0,0 +1,58 @@
+"""
+Tests for the interpolation routes' handling of timestamps.
+"""
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import interpolation
+from app.db.mongodb import mongodb_manager
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(interpolation.router)
+    return TestClient(app)
+
+
+def test_snap_normalizes_an_aware_timestamp(monkeypatch):
+    searched = []
+
+    def find_nearest(timestamp, tolerance):
+        searched.append(timestamp)
+        return None
+
+    monkeypatch.setattr(mongodb_manager, "find_nearest_interpolation_timestamp", find_nearest)
+    response = _client().post(
+        "/api/v1/interpolation/by-timestamp",
+        json={"timestamp": "2024-05-01T14:00:00+02:00", "snap": "nearest"}
+    )
+
+    assert response.status_code == 404
+    assert searched == [datetime(2024, 5, 1, 12, 0)]
+    assert "2024-05-01 12:00:00" in response.json()["detail"]
+
+
+def test_nearest_timestamp_accepts_an_aware_timestamp(monkeypatch):
+    stored = {
+        "before": {"timestamp": datetime(2024, 5, 1, 11, 50)},
+        "after": {"timestamp": datetime(2024, 5, 1, 12, 5)},
+    }
+
+    def find_one(label, collection, query, projection=None, sort=None):
+        return stored["before"] if "$lte" in query["timestamp"] and "$gt" not in query["timestamp"] else stored["after"]
+
+    monkeypatch.setattr(mongodb_manager, "_find_one", find_one)
+    nearest = mongodb_manager.find_nearest_interpolation_timestamp(
+        datetime.fromisoformat("2024-05-01T14:00:00+02:00"), tolerance=900
+    )
+
+    assert nearest == datetime(2024, 5, 1, 12, 5)
+
+
+def test_contours_reject_non_finite_levels():
+    client = _client()
+    for levels in ("10,nan", "inf", "-inf,5", "ten"):
+        response = client.get("/api/v1/interpolation/contours/2024-05-01T12:00:00", params={"levels": levels})
+        assert response.status_code == 400
@@ -0,0 +1,33 @@
+"""
+Tests for the station routes' handling of timestamps.
+"""
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.db.mongodb import mongodb_manager
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(routes.router)
+    return TestClient(app)
+
+
+def test_series_accepts_mixed_aware_and_naive_bounds(monkeypatch):
+    searched = []
+
+    def find_station_series(station_id, step_seconds, start_time, end_time, fields):
+        searched.append((start_time, end_time))
+        return None
+
+    monkeypatch.setattr(mongodb_manager, "find_station_series", find_station_series)
+    response = _client().get(
+        "/api/v1/stations/WSA/series",
+        params={"start_time": "2024-05-01T02:00:00+02:00", "end_time": "2024-05-01T06:00:00", "step_minutes": 15}
+    )
+
+    assert response.status_code == 404
+    assert searched == [(datetime(2024, 5, 1, 0, 0), datetime(2024, 5, 1, 6, 0))]
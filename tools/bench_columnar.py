@@ -0,0 +1,94 @@
+"""
+Measure memory per point of a large interpolation time-range query.
+
+Runs the same ``/interpolation/by-time-range`` page against the configured
+MongoDB twice: once through the dict-and-model path (list of documents,
+``InterpolationPoint`` models, ``model_dump_json``) and once through the
+columnar path (cursor decoded into ``InterpolationColumns``, JSON streamed
+from the arrays). Peak traced memory, bytes per point and wall time are
+reported for each.
+
+Usage:
+    python -m tools.bench_columnar --start-date 2024-05-01 --end-date 2024-05-31 --limit 100000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Tuple
+
+from dateutil import parser as date_parser
+
+from app.api.interpolation import InterpolationPoint, InterpolationResponse, InterpolationTimeRangeResponse
+from app.db.mongodb import mongodb_manager
+
+
+def dict_path(start_time: datetime, end_time: datetime, limit: int) -> Tuple[int, int]:
+    """Serialize a page through documents and Pydantic models; returns (points, JSON bytes)."""
+    data = mongodb_manager.find_interpolation_by_time_range(start_time, end_time, max_results=limit)
+    grouped = {}
+    for point in data:
+        grouped.setdefault(point["timestamp"], []).append(InterpolationPoint(
+            longitude=point["location"]["coordinates"][0],
+            latitude=point["location"]["coordinates"][1],
+            temperature=point["temperature"],
+            wind_speed=point["wind_speed"],
+            dew_point=point["dew_point"],
+            humidity=point["humidity"],
+            timestamp=point["timestamp"]
+        ))
+    responses = [
+        InterpolationResponse(timestamp=ts, point_count=len(points), points=points)
+        for ts, points in sorted(grouped.items())
+    ]
+    body = InterpolationTimeRangeResponse(
+        start_time=start_time,
+        end_time=end_time,
+        timestamp_count=len(responses),
+        total_points=len(data),
+        data=responses
+    ).model_dump_json(by_alias=True).encode("utf-8")
+    return len(data), len(body)
+
+
+def columnar_path(start_time: datetime, end_time: datetime, limit: int) -> Tuple[int, int]:
+    """Serialize a page through compact columns; returns (points, JSON bytes)."""
+    columns = mongodb_manager.find_interpolation_columns_by_time_range(start_time, end_time, max_results=limit)
+    size = sum(len(chunk) for chunk in columns.iter_json(start_time, end_time, None))
+    return len(columns), size
+
+
+def measure(path: Callable[[datetime, datetime, int], Tuple[int, int]],
+            start_time: datetime, end_time: datetime, limit: int) -> Tuple[int, int, int, float]:
+    """
+    Run one path under tracemalloc.
+
+    Returns:
+        Tuple[int, int, int, float]: (points, JSON bytes, peak traced bytes, seconds)
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    points, size = path(start_time, end_time, limit)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return points, size, peak, elapsed
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Compare memory per point of dict and columnar query paths")
+    parser.add_argument("--start-date", type=date_parser.parse, required=True, help="Start of the time range")
+    parser.add_argument("--end-date", type=date_parser.parse, required=True, help="End of the time range")
+    parser.add_argument("--limit", type=int, default=100000, help="Points per page")
+    args = parser.parse_args()
+
+    print(f"{'path':<10}{'points':>10}{'json MB':>10}{'peak MB':>10}{'bytes/pt':>10}{'seconds':>10}")
+    for name, path in (("dict", dict_path), ("columnar", columnar_path)):
+        points, size, peak, elapsed = measure(path, args.start_date, args.end_date, args.limit)
+        per_point = peak / points if points else 0
+        print(f"{name:<10}{points:>10}{size / 1e6:>10.1f}{peak / 1e6:>10.1f}{per_point:>10.0f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Measure the response size and latency of station queries with and without entries.
+
+Runs each station query against the configured MongoDB with the full document
+projection and with the metadata-only default, and reports the median latency
+and the size of the JSON payload the API would send.
+
+Usage:
+    python -m tools.bench_station_projection [--repeat 20] [--limit 100]
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.db.mongodb import mongodb_manager
+
+
+def _measure(fetch: Callable[[], List[Dict[str, Any]]], repeat: int) -> Tuple[float, int]:
+    """
+    Time a query and measure its serialized size.
+
+    Args:
+        fetch: Callable running the query
+        repeat: Number of timed runs
+
+    Returns:
+        Tuple[float, int]: (median latency in ms, JSON payload size in bytes)
+    """
+    timings = []
+    result = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fetch()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    payload = json.dumps(result, default=str).encode("utf-8")
+    return statistics.median(timings), len(payload)
+
+
+def main():
+    """Run the projection benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Station projection benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--limit", type=int, default=100, help="Stations per list query")
+    args = parser.parse_args()
+
+    sample = mongodb_manager.get_all_stations(limit=1)
+    if not sample:
+        print("No stations in the database; load data first")
+        return
+    longitude, latitude = sample[0]["location"]["coordinates"]
+
+    cases = {
+        "get_all_stations": lambda include: mongodb_manager.get_all_stations(
+            limit=args.limit, include_entries=include
+        ),
+        "find_stations_by_location": lambda include: mongodb_manager.find_stations_by_location(
+            longitude, latitude, max_distance=50000, include_entries=include
+        ),
+    }
+
+    print(f"{'query':<28}{'mode':<12}{'median ms':>12}{'bytes':>14}")
+    for name, run in cases.items():
+        full_ms, full_bytes = _measure(lambda: run(True), args.repeat)
+        meta_ms, meta_bytes = _measure(lambda: run(False), args.repeat)
+        print(f"{name:<28}{'entries':<12}{full_ms:>12.2f}{full_bytes:>14,}")
+        print(f"{name:<28}{'metadata':<12}{meta_ms:>12.2f}{meta_bytes:>14,}")
+        if meta_bytes:
+            print(f"{'':<28}{'reduction':<12}{full_ms / max(meta_ms, 1e-6):>11.1f}x{full_bytes / meta_bytes:>13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+"""
+Load-test a running Weather API with a realistic request mix.
+
+Requests are issued open-loop at a target rate, drawn from a weighted mix of
+the station, weather and interpolation endpoints (or replayed from a JSONL
+file), and the tool reports throughput, error rate and p50/p95/p99 latency
+per route. Latency is measured from each request's scheduled start, so a
+saturated server shows up as growing latency rather than a silently lower
+request rate.
+
+Request parameters are drawn from the data the server actually holds:
+station IDs and coordinates come from ``/api/v1/stations`` and grid
+timestamps from ``/api/v1/interpolation/status``. For reproducible runs,
+start the server on the dataset written by ``tools.synthetic_data``.
+
+Usage:
+    python -m tools.loadtest --base-url http://localhost:8000 --rps 200 --duration 60
+    python -m tools.loadtest --mix interpolation_by_timestamp=5,station_by_id=1
+    python -m tools.loadtest --replay requests.jsonl --json-output report.json
+
+Replay files hold one request per line:
+    {"route": "grid", "method": "GET", "path": "/api/v1/interpolation/grids/2024-05-01T12:00:00"}
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import numpy as np
+from dateutil import parser as date_parser
+
+
+@dataclass
+class RequestSpec:
+    """A single request to issue."""
+    route: str
+    method: str
+    path: str
+    json: Optional[Dict[str, Any]] = None
+    params: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class Context:
+    """Data discovered from the server that request parameters are drawn from."""
+    stations: List[Dict[str, Any]] = field(default_factory=list)
+    grid_timestamps: List[datetime] = field(default_factory=list)
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+
+    def station(self, rng: random.Random) -> Dict[str, Any]:
+        return rng.choice(self.stations)
+
+    def coordinates(self, rng: random.Random) -> List[float]:
+        lon, lat = self.station(rng)["location"]["coordinates"][:2]
+        return [lon + rng.uniform(-0.05, 0.05), lat + rng.uniform(-0.05, 0.05)]
+
+    def reading_time(self, rng: random.Random) -> datetime:
+        span = (self.end_time - self.start_time).total_seconds()
+        moment = self.start_time + timedelta(seconds=rng.uniform(0, span))
+        # Readings are typically on 5-minute boundaries
+        return moment.replace(minute=moment.minute - moment.minute % 5, second=0, microsecond=0)
+
+    def grid_time(self, rng: random.Random) -> datetime:
+        return rng.choice(self.grid_timestamps)
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat()
+
+
+# Route name -> (default weight, builder)
+SCENARIOS: Dict[str, Any] = {
+    "stations_list": (5, lambda ctx, rng: RequestSpec(
+        "stations_list", "GET", "/api/v1/stations", params={"limit": 50})),
+    "station_by_id": (10, lambda ctx, rng: RequestSpec(
+        "station_by_id", "GET", f"/api/v1/stations/{ctx.station(rng)['station_id']}",
+        params={"include_entries": "false"})),
+    "stations_by_location": (10, lambda ctx, rng: RequestSpec(
+        "stations_by_location", "POST", "/api/v1/stations/by-location",
+        json=dict(zip(("longitude", "latitude"), ctx.coordinates(rng)), max_distance=50000))),
+    "stations_nearest": (10, lambda ctx, rng: RequestSpec(
+        "stations_nearest", "POST", "/api/v1/stations/nearest",
+        json=dict(zip(("longitude", "latitude"), ctx.coordinates(rng)), k=5))),
+    "stations_count": (2, lambda ctx, rng: RequestSpec(
+        "stations_count", "GET", "/api/v1/stats/stations-count")),
+    "station_readings": (0, lambda ctx, rng: RequestSpec(
+        "station_readings", "POST", f"/api/v1/stations/{ctx.station(rng)['station_id']}/readings",
+        json={"readings": [{"timestamp": _iso(ctx.reading_time(rng)), "Temp - °C": round(rng.uniform(5, 30), 1)}]})),
+    "weather_by_timestamp": (15, lambda ctx, rng: RequestSpec(
+        "weather_by_timestamp", "POST", "/api/v1/weather/by-timestamp",
+        json={"timestamp": _iso(ctx.reading_time(rng)), "snap": "nearest", "limit": 100})),
+    "weather_by_time_range": (10, lambda ctx, rng: (lambda start: RequestSpec(
+        "weather_by_time_range", "POST", "/api/v1/weather/by-time-range",
+        json={"start_time": _iso(start), "end_time": _iso(start + timedelta(hours=1)), "limit": 1000}
+    ))(ctx.reading_time(rng))),
+    "interpolation_status": (5, lambda ctx, rng: RequestSpec(
+        "interpolation_status", "GET", "/api/v1/interpolation/status")),
+    "interpolation_by_timestamp": (20, lambda ctx, rng: RequestSpec(
+        "interpolation_by_timestamp", "POST", "/api/v1/interpolation/by-timestamp",
+        json={"timestamp": _iso(ctx.grid_time(rng)), "limit": 1000})),
+    "interpolation_grid": (5, lambda ctx, rng: RequestSpec(
+        "interpolation_grid", "GET", f"/api/v1/interpolation/grids/{_iso(ctx.grid_time(rng))}",
+        params={"limit": 1000})),
+    "interpolation_by_time_range": (5, lambda ctx, rng: (lambda start: RequestSpec(
+        "interpolation_by_time_range", "POST", "/api/v1/interpolation/by-time-range",
+        json={"start_time": _iso(start), "end_time": _iso(start + timedelta(hours=3)), "limit": 10000}
+    ))(ctx.grid_time(rng))),
+    "interpolation_by_location": (3, lambda ctx, rng: RequestSpec(
+        "interpolation_by_location", "POST", "/api/v1/interpolation/by-location",
+        json=dict(zip(("longitude", "latitude"), ctx.coordinates(rng)), max_distance=10000))),
+    "interpolation_by_location_and_timestamp": (5, lambda ctx, rng: RequestSpec(
+        "interpolation_by_location_and_timestamp", "POST", "/api/v1/interpolation/by-location-and-timestamp",
+        json=dict(zip(("longitude", "latitude"), ctx.coordinates(rng)),
+                  timestamp=_iso(ctx.grid_time(rng)), max_distance=10000))),
+}
+
+# Scenarios that need grid timestamps to build their requests
+_GRID_SCENARIOS = {
+    "interpolation_by_timestamp", "interpolation_grid",
+    "interpolation_by_time_range", "interpolation_by_location_and_timestamp"
+}
+
+
+async def discover_context(client: httpx.AsyncClient, max_stations: int,
+                           start_time: Optional[datetime], end_time: Optional[datetime]) -> Context:
+    """
+    Collect station and grid metadata from the server.
+
+    Args:
+        client: HTTP client bound to the server
+        max_stations: Maximum number of stations to sample
+        start_time: Start of the reading window (defaults to the first grid timestamp)
+        end_time: End of the reading window (defaults to the last grid timestamp)
+
+    Returns:
+        Context: Data to draw request parameters from
+    """
+    context = Context()
+    cursor = None
+    while len(context.stations) < max_stations:
+        params = {"limit": 100}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/v1/stations", params=params)
+        response.raise_for_status()
+        context.stations.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    context.stations = context.stations[:max_stations]
+
+    response = await client.get("/api/v1/interpolation/status")
+    if response.status_code == 200:
+        context.grid_timestamps = [date_parser.parse(ts) for ts in response.json().get("timestamps", [])]
+
+    context.start_time = start_time or (min(context.grid_timestamps) if context.grid_timestamps else None)
+    context.end_time = end_time or (max(context.grid_timestamps) if context.grid_timestamps else None)
+    return context
+
+
+def parse_mix(spec: Optional[str]) -> Dict[str, float]:
+    """
+    Parse a ``route=weight,...`` mix, starting from the default weights.
+
+    Args:
+        spec: Mix specification, or None for the defaults
+
+    Returns:
+        Dict[str, float]: Weight per route
+    """
+    weights = {name: float(weight) for name, (weight, _) in SCENARIOS.items()}
+    if spec:
+        for item in spec.split(","):
+            name, _, weight = item.partition("=")
+            name = name.strip()
+            if name not in SCENARIOS:
+                raise ValueError(f"Unknown route '{name}'; choose from {', '.join(SCENARIOS)}")
+            weights[name] = float(weight)
+    return weights
+
+
+def mix_generator(context: Context, weights: Dict[str, float], seed: int) -> Callable[[], RequestSpec]:
+    """
+    Build a generator of requests drawn from a weighted mix.
+
+    Args:
+        context: Data to draw request parameters from
+        weights: Weight per route
+        seed: Random seed
+
+    Returns:
+        Callable[[], RequestSpec]: Function returning the next request
+    """
+    if not context.stations:
+        raise ValueError("The server has no stations; load a dataset first")
+    if not context.grid_timestamps:
+        weights = {name: weight for name, weight in weights.items() if name not in _GRID_SCENARIOS}
+    if context.start_time is None or context.end_time is None:
+        raise ValueError("No grid timestamps to infer the reading window from; pass --start-date and --end-date")
+
+    names = [name for name, weight in weights.items() if weight > 0]
+    if not names:
+        raise ValueError("The request mix is empty")
+    rng = random.Random(seed)
+    route_weights = [weights[name] for name in names]
+    return lambda: SCENARIOS[rng.choices(names, weights=route_weights)[0]][1](context, rng)
+
+
+def replay_generator(path: str) -> Callable[[], RequestSpec]:
+    """
+    Build a generator that cycles through recorded requests.
+
+    Args:
+        path: JSONL file with one request per line
+
+    Returns:
+        Callable[[], RequestSpec]: Function returning the next request
+    """
+    specs = []
+    with open(path) as replay_file:
+        for line in replay_file:
+            if line.strip():
+                record = json.loads(line)
+                specs.append(RequestSpec(
+                    route=record.get("route") or f"{record['method']} {record['path']}",
+                    method=record["method"],
+                    path=record["path"],
+                    json=record.get("json"),
+                    params=record.get("params")
+                ))
+    if not specs:
+        raise ValueError(f"No requests found in {path}")
+    return itertools.cycle(specs).__next__
+
+
+async def run(client: httpx.AsyncClient, next_request: Callable[[], RequestSpec],
+              rps: float, duration: float, concurrency: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Issue requests open-loop at a target rate and collect results.
+
+    Args:
+        client: HTTP client bound to the server
+        next_request: Function returning the next request
+        rps: Target requests per second
+        duration: Test duration in seconds
+        concurrency: Maximum requests in flight
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Latencies (seconds) and status counts per route
+    """
+    results: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"latencies": [], "statuses": defaultdict(int)})
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = []
+
+    async def issue(spec: RequestSpec, scheduled: float) -> None:
+        async with semaphore:
+            try:
+                response = await client.request(spec.method, spec.path, json=spec.json, params=spec.params)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+        route = results[spec.route]
+        route["latencies"].append(time.perf_counter() - scheduled)
+        route["statuses"][status] += 1
+
+    start = time.perf_counter()
+    interval = 1.0 / rps
+    issued = 0
+    while True:
+        scheduled = start + issued * interval
+        if scheduled - start >= duration:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(issue(next_request(), scheduled)))
+        issued += 1
+
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    for route in results.values():
+        route["elapsed"] = elapsed
+    return results
+
+
+def summarize(results: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute throughput, error rate and latency percentiles per route.
+
+    Responses with a status of 400 or above, and transport errors, count as errors.
+
+    Args:
+        results: Output of :func:`run`
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Summary per route plus an ``ALL`` total
+    """
+    def describe(latencies: List[float], statuses: Dict[str, int], elapsed: float) -> Dict[str, Any]:
+        count = len(latencies)
+        errors = sum(n for status, n in statuses.items() if not status.isdigit() or int(status) >= 400)
+        p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99]) if count else (0, 0, 0)
+        return {
+            "requests": count,
+            "throughput_rps": count / elapsed if elapsed else 0.0,
+            "error_rate": errors / count if count else 0.0,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "statuses": dict(statuses)
+        }
+
+    summary = {}
+    all_latencies: List[float] = []
+    all_statuses: Dict[str, int] = defaultdict(int)
+    elapsed = 0.0
+    for name, route in sorted(results.items()):
+        summary[name] = describe(route["latencies"], route["statuses"], route["elapsed"])
+        all_latencies.extend(route["latencies"])
+        for status, count in route["statuses"].items():
+            all_statuses[status] += count
+        elapsed = route["elapsed"]
+    summary["ALL"] = describe(all_latencies, all_statuses, elapsed)
+    return summary
+
+
+def print_report(summary: Dict[str, Dict[str, Any]]) -> None:
+    """Print the summary as a table."""
+    header = f"{'route':<42}{'reqs':>8}{'rps':>9}{'err%':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, row in summary.items():
+        print(f"{name:<42}{row['requests']:>8}{row['throughput_rps']:>9.1f}{row['error_rate'] * 100:>7.1f}"
+              f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}")
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        if args.replay:
+            next_request = replay_generator(args.replay)
+        else:
+            context = await discover_context(client, args.max_stations, args.start_date, args.end_date)
+            print(f"Discovered {len(context.stations)} stations and {len(context.grid_timestamps)} grid timestamps")
+            next_request = mix_generator(context, parse_mix(args.mix), args.seed)
+
+        print(f"Running {args.duration}s at {args.rps} req/s against {args.base_url}")
+        results = await run(client, next_request, args.rps, args.duration, args.concurrency)
+    return summarize(results)
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Load-test the Weather API")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Server to test")
+    parser.add_argument("--rps", type=float, default=50, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30, help="Test duration in seconds")
+    parser.add_argument("--concurrency", type=int, default=100, help="Maximum requests in flight")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    parser.add_argument("--mix", help=f"Route weights as route=weight,...; routes: {', '.join(SCENARIOS)}")
+    parser.add_argument("--replay", help="JSONL file of requests to replay instead of the generated mix")
+    parser.add_argument("--max-stations", type=int, default=1000, help="Stations to sample parameters from")
+    parser.add_argument("--start-date", type=date_parser.parse, help="Start of the reading window to query")
+    parser.add_argument("--end-date", type=date_parser.parse, help="End of the reading window to query")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the request mix")
+    parser.add_argument("--json-output", help="Write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    summary = asyncio.run(main_async(args))
+    print_report(summary)
+    if args.json_output:
+        with open(args.json_output, "w") as output_file:
+            json.dump(summary, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()